@@ -3,6 +3,8 @@ Add race distance and normalized pace metrics to the dataset
 """
 import pandas as pd
 
+import dataset
+
 # Distance by division (in kilometers)
 DISTANCE_MAP = {
     '2nd Grade': 2.0,
@@ -11,27 +13,7 @@ DISTANCE_MAP = {
     'Varsity': 4.0
 }
 
-print("=" * 80)
-print("ADDING DISTANCE AND NORMALIZED PACE METRICS")
-print("=" * 80)
-
-# Load the data
-df = pd.read_csv('data/merged/season_results.csv')
-
-print(f"\nOriginal dataset: {len(df)} records")
-
-# Add distance column
-df['distance_km'] = df['division'].map(DISTANCE_MAP)
-df['distance_mi'] = df['distance_km'] * 0.621371  # Convert to miles
 
-# Calculate pace per kilometer (minutes per km)
-# finish_time_s is in seconds, convert to minutes and divide by distance
-df['pace_per_km_min'] = df['finish_time_s'] / 60 / df['distance_km']
-
-# Calculate pace per mile (minutes per mile)
-df['pace_per_mi_min'] = df['finish_time_s'] / 60 / df['distance_mi']
-
-# Format pace as MM:SS per km
 def format_pace(pace_min):
     """Convert pace in minutes to MM:SS format"""
     if pd.isna(pace_min):
@@ -40,57 +22,99 @@ def format_pace(pace_min):
     seconds = int((pace_min - minutes) * 60)
     return f"{minutes}:{seconds:02d}"
 
-df['pace_per_km_str'] = df['pace_per_km_min'].apply(format_pace)
-df['pace_per_mi_str'] = df['pace_per_mi_min'].apply(format_pace)
-
-# Add speed (km/h and mph) for comparison
-df['speed_kmh'] = df['distance_km'] / (df['finish_time_s'] / 3600)
-df['speed_mph'] = df['distance_mi'] / (df['finish_time_s'] / 3600)
-
-print("\n✅ Added columns:")
-print("   - distance_km: Race distance in kilometers")
-print("   - distance_mi: Race distance in miles")
-print("   - pace_per_km_min: Pace in minutes per kilometer (numeric)")
-print("   - pace_per_km_str: Pace formatted as MM:SS per km")
-print("   - pace_per_mi_min: Pace in minutes per mile (numeric)")
-print("   - pace_per_mi_str: Pace formatted as MM:SS per mile")
-print("   - speed_kmh: Speed in kilometers per hour")
-print("   - speed_mph: Speed in miles per hour")
-
-# Show summary by division
-print("\n" + "=" * 80)
-print("DISTANCE BY DIVISION")
-print("=" * 80)
-
-for division in sorted(df['division'].unique()):
-    distance = df[df['division'] == division]['distance_km'].iloc[0]
-    count = len(df[df['division'] == division])
-    print(f"  {division:<12} {distance:.1f} km ({count:>5} athletes)")
-
-# Show sample statistics
-print("\n" + "=" * 80)
-print("SAMPLE STATISTICS BY DIVISION")
-print("=" * 80)
-
-for division in sorted(df['division'].unique()):
-    div_data = df[df['division'] == division]
-    avg_pace = div_data['pace_per_mi_min'].mean()
-    
-    if pd.notna(avg_pace):
-        minutes = int(avg_pace)
-        seconds = int((avg_pace - minutes) * 60)
-        avg_pace_str = f"{minutes}:{seconds:02d}"
-    else:
-        avg_pace_str = "N/A"
-    
-    print(f"  {division:<12} Avg pace: {avg_pace_str} per mile ({len(div_data)} athletes)")
-
-# Save updated dataset
-df.to_csv('data/merged/season_results.csv', index=False)
-
-print("\n" + "=" * 80)
-print("✅ COMPLETE - Dataset updated with normalized metrics")
-print("=" * 80)
-print("\nUpdated file: data/merged/season_results.csv")
-print(f"Total records: {len(df):,}")
-print(f"Records with pace data: {df['pace_per_km_min'].notna().sum():,}")
+
+def format_seconds_to_time(seconds: float) -> str:
+    """Convert seconds to M:SS.ss format."""
+    if pd.isna(seconds):
+        return ""
+    total_seconds = float(seconds)
+    minutes = int(total_seconds // 60)
+    remaining_seconds = total_seconds % 60
+    return f"{minutes}:{remaining_seconds:05.2f}"
+
+
+def add_distance_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Add distance, pace and speed columns derived from division and finish_time_s"""
+    # Add distance column
+    df['distance_km'] = df['division'].map(DISTANCE_MAP)
+    df['distance_mi'] = df['distance_km'] * 0.621371  # Convert to miles
+
+    # Calculate pace per kilometer (minutes per km)
+    # finish_time_s is in seconds, convert to minutes and divide by distance
+    df['pace_per_km_min'] = df['finish_time_s'] / 60 / df['distance_km']
+
+    # Calculate pace per mile (minutes per mile)
+    df['pace_per_mi_min'] = df['finish_time_s'] / 60 / df['distance_mi']
+
+    # Format pace as MM:SS per km
+    df['pace_per_km_str'] = df['pace_per_km_min'].apply(format_pace)
+    df['pace_per_mi_str'] = df['pace_per_mi_min'].apply(format_pace)
+
+    # Add speed (km/h and mph) for comparison
+    df['speed_kmh'] = df['distance_km'] / (df['finish_time_s'] / 3600)
+    df['speed_mph'] = df['distance_mi'] / (df['finish_time_s'] / 3600)
+    return df
+
+
+def main(df: pd.DataFrame | None = None) -> pd.DataFrame:
+    print("=" * 80)
+    print("ADDING DISTANCE AND NORMALIZED PACE METRICS")
+    print("=" * 80)
+
+    # Load the data
+    if df is None:
+        df = pd.read_csv('data/merged/season_results.csv')
+    df = df.copy()
+
+    print(f"\nOriginal dataset: {len(df)} records")
+
+    df = add_distance_columns(df)
+
+    print("\n✅ Added columns:")
+    print("   - distance_km: Race distance in kilometers")
+    print("   - distance_mi: Race distance in miles")
+    print("   - pace_per_km_min: Pace in minutes per kilometer (numeric)")
+    print("   - pace_per_km_str: Pace formatted as MM:SS per km")
+    print("   - pace_per_mi_min: Pace in minutes per mile (numeric)")
+    print("   - pace_per_mi_str: Pace formatted as MM:SS per mile")
+    print("   - speed_kmh: Speed in kilometers per hour")
+    print("   - speed_mph: Speed in miles per hour")
+
+    # One pass over the rows for both summaries
+    by_division = df.groupby('division').agg(
+        distance_km=('distance_km', 'first'),
+        results=('division', 'size'),
+        pace_mean=('pace_per_mi_min', 'mean'),
+    ).reset_index()
+
+    # Show summary by division
+    print("\n" + "=" * 80)
+    print("DISTANCE BY DIVISION")
+    print("=" * 80)
+
+    for row in by_division.itertuples():
+        print(f"  {row.division:<12} {row.distance_km:.1f} km ({row.results:>5} athletes)")
+
+    # Show sample statistics
+    print("\n" + "=" * 80)
+    print("SAMPLE STATISTICS BY DIVISION")
+    print("=" * 80)
+
+    for row in by_division.itertuples():
+        avg_pace_str = format_pace(row.pace_mean) if pd.notna(row.pace_mean) else "N/A"
+        print(f"  {row.division:<12} Avg pace: {avg_pace_str} per mile ({row.results} athletes)")
+
+    # Save updated dataset
+    dataset.write_results(df)
+
+    print("\n" + "=" * 80)
+    print("✅ COMPLETE - Dataset updated with normalized metrics")
+    print("=" * 80)
+    print("\nUpdated file: data/merged/season_results.csv")
+    print(f"Total records: {len(df):,}")
+    print(f"Records with pace data: {df['pace_per_km_min'].notna().sum():,}")
+    return df
+
+
+if __name__ == "__main__":
+    main()
@@ -190,9 +190,12 @@ def save_fixed_data(df_fixed, name_mapping):
     mapping_df.to_csv('data/merged/name_mapping.csv', index=False)
     print("✅ Name mapping saved to: data/merged/name_mapping.csv")
 
-def main():
-    print("Loading data...")
-    df = load_data()
+def main(df=None):
+    if df is None:
+        print("Loading data...")
+        df = load_data()
+    # find_potential_duplicates adds a helper column; keep the caller's frame untouched
+    df = df.copy()
     
     print(f"Dataset loaded: {len(df)} records")
     print(f"Unique athletes: {df['athlete_full_name'].nunique()}")
@@ -218,8 +221,8 @@ def main():
             print("NEXT STEPS:")
             print("="*80)
             print("1. Review the fixed data in: data/merged/season_results_fixed.csv")
-            print("2. If satisfied, backup the original and replace it:")
-            print("   - Backup: copy season_results.csv to season_results_backup.csv")
+            print("2. If satisfied, snapshot the original and replace it:")
+            print("   - Snapshot: python snapshots.py save -m \"before duplicate name fixes\"")
             print("   - Replace: copy season_results_fixed.csv to season_results.csv")
             print("3. Update dashboard.py to use the fixed data (or rename the fixed file)")
         else:
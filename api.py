@@ -0,0 +1,379 @@
+"""
+JSON API over the merged results and precomputed aggregates
+A small asyncio HTTP server for the views parents and coaches look up most,
+so those requests skip a full Streamlit script rerun. Lookups go through the
+indexed results store and the precompute artifacts; each response is cached
+per dataset version with an ETag, and a client revalidating with
+If-None-Match gets an empty 304.
+
+Endpoints (GET):
+    /                                           dataset version and endpoint list
+    /athletes/<name>                            results, season records and rating
+    /teams/<name>?season=<year>                 team scores and roster
+    /races/<season>/<meet>/<division>/<gender>  finish order and team scores
+    /standings/<season>?team=<name>             Saint Sebastian standings
+
+Usage:
+    python api.py --port 8503
+    python api.py --check     # serve on a free port and request every endpoint
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import threading
+import traceback
+from collections import OrderedDict
+from http import HTTPStatus
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import numpy as np
+import pandas as pd
+
+import dataset
+import precompute
+import ratings
+import standings
+import team_scoring
+from add_distance_metrics import format_pace
+
+RESPONSE_CACHE_ENTRIES = 512
+# Seasons and meet numbers outside this are not in any dataset (and would overflow SQLite integers)
+INT_PARAM_RANGE = range(1, 10_000)
+JSON_HEADERS = {'Content-Type': 'application/json; charset=utf-8'}
+RESULT_COLUMNS = [
+    'season_year', 'meet_number', 'meet_name', 'division', 'gender', 'athlete_full_name', 'team_name', 'grade',
+    'place_overall', 'field_size', 'finish_percentile', 'finish_time_s', 'finish_time_str',
+    'pace_per_mi_str', 'adjusted_pace_per_mi_str',
+]
+
+
+class HTTPError(Exception):
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def _records(frame: pd.DataFrame) -> list[dict]:
+    """DataFrame rows as JSON-ready dicts (NaN -> null)"""
+    return frame.astype(object).where(frame.notna(), None).to_dict('records')
+
+
+def _json_default(value):
+    if isinstance(value, np.integer):
+        return int(value)
+    if isinstance(value, np.floating):
+        return None if np.isnan(value) else float(value)
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _int_param(value: str, name: str) -> int:
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        raise HTTPError(HTTPStatus.BAD_REQUEST, f"{name} must be a number") from None
+    if number not in INT_PARAM_RANGE:
+        raise HTTPError(HTTPStatus.BAD_REQUEST,
+                        f"{name} must be between {INT_PARAM_RANGE.start} and {INT_PARAM_RANGE.stop - 1}")
+    return number
+
+
+def _error_response(status: HTTPStatus, message: str) -> tuple[HTTPStatus, dict, bytes]:
+    return status, dict(JSON_HEADERS), json.dumps({'error': message}).encode('utf-8')
+
+
+class ResultsAPI:
+    """
+    Request handling, independent of the transport
+    respond() is synchronous and thread-safe; the server runs it in a worker
+    thread so a slow first build never blocks other connections.
+    """
+
+    def __init__(self, results_path=None):
+        self.results_path = results_path or dataset.RESULTS_PATH
+        self.store = dataset.DatasetStore(self.results_path, loader=precompute.read_prepared)
+        self._lock = threading.Lock()
+        self._derived = {}
+        self._responses = OrderedDict()
+
+    def _derived_value(self, version: str, key, build):
+        """Per-version memo for artifacts and aggregates; older versions are dropped"""
+        with self._lock:
+            if key in self._derived.get(version, {}):
+                return self._derived[version][key]
+        value = build()
+        with self._lock:
+            self._derived = {version: {**self._derived.get(version, {}), key: value}}
+        return value
+
+    def _artifact(self, version: str, df: pd.DataFrame, name: str):
+        return self._derived_value(
+            version, name, lambda: precompute.load_artifact(name, df, version, self.results_path))
+
+    def _team_scores(self, version: str, df: pd.DataFrame) -> pd.DataFrame:
+        return self._derived_value(version, 'team_scores', lambda: team_scoring.team_scores(df))
+
+    def index(self, version, df, query):
+        return {
+            'dataset_version': version,
+            'results': len(df),
+            'endpoints': [
+                '/athletes/<name>', '/teams/<name>?season=<year>',
+                '/races/<season>/<meet>/<division>/<gender>', '/standings/<season>?team=<name>',
+            ],
+        }
+
+    def athlete(self, version, df, query, name):
+        results = self._artifact(version, df, 'store').athlete_results(name)
+        if results.empty:
+            raise HTTPError(HTTPStatus.NOT_FOUND, f"No results for athlete {name!r}")
+        records_table = self._artifact(version, df, 'records')
+        records = records_table[records_table['athlete_full_name'] == name]
+        history = self._artifact(version, df, 'ratings')
+        rating = ratings.current_ratings(history[history['athlete_full_name'] == name])
+        return {
+            'athlete': name,
+            'results': _records(results[[c for c in RESULT_COLUMNS if c in results.columns]]),
+            'records': _records(records.drop(columns=['athlete_full_name', 'results_digest'], errors='ignore')),
+            'rating': _records(rating.drop(columns='athlete_full_name'))[0] if not rating.empty else None,
+        }
+
+    def team(self, version, df, query, name):
+        season = _int_param(query['season'][0], 'season') if 'season' in query else None
+        scores = self._team_scores(version, df)
+        scores = scores[scores['Team'] == name]
+        records_table = self._artifact(version, df, 'records')
+        roster = records_table[records_table['team_name'] == name]
+        if season is not None:
+            scores = scores[scores['Season'] == season]
+            roster = roster[roster['season_year'] == season]
+        if scores.empty and roster.empty:
+            raise HTTPError(HTTPStatus.NOT_FOUND, f"No results for team {name!r}")
+        roster = roster.assign(season_best_pace_str=roster['season_best_pace'].apply(format_pace))
+        return {
+            'team': name,
+            'season': season,
+            'scores': _records(scores.sort_values(['Season', 'Meet', 'Division', 'Gender'])),
+            'roster': _records(roster[[
+                'athlete_full_name', 'season_year', 'division', 'gender', 'grade', 'races',
+                'season_best_time_s', 'season_best_pace_str', 'pr_time_s', 'best_place'
+            ]].sort_values(['season_year', 'division', 'season_best_time_s'])),
+        }
+
+    def race(self, version, df, query, season, meet, division, gender):
+        season, meet = _int_param(season, 'season'), _int_param(meet, 'meet')
+        results = self._artifact(version, df, 'store').race_results(season, meet, division, gender)
+        if results.empty:
+            raise HTTPError(HTTPStatus.NOT_FOUND, f"No race {season} meet {meet} {division} {gender}")
+        results = results.sort_values(['place_overall', 'finish_time_s'], kind='stable')
+        scores = self._team_scores(version, df)
+        scores = scores[(scores['Season'] == season) & (scores['Meet'] == meet) &
+                        (scores['Division'] == division) & (scores['Gender'] == gender)]
+        return {
+            'race': {'season_year': season, 'meet_number': meet, 'division': division, 'gender': gender,
+                     'meet_name': results['meet_name'].iloc[0]},
+            'results': _records(results[[c for c in RESULT_COLUMNS if c in results.columns]]),
+            'team_scores': _records(scores.sort_values('Score')),
+        }
+
+    def standings(self, version, df, query, season):
+        season = _int_param(season, 'season')
+        table, categories, _, meets_completed = self._derived_value(
+            version, ('standings', season), lambda: standings.saint_sebastian_standings(df, season))
+        if 'team' in query and not table.empty:
+            table = table[table['team_name'] == query['team'][0]]
+        columns = ['rank', 'athlete_full_name', 'team_name', 'cumulative_time', 'cumulative_time_str',
+                   'time_back_str', 'meets_run']
+        return {
+            'season': season,
+            'meets_completed': meets_completed,
+            'required_meets': standings.SAINT_SEBASTIAN_REQUIRED_MEETS,
+            'categories': [
+                {
+                    'category': category['category'],
+                    'standings': _records(table[
+                        (table['division'] == category['division']) & (table['gender'] == category['gender'])
+                    ][columns]),
+                }
+                for category in categories
+            ],
+        }
+
+    def _route(self, segments: list[str]):
+        routes = {
+            (): self.index,
+            ('athletes', 1): self.athlete,
+            ('teams', 1): self.team,
+            ('races', 4): self.race,
+            ('standings', 1): self.standings,
+        }
+        key = () if not segments else (segments[0], len(segments) - 1)
+        if key not in routes:
+            raise HTTPError(HTTPStatus.NOT_FOUND, "Unknown endpoint")
+        return routes[key], segments[1:]
+
+    def respond(self, target: str, if_none_match: str | None = None) -> tuple[HTTPStatus, dict, bytes]:
+        """(status, headers, body) for a GET of `target`"""
+        url = urlsplit(target)
+        segments = [unquote(part) for part in url.path.split('/') if part]
+        query = parse_qs(url.query)
+        version, df = self.store.snapshot()
+        cache_key = (version, tuple(segments), tuple(sorted((k, tuple(v)) for k, v in query.items())))
+
+        with self._lock:
+            cached = self._responses.get(cache_key)
+            if cached is not None:
+                self._responses.move_to_end(cache_key)
+        if cached is None:
+            try:
+                handler, args = self._route(segments)
+                payload = handler(version, df, query, *args)
+            except HTTPError as e:
+                return _error_response(e.status, str(e))
+            except Exception:
+                # A bug in one handler must not drop the connection: log it and answer 500
+                traceback.print_exc()
+                return _error_response(HTTPStatus.INTERNAL_SERVER_ERROR, "Internal server error")
+            body = json.dumps(payload, default=_json_default).encode('utf-8')
+            cached = (f'"{hashlib.blake2b(body, digest_size=12).hexdigest()}"', body)
+            with self._lock:
+                self._responses[cache_key] = cached
+                while len(self._responses) > RESPONSE_CACHE_ENTRIES:
+                    self._responses.popitem(last=False)
+
+        etag, body = cached
+        headers = {
+            **JSON_HEADERS,
+            'ETag': etag,
+            # Clients may keep the response but must revalidate (cheap with the ETag)
+            'Cache-Control': 'no-cache',
+        }
+        if if_none_match and (if_none_match.strip() == '*' or etag in [t.strip() for t in if_none_match.split(',')]):
+            return HTTPStatus.NOT_MODIFIED, headers, b''
+        return HTTPStatus.OK, headers, body
+
+
+async def _handle_connection(api: ResultsAPI, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    """HTTP/1.1 GET/HEAD with keep-alive; request bodies are not supported"""
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line.strip():
+                break
+            headers = {}
+            while (line := await reader.readline()) not in (b'\r\n', b'\n', b''):
+                name, _, value = line.decode('latin-1').partition(':')
+                headers[name.strip().lower()] = value.strip()
+
+            parts = request_line.decode('latin-1').split()
+            http_version = parts[2] if len(parts) == 3 else 'HTTP/1.0'
+            if len(parts) != 3:
+                status, response_headers, body = HTTPStatus.BAD_REQUEST, {}, b''
+            elif parts[0] not in ('GET', 'HEAD'):
+                status, response_headers, body = HTTPStatus.METHOD_NOT_ALLOWED, {'Allow': 'GET, HEAD'}, b''
+            else:
+                try:
+                    status, response_headers, body = await asyncio.to_thread(
+                        api.respond, parts[1], headers.get('if-none-match'))
+                except Exception:
+                    # e.g. the dataset could not be loaded
+                    traceback.print_exc()
+                    status, response_headers, body = _error_response(
+                        HTTPStatus.INTERNAL_SERVER_ERROR, "Internal server error")
+
+            keep_alive = http_version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+            head = [f"{http_version} {status.value} {status.phrase}"]
+            head += [f"{name}: {value}" for name, value in response_headers.items()]
+            head += [f"Content-Length: {len(body)}", f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+            writer.write(('\r\n'.join(head) + '\r\n\r\n').encode('latin-1'))
+            if len(parts) == 3 and parts[0] != 'HEAD':
+                writer.write(body)
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(api: ResultsAPI, host: str = '127.0.0.1', port: int = 8503) -> asyncio.Server:
+    """Start listening (port 0 picks a free port); the caller runs or closes the server"""
+    return await asyncio.start_server(lambda r, w: _handle_connection(api, r, w), host, port)
+
+
+def _check_requests(df: pd.DataFrame) -> list[str]:
+    """One request per endpoint for real names from the dataset"""
+    from urllib.parse import quote
+
+    race = df.dropna(subset=['place_overall']).iloc[0]
+    season = int(df['season_year'].max())
+    return [
+        '/',
+        f"/athletes/{quote(race['athlete_full_name'])}",
+        f"/teams/{quote(df['team_name'].value_counts().index[0])}?season={season}",
+        f"/races/{int(race['season_year'])}/{int(race['meet_number'])}/{quote(race['division'])}/{quote(race['gender'])}",
+        f"/standings/{season}",
+        '/athletes/No%20Such%20Athlete',
+    ]
+
+
+async def check(api: ResultsAPI):
+    """Serve on a free local port and request every endpoint twice: cold, then revalidated"""
+    import time
+    import urllib.error
+    import urllib.request
+
+    server = await serve(api, port=0)
+    port = server.sockets[0].getsockname()[1]
+
+    def fetch(path, etag=None):
+        request = urllib.request.Request(f"http://127.0.0.1:{port}{path}",
+                                         headers={'If-None-Match': etag} if etag else {})
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request) as response:
+                return response.status, response.headers.get('ETag'), len(response.read()), time.perf_counter() - start
+        except urllib.error.HTTPError as e:
+            return e.code, e.headers.get('ETag'), len(e.read()), time.perf_counter() - start
+
+    print(f"Serving on http://127.0.0.1:{port}\n")
+    async with server:
+        for path in _check_requests(api.store.snapshot()[1]):
+            status, etag, size, first = await asyncio.to_thread(fetch, path)
+            line = f"  {status} {size:>8,} B {first * 1000:>7.1f} ms"
+            if etag:
+                revalidated, _, _, again = await asyncio.to_thread(fetch, path, etag)
+                line += f"  | revalidate: {revalidated} in {again * 1000:.1f} ms"
+            print(f"{line}  {path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JSON API over the results and precomputed aggregates")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8503)
+    parser.add_argument('--check', action='store_true', help="request every endpoint on a local server and exit")
+    args = parser.parse_args()
+
+    api = ResultsAPI()
+    print("=" * 60)
+    print("RESULTS API")
+    print("=" * 60)
+    if args.check:
+        asyncio.run(check(api))
+        return
+
+    async def run():
+        server = await serve(api, args.host, args.port)
+        print(f"Listening on http://{args.host}:{args.port} (dataset version {api.store.version})")
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
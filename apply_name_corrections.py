@@ -4,10 +4,11 @@ Apply curated name corrections to the dataset
 
 import pandas as pd
 
-def apply_corrections():
+def apply_corrections(df: pd.DataFrame | None = None):
     # Load the data
-    print("Loading data...")
-    df = pd.read_csv('data/merged/season_results.csv')
+    if df is None:
+        print("Loading data...")
+        df = pd.read_csv('data/merged/season_results.csv')
     print(f"Original dataset: {len(df)} records, {df['athlete_full_name'].nunique()} unique athletes")
     
     # Load corrections
@@ -53,15 +54,16 @@ def apply_corrections():
     df_corrected.to_csv('data/merged/season_results_corrected.csv', index=False)
     print("✅ Corrected data saved to: data/merged/season_results_corrected.csv")
     
-    # Create backup instructions
+    # Snapshot and replace instructions
     print(f"\n{'='*80}")
     print("NEXT STEPS:")
     print(f"{'='*80}")
     print("1. Review the corrected data: data/merged/season_results_corrected.csv")
     print("2. Update name_corrections.csv for any items marked 'review'")
-    print("3. If satisfied, backup and replace:")
-    print("   Copy-Item data\\merged\\season_results.csv data\\merged\\season_results_backup.csv")
+    print("3. If satisfied, snapshot the current dataset and replace it:")
+    print("   python snapshots.py save -m \"before name corrections\"")
     print("   Copy-Item data\\merged\\season_results_corrected.csv data\\merged\\season_results.csv")
+    print("   (undo with: python snapshots.py restore <id>)")
     print("4. Refresh your Streamlit dashboard")
 
 if __name__ == "__main__":
@@ -0,0 +1,150 @@
+"""
+Course / meet difficulty factors
+Pace per mile assumes each division runs a fixed distance, but some courses
+(or days) are simply slower. Athletes who ran several meets link those
+meets: log pace is modelled as athlete ability (per athlete and division) +
+a steady improvement per meet (forecast.race_axis, common to the league) +
+a factor per season, meet and division, solved as one least-squares system
+for all races.
+
+Within a season everyone runs the meets in the same order, so the field's
+improvement and the factors cannot be told apart there. The factors are
+constrained to average 1 within each season and division, which leaves the
+improvement to be measured by athletes who ran the same division in more
+than one season; with a single season no trend is fitted. The factors then
+describe the course, and adjusted pace keeps the athlete's own progress,
+so meets can be compared directly.
+
+The athlete effects are eliminated algebraically (within-athlete
+demeaning), so the system that is actually solved has one unknown per
+meet and division and is built from bincounts over the results and over
+pairs of meets run by the same athlete; no results x (athletes + meets) or
+athletes x meets matrix is formed.
+"""
+import numpy as np
+import pandas as pd
+
+import dataset
+import forecast
+from add_distance_metrics import format_pace
+
+FACTOR_KEYS = ['season_year', 'meet_number', 'division']
+COURSE_COLUMNS = ('course_factor', 'adjusted_pace_per_mi_min', 'adjusted_pace_per_mi_str')
+# Pulls factors with few linking athletes toward 1 (in units of results)
+RIDGE = 2.0
+
+
+def build_course_factors(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    One row per season, meet and division: course_factor (> 1 = slower than
+    that division's average meet that season), results and the number of
+    athletes linking the meet to others (repeat_athletes)
+    The fitted improvement of the field per meet is in attrs['improvement_per_meet']
+    """
+    valid = df.dropna(subset=FACTOR_KEYS + ['athlete_full_name', 'pace_per_mi_min'])
+    valid = valid[valid['pace_per_mi_min'] > 0]
+    # Ability is per athlete and division, across seasons: the trend term carries improvement
+    athlete_codes, _ = pd.MultiIndex.from_frame(valid[['athlete_full_name', 'division']]).factorize()
+    course_codes, courses = pd.MultiIndex.from_frame(valid[FACTOR_KEYS]).factorize(sort=True)
+    n_athletes, n_courses = athlete_codes.max() + 1, len(courses)
+    y = np.log(valid['pace_per_mi_min'].to_numpy(dtype=float))
+    x = forecast.race_axis(valid['season_year'].astype(int), valid['meet_number'].astype(int)).to_numpy(dtype=float)
+    x -= x.min()
+
+    # Normal equations of the demeaned system, unknowns [log factors, trend]:
+    # F'F - A' diag(1/n_a) A, F'x - A' mean_x and F'y - A' mean_y, with A the athlete x course
+    # result counts. A is only held as its non-zero entries (one per athlete and
+    # meet run), and A' diag(1/n_a) A is summed over pairs of meets run by the same athlete
+    per_athlete = np.bincount(athlete_codes, minlength=n_athletes)
+    entry_codes, entry_counts = np.unique(athlete_codes * n_courses + course_codes, return_counts=True)
+    entries = pd.DataFrame({'athlete': entry_codes // n_courses, 'course': entry_codes % n_courses,
+                            'count': entry_counts})
+    pairs = entries.merge(entries, on='athlete')
+    shared = np.bincount(
+        (pairs['course_x'] * n_courses + pairs['course_y']).to_numpy(),
+        (pairs['count_x'] * pairs['count_y'] / per_athlete[pairs['athlete']]).to_numpy(),
+        minlength=n_courses * n_courses).reshape(n_courses, n_courses)
+    results = np.bincount(course_codes, minlength=n_courses)
+    mean_x = np.bincount(athlete_codes, x, minlength=n_athletes) / per_athlete
+    mean_y = np.bincount(athlete_codes, y, minlength=n_athletes) / per_athlete
+
+    def course_sums(values, athlete_means):
+        return np.bincount(course_codes, values, minlength=n_courses) - np.bincount(
+            entries['course'], entries['count'] * athlete_means[entries['athlete']], minlength=n_courses)
+
+    ftf = np.diag(results.astype(float)) - shared + RIDGE * np.eye(n_courses)
+    ftx, fty = course_sums(x, mean_x), course_sums(y, mean_y)
+    xtx = (x * x).sum() - (per_athlete * mean_x * mean_x).sum()
+    xty = (x * y).sum() - (per_athlete * mean_x * mean_y).sum()
+
+    # Factors are only relative inside a season and division: they average to 1
+    # there (weighted by results). Within a season a common trend and the
+    # factors cannot be told apart, so the constraint leaves the trend to be
+    # measured by athletes who ran the same division in more than one season
+    table = courses.to_frame(index=False, name=FACTOR_KEYS)
+    group_codes, _ = pd.MultiIndex.from_frame(table[['season_year', 'division']]).factorize()
+    constraint = np.zeros((group_codes.max() + 1, n_courses))
+    constraint[group_codes, np.arange(n_courses)] = results
+
+    n_groups = len(constraint)
+    system = np.zeros((n_courses + 1 + n_groups,) * 2)
+    system[:n_courses, :n_courses] = ftf
+    system[:n_courses, n_courses] = system[n_courses, :n_courses] = ftx
+    system[n_courses, n_courses] = xtx
+    system[n_courses + 1:, :n_courses] = constraint
+    system[:n_courses, n_courses + 1:] = constraint.T
+    rhs = np.concatenate([fty, [xty], np.zeros(n_groups)])
+    entry_seasons = table['season_year'].to_numpy()[entries['course']]
+    if not (pd.Series(entry_seasons).groupby(entries['athlete'].to_numpy()).nunique() > 1).any():
+        # No athlete ran a division in two seasons: no trend can be measured, so none is fitted
+        system[n_courses, :] = system[:, n_courses] = 0.0
+        system[n_courses, n_courses] = 1.0
+        rhs[n_courses] = 0.0
+    solution = np.linalg.lstsq(system, rhs, rcond=None)[0]
+    log_factor, trend = solution[:n_courses], solution[n_courses]
+
+    table['course_factor'] = np.exp(log_factor).round(4)
+    table['results'] = results
+    table['repeat_athletes'] = np.bincount(
+        entries['course'], per_athlete[entries['athlete']] > 1, minlength=n_courses).astype(int)
+    if 'meet_name' in valid.columns:
+        table['meet_name'] = valid.groupby(course_codes)['meet_name'].first().to_numpy()
+    # Negative: paces drop (get faster) from one meet to the next
+    table.attrs['improvement_per_meet'] = float(np.expm1(trend))
+    return table
+
+
+def add_course_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    course_factor: the result's meet/division factor (1 where none was fitted)
+    adjusted_pace_per_mi_min / _str: pace divided by the factor, comparable across meets
+    """
+    factors = build_course_factors(df)[FACTOR_KEYS + ['course_factor']]
+    df = df.drop(columns=list(COURSE_COLUMNS), errors='ignore')
+    df = df.merge(factors, on=FACTOR_KEYS, how='left')
+    df['course_factor'] = df['course_factor'].fillna(1.0)
+    df['adjusted_pace_per_mi_min'] = df['pace_per_mi_min'].where(df['pace_per_mi_min'] > 0) / df['course_factor']
+    df['adjusted_pace_per_mi_str'] = df['adjusted_pace_per_mi_min'].apply(format_pace)
+    return df
+
+
+def main():
+    import time
+
+    df = dataset.read_results()
+    start = time.perf_counter()
+    factors = build_course_factors(df)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    print("=" * 80)
+    print("COURSE DIFFICULTY FACTORS")
+    print("=" * 80)
+    print(f"\n{len(factors)} meet/division factors fitted from {int(factors['results'].sum()):,} results "
+          f"in {elapsed_ms:.0f} ms")
+    print(f"League-wide pace change per meet: {factors.attrs['improvement_per_meet'] * 100:+.2f}%")
+    print("(> 1 = slower than the division's average meet that season)\n")
+    print(factors.drop(columns='meet_name', errors='ignore').to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Pre-aggregated race summary cube
+One row per season x meet x division x gender x team x grade cell with
+result/finisher counts and pace statistics, so totals and averages for any
+slice are sums over a few hundred cells instead of a pass over every result.
+
+Distinct-athlete counts do not add up across cells (the same athlete runs
+several meets), so they are kept in a second table of roll-ups per season
+and team, with "All" scopes.
+"""
+import numpy as np
+import pandas as pd
+
+import dataset
+from add_distance_metrics import format_pace
+
+CUBE_DIMS = ['season_year', 'meet_number', 'division', 'gender', 'team_name', 'grade']
+ALL_TEAMS = "All Teams"
+
+
+def build_cube(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Columns: CUBE_DIMS, results, finishers, athletes, pace_count, pace_sum,
+    pace_mean, pace_median, pace_p10, pace_p90 (pace in min/mi)
+    """
+    pace = df['pace_per_mi_min'].where(df['pace_per_mi_min'] > 0)
+    cells = df[CUBE_DIMS].assign(pace=pace, finished=df['finish_time_s'].notna(),
+                                 athlete=df['athlete_full_name'])
+    grouped = cells.groupby(CUBE_DIMS, dropna=False, sort=True)
+    cube = grouped.agg(
+        results=('finished', 'size'),
+        finishers=('finished', 'sum'),
+        athletes=('athlete', 'nunique'),
+        pace_count=('pace', 'count'),
+        pace_sum=('pace', 'sum'),
+        pace_median=('pace', 'median'),
+    )
+    quantiles = grouped['pace'].quantile([0.1, 0.9]).unstack()
+    cube['pace_p10'] = quantiles[0.1]
+    cube['pace_p90'] = quantiles[0.9]
+    cube['pace_mean'] = cube['pace_sum'] / cube['pace_count'].replace(0, np.nan)
+    return cube.reset_index()
+
+
+def build_athlete_rollups(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Distinct athletes and athletes with 2+ results per season and team,
+    including all-season (season_year NaN) and all-team (ALL_TEAMS) scopes.
+    Counts results with a known grade, matching the dashboard's default grade filter.
+    """
+    graded = df[df['grade'].notna()]
+    scopes = []
+    for all_seasons in (False, True):
+        for all_teams in (False, True):
+            scoped = graded.assign(
+                season_year=np.nan if all_seasons else graded['season_year'],
+                team_name=ALL_TEAMS if all_teams else graded['team_name'],
+            )
+            per_athlete = scoped.groupby(['season_year', 'team_name', 'athlete_full_name'], dropna=False).size()
+            scopes.append(per_athlete.groupby(level=['season_year', 'team_name'], dropna=False).agg(
+                athletes='size', progress_athletes=lambda n: int((n > 1).sum())
+            ).reset_index())
+    return pd.concat(scopes, ignore_index=True)
+
+
+def slice_cube(cube: pd.DataFrame, season="All", team=ALL_TEAMS, grades=None, meets=None) -> pd.DataFrame:
+    """Cells matching the dashboard's sidebar filters ("All" / ALL_TEAMS / None = no filter)"""
+    mask = np.ones(len(cube), dtype=bool)
+    if season != "All":
+        mask &= cube['season_year'].to_numpy() == season
+    if team != ALL_TEAMS:
+        mask &= cube['team_name'].to_numpy() == team
+    if grades is not None:
+        mask &= cube['grade'].isin([float(g) for g in grades]).to_numpy()
+    if meets is not None:
+        mask &= cube['meet_number'].isin(meets).to_numpy()
+    return cube[mask]
+
+
+def rollup(cells: pd.DataFrame, by: list) -> pd.DataFrame:
+    """Sum cells up to coarser dimensions; pace_mean is exact, medians/percentiles are not rolled up"""
+    summed = cells.groupby(by, dropna=False)[['results', 'finishers', 'pace_count', 'pace_sum']].sum()
+    summed['pace_mean'] = summed['pace_sum'] / summed['pace_count'].replace(0, np.nan)
+    return summed.reset_index()
+
+
+def athlete_counts(rollups: pd.DataFrame, season="All", team=ALL_TEAMS) -> tuple[int, int]:
+    """(distinct athletes, athletes with 2+ results) for a season/team scope"""
+    season_match = rollups['season_year'].isna() if season == "All" else rollups['season_year'] == season
+    row = rollups[season_match & (rollups['team_name'] == team)]
+    if row.empty:
+        return 0, 0
+    return int(row['athletes'].iloc[0]), int(row['progress_athletes'].iloc[0])
+
+
+def main():
+    import time
+
+    df = dataset.read_results()
+    start = time.perf_counter()
+    cube = build_cube(df)
+    rollups = build_athlete_rollups(df)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    print("=" * 80)
+    print("RACE SUMMARY CUBE")
+    print("=" * 80)
+    print(f"\n{len(df):,} results -> {len(cube):,} cells + {len(rollups):,} athlete roll-ups in {elapsed_ms:.0f} ms")
+
+    print("\nAverage pace by division:")
+    for row in rollup(cube, ['division']).itertuples():
+        print(f"  {row.division:<12} {format_pace(row.pace_mean)} per mile ({row.results} results)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,30 +1,737 @@
 import streamlit as st
 import pandas as pd
-import numpy as np
 import plotly.express as px
-import plotly.graph_objects as go
 from datetime import datetime
+import functools
 
-SAINT_SEBASTIAN_REQUIRED_MEETS = 3
+from add_distance_metrics import format_pace, format_seconds_to_time
+import cube
+import dataset
+import figures
+import partitions
+import precompute
+import profiling
+import ratings
+import records
+import search
+import standings
+import team_scoring
 
+# Sessions share one DataFrame (see get_dataset_store); copy-on-write keeps any
+# per-session column assignment or in-place edit from leaking into it.
+pd.set_option('mode.copy_on_write', True)
 
-def format_seconds_to_time(seconds: float) -> str:
-    """Convert seconds to M:SS.ss format."""
-    if pd.isna(seconds):
-        return ""
-    total_seconds = float(seconds)
-    minutes = int(total_seconds // 60)
-    remaining_seconds = total_seconds % 60
-    return f"{minutes}:{remaining_seconds:05.2f}"
+# XC_SCOPE limits a deployment to some meet series / seasons (see partitions.py):
+# only those partitions are loaded and derived tables are built from that slice
+# (see load_artifact). The per-result columns precompute adds (tiers, race
+# stats, course factors) are kept as computed over the full dataset.
+DATA_SCOPE = partitions.scope_from_env()
 
 
-def highlight_team_row(row: pd.Series, team_name: str) -> list[str]:
-    """Highlight rows that match the selected team."""
-    if team_name == "All Teams":
-        return [""] * len(row)
-    highlight = row.get("Team") == team_name
-    color = "background-color: #fff3cd" if highlight else ""
-    return [color] * len(row)
+def load_artifact(name: str, _df: pd.DataFrame, data_version: str):
+    """
+    precompute.load_artifact for the loaded data. Under XC_SCOPE the artifacts
+    on disk describe the full dataset, so they are neither read nor updated:
+    the table is built from the scoped slice instead.
+    """
+    return precompute.load_artifact(name, _df, data_version, from_disk=not DATA_SCOPE)
+
+
+def get_profiler() -> profiling.RenderProfiler:
+    """This session's render profiler (disabled unless profiling is switched on)."""
+    if '_render_profiler' not in st.session_state:
+        st.session_state['_render_profiler'] = profiling.RenderProfiler()
+    return st.session_state['_render_profiler']
+
+
+def profiled_section(name: str):
+    """Time every call of a section function under `name` when profiling is on."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with get_profiler().section(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+@st.cache_data(max_entries=16)
+def compute_saint_standings(data_version: str, _df: pd.DataFrame, season: int):
+    """
+    Saint Sebastian cumulative-time standings for one season (see standings.py).
+    Cached per dataset version; _df is not hashed, data_version stands in for it.
+    """
+    profiling.note_cache_miss('saint_standings')
+    return standings.saint_sebastian_standings(_df, season)
+
+
+OVERVIEW_SECTIONS = ["Saint Sebastian", "Leaders", "Ratings", "Most Improved", "Breakout Runners", "Progression", "Team Scores"]
+
+
+@st.cache_data(max_entries=64)
+def compute_most_improved(data_version: str, filter_key: tuple, _filtered_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Pace improvement (first race vs latest race) for athletes with 2+ results.
+    Keyed on the dataset version and the sidebar filters that produced _filtered_df.
+    """
+    profiling.note_cache_miss('most_improved')
+    athlete_counts = _filtered_df.groupby('athlete_full_name').size()
+    multi_meet_athletes = athlete_counts[athlete_counts > 1]
+
+    improvements = []
+    # Sort athletes by name for consistent ordering
+    for athlete in sorted(multi_meet_athletes.index):
+        athlete_data = _filtered_df[_filtered_df['athlete_full_name'] == athlete].sort_values('meet_number')
+        if len(athlete_data) >= 2:
+            # Course-adjusted pace per mile: normalized by distance and by how slow each course ran
+            first_pace = athlete_data.iloc[0]['adjusted_pace_per_mi_min']
+            last_pace = athlete_data.iloc[-1]['adjusted_pace_per_mi_min']
+            
+            if pd.notna(first_pace) and pd.notna(last_pace) and first_pace > 0 and last_pace > 0:
+                # Positive improvement means they got faster (lower pace time)
+                improvement = first_pace - last_pace
+                improvements.append({
+                    'Athlete': athlete,
+                    'Team': athlete_data.iloc[0]['team_name'],
+                    'Pace Improvement (sec/mi)': round(improvement * 60, 1),  # Convert to seconds per mile
+                    'First Pace': athlete_data.iloc[0]['adjusted_pace_per_mi_str'],
+                    'Latest Pace': athlete_data.iloc[-1]['adjusted_pace_per_mi_str'],
+                    'Division': athlete_data.iloc[-1]['division']
+                })
+
+    if not improvements:
+        return pd.DataFrame()
+    return pd.DataFrame(improvements).sort_values('Pace Improvement (sec/mi)', ascending=False)
+
+
+@st.cache_data(max_entries=64)
+def compute_team_scores(data_version: str, filter_key: tuple, _filtered_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Cross country team scores (sum of top 5 places) per season, meet, division and gender.
+    Keyed on the dataset version and the sidebar filters that produced _filtered_df.
+    """
+    profiling.note_cache_miss('team_scores')
+    return team_scoring.team_scores(_filtered_df)
+
+
+@st.cache_data(max_entries=4)
+def get_forecasts(data_version: str, _df: pd.DataFrame) -> pd.DataFrame:
+    """
+    League-wide trends and next-meet forecasts (see forecast.py).
+    Read from the precomputed artifact when it matches data_version, else built here.
+    """
+    profiling.note_cache_miss('forecasts')
+    return load_artifact('forecasts', _df, data_version)
+
+
+@st.cache_data(max_entries=4)
+def get_records(data_version: str, _df: pd.DataFrame) -> pd.DataFrame:
+    """
+    PR / season-best table per athlete, season and division (see records.py).
+    Read from the precomputed artifact, updated incrementally if it is behind.
+    """
+    profiling.note_cache_miss('records')
+    return load_artifact('records', _df, data_version)
+
+
+@st.cache_data(max_entries=4)
+def get_summary_cube(data_version: str, _df: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Race summary cube and distinct-athlete roll-ups (see cube.py)."""
+    profiling.note_cache_miss('cube')
+    return (
+        load_artifact('cube', _df, data_version),
+        load_artifact('athlete_rollups', _df, data_version),
+    )
+
+
+def filter_records(records_table: pd.DataFrame, season, athlete: str, team: str, grades: list) -> pd.DataFrame:
+    """Apply the sidebar filters (other than meets) to the records table."""
+    view = records_table
+    if season != "All":
+        view = view[view['season_year'] == season]
+    if athlete != "All Athletes":
+        view = view[view['athlete_full_name'] == athlete]
+    if team != "All Teams":
+        view = view[view['team_name'] == team]
+    if grades:
+        view = view[view['grade'].isin([float(g) for g in grades])]
+    return view
+
+
+@st.cache_data(max_entries=4)
+def get_ratings(data_version: str, _df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Rating history, one row per rated result (see ratings.py).
+    Read from the precomputed artifact; only meets it has not seen are replayed.
+    """
+    profiling.note_cache_miss('ratings')
+    return load_artifact('ratings', _df, data_version)
+
+
+@st.cache_resource(max_entries=2)
+def get_matchup_index(data_version: str, _df: pd.DataFrame):
+    """
+    Head-to-head index (see head_to_head.py), shared by all sessions.
+    A cache resource: the index is read-only and would be costly to copy per caller.
+    """
+    profiling.note_cache_miss('matchups')
+    return load_artifact('matchups', _df, data_version)
+
+
+@st.cache_resource(max_entries=2)
+def get_results_store(data_version: str, _df: pd.DataFrame):
+    """Indexed SQLite store of the results (see store.py), shared by all sessions."""
+    profiling.note_cache_miss('store')
+    return load_artifact('store', _df, data_version)
+
+
+@st.cache_resource(max_entries=2)
+def get_athlete_index(data_version: str, _df: pd.DataFrame) -> search.AthleteIndex:
+    """Athlete name search index (see search.py), built once per dataset version and shared by all sessions."""
+    profiling.note_cache_miss('athlete_index')
+    return search.AthleteIndex(_df)
+
+
+@st.cache_resource(max_entries=2)
+def get_progression(data_version: str, _df: pd.DataFrame):
+    """Athlete x (season, meet) pace matrix (see progression.py), shared by all sessions."""
+    profiling.note_cache_miss('progression')
+    return load_artifact('progression', _df, data_version)
+
+
+@profiled_section("Year over year")
+def year_over_year_section(data_version: str, df: pd.DataFrame, athlete: str):
+    """Season-best changes for one athlete next to the typical change for the same division move."""
+    with get_profiler().section("Progression matrix", cache='progression'):
+        matrix = get_progression(data_version, df)
+    yoy = matrix.year_over_year()
+    mine = yoy[yoy['athlete_full_name'] == athlete] if not yoy.empty else yoy
+    if mine.empty:
+        return
+
+    st.subheader("📅 Year over Year")
+    st.caption("Change in season-best pace (sec/mi, negative = faster) compared with every athlete making the same move")
+    typical = matrix.transition_summary().set_index('transition')['median_change']
+    transition = mine['from_division'] + ' → ' + mine['to_division']
+    st.dataframe(pd.DataFrame({
+        'Seasons': mine['from_season'].astype(str) + ' → ' + mine['to_season'].astype(str),
+        'Division': transition,
+        'From': mine['from_best_pace'].apply(format_pace),
+        'To': mine['to_best_pace'].apply(format_pace),
+        'Change (sec/mi)': mine['delta_sec_per_mi'],
+        'Typical Change': transition.map(typical),
+    }), hide_index=True, use_container_width=True)
+
+
+@st.fragment
+@profiled_section("Progression")
+def progression_section(data_version: str, df: pd.DataFrame, filtered_df: pd.DataFrame):
+    """Cohort pace curves across seasons and typical year-over-year change per division move."""
+    st.subheader("📅 Multi-Year Progression")
+
+    with get_profiler().section("Progression matrix", cache='progression'):
+        matrix = get_progression(data_version, df)
+
+    st.caption("Median change in season-best pace from one season to the next (sec/mi, negative = faster)")
+    st.dataframe(
+        matrix.transition_summary().rename(columns={
+            'transition': 'Division Move', 'athletes': 'Athletes',
+            'median_change': 'Median Change', 'mean_change': 'Mean Change'
+        }),
+        hide_index=True, use_container_width=True
+    )
+
+    # Cohorts: athletes grouped by first season and starting division, limited to the sidebar filters
+    cohorts = matrix.cohorts()
+    cohorts = cohorts[cohorts.index.isin(filtered_df['athlete_full_name'].unique())]
+    cohort_sizes = cohorts.value_counts()
+    if cohort_sizes.empty:
+        return
+    chosen = st.multiselect(
+        "Cohorts (first season and division)",
+        cohort_sizes.index.tolist(),
+        default=cohort_sizes.index[:3].tolist(),
+        format_func=lambda cohort: f"{cohort} ({cohort_sizes[cohort]} athletes)",
+        key="progression_cohorts"
+    )
+    curves = []
+    for cohort in chosen:
+        curve = matrix.cohort_curve(cohorts.index[cohorts == cohort])
+        curve['Cohort'] = cohort
+        curves.append(curve)
+    if not curves:
+        return
+    curves = pd.concat(curves, ignore_index=True)
+    curves['Race'] = curves['season_year'].astype(str) + ' M' + curves['meet_number'].astype(str)
+    fig = px.line(
+        curves, x='Race', y='median_pace', color='Cohort', markers=True,
+        hover_data=['athletes'],
+        labels={'median_pace': 'Median Pace (min/mi)'},
+        title='Cohort Median Pace by Meet'
+    )
+    fig.update_yaxes(autorange='reversed')
+    fig.update_layout(height=450)
+    with get_profiler().section("Chart: cohort curves"):
+        st.plotly_chart(fig, width='stretch')
+
+
+@st.fragment
+@profiled_section("Head-to-head")
+def head_to_head_section(data_version: str, df: pd.DataFrame, athlete: str):
+    """Closest rivals and head-to-head records; the compare box only reruns this fragment."""
+    st.subheader("🤝 Head-to-Head")
+
+    with get_profiler().section("Matchup index", cache='matchups'):
+        matchups = get_matchup_index(data_version, df)
+
+    rivals = matchups.closest_rivals(athlete)
+    if rivals.empty:
+        st.info("No athlete has raced this athlete more than once yet.")
+    else:
+        st.caption("Closest rivals: raced each other 2+ times, smallest average time gap first")
+        st.dataframe(rivals, hide_index=True, use_container_width=True)
+
+    # Offer the closest rivals and the athletes matching the search box, not
+    # every name in the league; athletes already picked stay in the list
+    query = st.text_input(
+        "Find athletes to compare",
+        key="head_to_head_query",
+        placeholder="Type a name",
+        help="Search by first or last name, or the start of either; small typos are fine"
+    )
+    suggested = rivals['Rival'].head(5).tolist() if not rivals.empty else []
+    found = []
+    if query.strip():
+        with get_profiler().section("Athlete search", cache='athlete_index'):
+            found = [match.name for match in get_athlete_index(data_version, df).search(query)]
+    # New options make a new widget, so the current picks are passed back in as the default
+    picked = [name for name in st.session_state.get("head_to_head_compare", suggested[:1]) if name != athlete]
+    compare = st.multiselect(
+        "Compare with",
+        [name for name in dict.fromkeys(suggested + found + picked) if name != athlete],
+        default=picked,
+        key="head_to_head_compare"
+    )
+    if not compare:
+        return
+
+    if len(compare) > 1:
+        st.markdown("**Wins (row athlete over column athlete)**")
+        st.dataframe(matchups.group_records([athlete] + compare), use_container_width=True)
+
+    for other in compare:
+        record = matchups.record(athlete, other)
+        if record['races'] == 0:
+            st.info(f"{athlete} and {other} have not raced each other.")
+            continue
+        st.markdown(f"**{athlete} vs {other}: {record['wins']}-{record['losses']}** "
+                    f"(average margin {record['avg_margin_s']:+.1f}s)")
+        shared = matchups.head_to_head(athlete, other).rename(columns={
+            'season_year': 'Season', 'meet_number': 'Meet #', 'division': 'Division',
+            'gender': 'Gender', 'meet_name': 'Meet'
+        })
+        shared['Season'] = shared['Season'].astype(int).astype(str)
+        st.dataframe(shared, hide_index=True, use_container_width=True)
+
+
+@st.fragment
+@profiled_section("Saint Sebastian")
+def saint_sebastian_section(data_version: str, df: pd.DataFrame, selected_season: int):
+    """Saint Sebastian tracker; the school highlight only reruns this fragment."""
+    profiler = get_profiler()
+    with profiler.section("Saint Sebastian: standings", cache='saint_standings'):
+        saint_standings, saint_categories, school_options, meets_completed = compute_saint_standings(
+            data_version, df, selected_season
+        )
+
+    st.subheader("Saint Sebastian Award Tracker")
+    st.caption(
+        f"Lowest cumulative race time after {meets_completed} completed meet{'s' if meets_completed != 1 else ''}. "
+        f"Athletes must finish all {standings.SAINT_SEBASTIAN_REQUIRED_MEETS} meets."
+    )
+
+    if meets_completed == 0 or saint_standings.empty:
+        st.info("Standings will appear once athletes have results for each completed meet.")
+        return
+
+    remaining_meets = max(standings.SAINT_SEBASTIAN_REQUIRED_MEETS - meets_completed, 0)
+    if remaining_meets > 0:
+        st.warning(
+            f"Provisional standings after {meets_completed} meet{'s' if meets_completed != 1 else ''}. "
+            f"{remaining_meets} meet{'s' if remaining_meets != 1 else ''} remaining before the award is finalized. "
+            "Everyone listed is in the hunt heading into the next meet."
+        )
+
+    view = st.radio(
+        "Saint Sebastian view",
+        ["Standings", "By School"],
+        key="saint_sebastian_view",
+        horizontal=True,
+        label_visibility="collapsed"
+    )
+
+    if view == "By School":
+        selected_school = st.selectbox(
+            "Highlight a school",
+            school_options,
+            index=0,
+            key="saint_sebastian_school"
+        )
+
+        if not saint_categories:
+            st.info("No Saint Sebastian standings available yet.")
+            return
+
+        for category in saint_categories:
+            category_df = saint_standings[
+                (saint_standings['division'] == category['division']) &
+                (saint_standings['gender'] == category['gender'])
+            ]
+
+            if category_df.empty:
+                continue
+
+            st.markdown(f"**{category['category']}**")
+            display_df = figures.standings_table(category_df)
+
+            if selected_school != "All Teams":
+                st.dataframe(
+                    display_df.style.apply(figures.highlight_team_row, axis=1, team_name=selected_school),
+                    hide_index=True,
+                    use_container_width=True
+                )
+            else:
+                st.dataframe(display_df, hide_index=True, use_container_width=True)
+    else:
+        saint_top3 = saint_standings[saint_standings['rank'] <= 3]
+
+        if saint_top3.empty or not saint_categories:
+            st.info("Not enough athletes have completed each meet to show standings.")
+            return
+
+        for category in saint_categories:
+            category_df = saint_top3[
+                (saint_top3['division'] == category['division']) &
+                (saint_top3['gender'] == category['gender'])
+            ]
+
+            if category_df.empty:
+                continue
+
+            st.markdown(f"**{category['category']}**")
+            display_df = figures.standings_table(category_df)
+            st.dataframe(display_df, hide_index=True, use_container_width=True)
+
+
+@profiled_section("Leaders")
+def leaders_section(df: pd.DataFrame, filtered_df: pd.DataFrame, records_view: pd.DataFrame | None):
+    """Fastest normalized pace and top placements for the current filters."""
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.subheader("⚡ Fastest Pace (Normalized)")
+        st.caption("Best pace per mile - fair comparison across all divisions")
+        if records_view is not None:
+            # Season bests are precomputed: one row per athlete, season and division
+            fastest = records_view.nsmallest(10, 'season_best_pace')
+            tiers = df[['athlete_full_name', 'season_year', 'division', 'gender', 'performance_tier']].drop_duplicates(
+                ['athlete_full_name', 'season_year', 'division', 'gender'])
+            fastest = fastest.merge(tiers, on=['athlete_full_name', 'season_year', 'division', 'gender'], how='left')
+            fastest = pd.DataFrame({
+                'Athlete': fastest['athlete_full_name'],
+                'Team': fastest['team_name'],
+                'Pace/mi': fastest['season_best_pace'].apply(format_pace),
+                'Division': fastest['division'],
+                'Tier': fastest['performance_tier'],
+                'Meet': fastest['season_best_meet'],
+            })
+        else:
+            # A meet filter is set: season bests do not apply, scan the filtered results
+            fastest_pace_df = filtered_df[filtered_df['pace_per_mi_min'].notna() & (filtered_df['pace_per_mi_min'] > 0)]
+            fastest = fastest_pace_df.nsmallest(10, 'pace_per_mi_min')[[
+                'athlete_full_name', 'team_name', 'pace_per_mi_str', 'division', 'performance_tier', 'meet_name'
+            ]]
+            fastest.columns = ['Athlete', 'Team', 'Pace/mi', 'Division', 'Tier', 'Meet']
+        if len(fastest) > 0:
+            st.dataframe(fastest, hide_index=True, use_container_width=True)
+        else:
+            st.info("No pace data available")
+    
+    with col2:
+        st.subheader("🏆 Top Placements")
+        st.caption("Best finishes relative to field size, then pace within the race")
+        # Partial selection on the precomputed columns; only the shortlist is sorted
+        top_places = filtered_df.nlargest(10, 'finish_percentile', keep='all') \
+            .sort_values(['finish_percentile', 'pace_z'], ascending=[False, True]).head(10)
+        top_places = top_places[[
+            'athlete_full_name', 'team_name', 'place_overall', 'field_size', 'finish_percentile', 'meet_name'
+        ]]
+        top_places.columns = ['Athlete', 'Team', 'Place', 'Field', 'Percentile', 'Meet']
+        st.dataframe(top_places, hide_index=True, use_container_width=True)
+
+
+@profiled_section("Ratings")
+def ratings_section(data_version: str, df: pd.DataFrame, filtered_df: pd.DataFrame, selected_season):
+    """Rating leaderboard per division and gender."""
+    st.subheader("📶 Performance Ratings")
+    st.caption("Elo-style rating updated after every race from finish order against the whole field - "
+               "beating higher-rated runners gains more. Everyone starts at 1500.")
+
+    with get_profiler().section("Ratings", cache='ratings'):
+        history = get_ratings(data_version, df)
+    table = ratings.current_ratings(history, season=None if selected_season == "All" else selected_season)
+    table = table[table['athlete_full_name'].isin(filtered_df['athlete_full_name'].unique())]
+    if table.empty:
+        st.info("No rated athletes for the current selection.")
+        return
+
+    # Ratings compare within a race pool: rank by the division and gender of each athlete's latest race
+    gender_label = table['gender'].map({'M': 'Boys', 'F': 'Girls'}).fillna(table['gender'])
+    table = table.assign(category=gender_label + " " + table['division'])
+    category = st.selectbox("Race", sorted(table['category'].unique()), key="ratings_category")
+    board = table[table['category'] == category].head(25)
+    st.dataframe(pd.DataFrame({
+        'Rank': range(1, len(board) + 1),
+        'Athlete': board['athlete_full_name'],
+        'Team': board['team_name'],
+        'Rating': board['rating'].round().astype(int),
+        'Peak': board['peak_rating'].round().astype(int),
+        'Races': board['races'],
+        'Last Season': board['season_year'].astype(int).astype(str),
+    }), hide_index=True, use_container_width=True)
+
+
+@profiled_section("Most improved")
+def most_improved_section(data_version: str, filter_key: tuple, filtered_df: pd.DataFrame):
+    """Most improved athletes by pace per mile."""
+    st.subheader("📊 Most Improved Athletes (By Pace)")
+    st.caption("Improvement calculated using pace per mile for fair comparison across divisions")
+
+    with get_profiler().section("Improvement calc", cache='most_improved'):
+        improvements_df = compute_most_improved(data_version, filter_key, filtered_df)
+    if not improvements_df.empty:
+        st.dataframe(improvements_df.head(10), hide_index=True, use_container_width=True)
+    else:
+        st.info("No improvement data available for the current selection.")
+
+
+@profiled_section("Breakout runners")
+def breakout_section(data_version: str, df: pd.DataFrame, filtered_df: pd.DataFrame):
+    """Athletes whose pace trend is improving fastest within their division and gender."""
+    st.subheader("🚀 Breakout Runners")
+    st.caption("Steepest pace improvement per race (distance-normalized, 3+ races) - "
+               "top 10% within each division and gender")
+
+    with get_profiler().section("Forecasts", cache='forecasts'):
+        forecasts = get_forecasts(data_version, df)
+    if forecasts.empty:
+        st.info("No forecast data available.")
+        return
+
+    shown = forecasts[forecasts['breakout'] & forecasts['athlete_full_name'].isin(filtered_df['athlete_full_name'])]
+    if shown.empty:
+        st.info("No breakout runners for the current selection.")
+        return
+
+    shown = shown.sort_values('trend_sec_per_race')
+    breakout_display = pd.DataFrame({
+        'Athlete': shown['athlete_full_name'],
+        'Team': shown['team_name'],
+        'Division': shown['division'],
+        'Races': shown['races'],
+        'Trend (sec/mi per race)': shown['trend_sec_per_race'].round(1),
+        'Next Meet Pace': shown['projected_pace_str'],
+        'Confidence': shown['confidence'],
+    })
+    st.dataframe(breakout_display, hide_index=True, use_container_width=True)
+
+
+@st.fragment
+@profiled_section("What-if lineup")
+def what_if_section(data_version: str, df: pd.DataFrame, score_filtered: pd.DataFrame):
+    """Re-score a race with runners removed or added; only this fragment reruns on changes."""
+    st.subheader("🔀 What-If Lineup")
+    st.caption("Remove runners from a race or add teammates at their best time in that division this season. "
+               "Everyone behind a change moves up or down a place.")
+
+    races = score_filtered[['Season', 'Meet', 'Division', 'Gender']].drop_duplicates() \
+        if 'Season' in score_filtered.columns else pd.DataFrame()
+    if races.empty:
+        st.info("Select a season with scored races to build a what-if lineup.")
+        return
+    races = races.sort_values(['Season', 'Meet', 'Division', 'Gender'], ascending=[False, False, True, True])
+    race_labels = [f"{int(r.Season)} Meet {int(r.Meet)} - {r.Division} {r.Gender}" for r in races.itertuples()]
+
+    col1, col2 = st.columns(2)
+    with col1:
+        race_label = st.selectbox("Race", race_labels, key="what_if_race")
+    race = races.iloc[race_labels.index(race_label)]
+    # Indexed lookups: only this race's and this team's rows are read
+    with get_profiler().section("Results store", cache='store'):
+        results_store = get_results_store(data_version, df)
+    race_df = results_store.race_results(race['Season'], race['Meet'], race['Division'], race['Gender'])
+    with col2:
+        team = st.selectbox("Team", sorted(race_df['team_name'].dropna().unique().tolist()), key="what_if_team")
+
+    team_runners = race_df[race_df['team_name'] == team].sort_values('place_overall')
+    # Candidates: teammates in the same season/division/gender who sat this race out, at their best time
+    season_group = results_store.team_results(team, race['Season'])
+    season_group = season_group[
+        (season_group['division'] == race['Division']) & (season_group['gender'] == race['Gender']) &
+        ~season_group['athlete_full_name'].isin(team_runners['athlete_full_name'])
+    ]
+    candidates = season_group.groupby('athlete_full_name')['finish_time_s'].min().dropna()
+
+    col1, col2 = st.columns(2)
+    with col1:
+        removed = st.multiselect("Remove runners", team_runners['athlete_full_name'].tolist(), key="what_if_remove")
+    with col2:
+        added = st.multiselect(
+            "Add runners", candidates.index.tolist(), key="what_if_add",
+            format_func=lambda name: f"{name} ({format_seconds_to_time(candidates[name])})"
+        )
+
+    # The chosen lineup plus every single-runner change, scored in one batch
+    lineup = team_scoring.Scenario(
+        "Your lineup", remove=removed, add=[(name, team, candidates[name]) for name in added]
+    )
+    singles = [team_scoring.Scenario(f"Without {name}", remove=[name]) for name in team_runners['athlete_full_name']]
+    singles += [team_scoring.Scenario(f"With {name}", add=[(name, team, time_s)]) for name, time_s in candidates.items()]
+    with get_profiler().section("What-if simulation"):
+        results = team_scoring.RaceSimulator(race_df).simulate([lineup] + singles)
+
+    actual = results[(results['Scenario'] == 'Actual') & (results['Team'] == team)]
+    mine = results[(results['Scenario'] == 'Your lineup') & (results['Team'] == team)]
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Actual Score", int(actual['Score'].iloc[0]) if not actual.empty else "Not scored",
+                  help="Teams need 5 finishers to score")
+    with col2:
+        if mine.empty:
+            st.metric("What-If Score", "Not scored")
+        else:
+            change = mine['Change'].iloc[0]
+            st.metric("What-If Score", int(mine['Score'].iloc[0]),
+                      delta=None if pd.isna(change) else f"{change:+.0f}", delta_color="inverse")
+    with col3:
+        if not mine.empty:
+            st.metric("What-If Team Place", f"#{int(mine['Team Place'].iloc[0])}",
+                      delta=f"{int(mine['Team Place'].iloc[0] - actual['Team Place'].iloc[0]):+d}" if not actual.empty else None,
+                      delta_color="inverse")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown("**Standings with your lineup**")
+        st.dataframe(
+            results[results['Scenario'] == 'Your lineup'].sort_values('Score')[['Team Place', 'Team', 'Score', 'Change']],
+            hide_index=True, use_container_width=True
+        )
+    with col2:
+        st.markdown(f"**{team}: impact of each single change**")
+        impact = results[(results['Team'] == team) & results['Scenario'].isin([s.label for s in singles])]
+        st.dataframe(
+            impact.sort_values('Change')[['Scenario', 'Score', 'Change', 'Team Place']],
+            hide_index=True, use_container_width=True
+        )
+
+
+@st.fragment
+@profiled_section("Team scores")
+def team_scores_section(data_version: str, filter_key: tuple, df: pd.DataFrame, filtered_df: pd.DataFrame):
+    """Team scoring tables and chart; the Season/Division/Gender boxes only rerun this fragment."""
+    st.subheader("🏫 Team Performance (Cross Country Scoring)")
+    
+    st.info("**Cross Country Scoring**: Each team's score is the sum of their top 5 finishers' places. Lower score wins!")
+    
+    profiler = get_profiler()
+    with profiler.section("Team scoring", cache='team_scores'):
+        team_scores_df = compute_team_scores(data_version, filter_key, filtered_df)
+    
+    if team_scores_df.empty:
+        st.warning("Not enough team data for scoring (teams need 5+ runners)")
+        return
+
+    # Show team scores table sorted by score (lower is better)
+    st.subheader("📊 Team Scores by Race")
+    
+    # Allow filtering by division and gender
+    filter_cols = st.columns(3) if 'Season' in team_scores_df.columns else st.columns(2)
+    
+    if 'Season' in team_scores_df.columns:
+        with filter_cols[0]:
+            season_filter = st.selectbox(
+                "Season", ["All"] + sorted(team_scores_df['Season'].unique().tolist()), key="team_scores_season"
+            )
+    
+    with filter_cols[-2]:
+        score_division = st.selectbox(
+            "Division", ["All"] + sorted(team_scores_df['Division'].unique().tolist()), key="team_scores_division"
+        )
+    with filter_cols[-1]:
+        score_gender = st.selectbox(
+            "Gender", ["All"] + sorted(team_scores_df['Gender'].unique().tolist()), key="team_scores_gender"
+        )
+    
+    score_filtered = team_scores_df
+    if 'Season' in team_scores_df.columns and season_filter != "All":
+        score_filtered = score_filtered[score_filtered['Season'] == season_filter]
+    if score_division != "All":
+        score_filtered = score_filtered[score_filtered['Division'] == score_division]
+    if score_gender != "All":
+        score_filtered = score_filtered[score_filtered['Gender'] == score_gender]
+    
+    # Sort by season (if applicable), then meet, then score
+    sort_cols = ['Season', 'Meet', 'Score'] if 'Season' in score_filtered.columns else ['Meet', 'Score']
+    score_filtered = score_filtered.sort_values(sort_cols)
+    
+    st.dataframe(figures.team_scores_table(score_filtered), hide_index=True, use_container_width=True)
+    
+    # Visualization: Best team scores
+    st.subheader("🏆 Top Team Performances (Lowest Scores)")
+    fig_scores = figures.top_team_scores_figure(team_scores_df)
+    with profiler.section("Chart: top team scores"):
+        st.plotly_chart(fig_scores, width='stretch')
+
+    what_if_section(data_version, df, score_filtered)
+
+
+@st.fragment
+@profiled_section("Overview sections")
+def overview_sections(data_version: str, filter_key: tuple, df: pd.DataFrame, filtered_df: pd.DataFrame,
+                      records_view: pd.DataFrame | None, selected_season, has_progress_data: bool):
+    """
+    Lazily rendered overview tabs: only the selected section is computed and drawn,
+    and switching sections reruns this fragment instead of the whole script.
+    """
+    sections = [
+        section for section in OVERVIEW_SECTIONS
+        if not (section == "Saint Sebastian" and selected_season == "All")
+        and not (section == "Most Improved" and not has_progress_data)
+        and not (section == "Progression" and selected_season != "All")
+    ]
+    section = st.radio(
+        "Section",
+        sections,
+        key="overview_section",
+        horizontal=True,
+        label_visibility="collapsed"
+    )
+
+    if section == "Saint Sebastian":
+        saint_sebastian_section(data_version, df, selected_season)
+    elif section == "Leaders":
+        leaders_section(df, filtered_df, records_view)
+    elif section == "Ratings":
+        ratings_section(data_version, df, filtered_df, selected_season)
+    elif section == "Most Improved":
+        most_improved_section(data_version, filter_key, filtered_df)
+    elif section == "Breakout Runners":
+        breakout_section(data_version, df, filtered_df)
+    elif section == "Progression":
+        progression_section(data_version, df, filtered_df)
+    elif section == "Team Scores":
+        team_scores_section(data_version, filter_key, df, filtered_df)
+
 
 # Page configuration
 st.set_page_config(
@@ -53,27 +760,41 @@ st.markdown("""
     </style>
     """, unsafe_allow_html=True)
 
-# Load data
-@st.cache_data
-def load_data():
-    try:
-        df = pd.read_csv('data/merged/season_results.csv')
-        # Ensure season_year is numeric
-        if 'season_year' in df.columns:
-            df['season_year'] = pd.to_numeric(df['season_year'], errors='coerce')
-        return df
-    except Exception as e:
-        st.error(f"Error loading data: {str(e)}")
-        return pd.DataFrame()
+# Load data once per process. cache_resource hands every session the same
+# store instead of unpickling a private copy per caller like cache_data does.
+# The store watches the file's version and swaps in new data in the background.
+@st.cache_resource
+def get_dataset_store():
+    profiling.note_cache_miss('dataset_store')
+    return dataset.DatasetStore(
+        loader=partitions.scoped_loader(DATA_SCOPE) if DATA_SCOPE else precompute.read_prepared)
+
+# Meet day: watch.py rewrites the dataset as result pages arrive. With live
+# updates on, a timer fragment checks the store and reruns the page once the
+# new version has loaded, without anyone touching a widget.
+LIVE_REFRESH_S = 5
+
+@st.fragment(run_every=LIVE_REFRESH_S)
+def live_update_check(loaded_version: str):
+    if get_dataset_store().snapshot()[0] != loaded_version:
+        st.rerun(scope="app")
+
+# Profiling is opt-in: ?profile=1 in the URL or the sidebar toggle
+profiler = get_profiler()
+profiler.enabled = st.session_state.get('profile_render', st.query_params.get('profile') == '1')
+profiler.log_path = profiling.PROFILE_LOG_PATH if st.session_state.get('profile_log', False) else None
+profiler.start_run()
 
 try:
-    df = load_data()
+    with profiler.section("Load data", cache='dataset_store'):
+        loaded_version, df = get_dataset_store().snapshot()
+    data_version = partitions.scoped_version(loaded_version, DATA_SCOPE)
     
     if df.empty:
         st.error("No data available. Please check the data file.")
         st.stop()
 except Exception as e:
-    st.error(f"Critical error: {str(e)}")
+    st.error(f"Error loading data: {str(e)}")
     st.stop()
 
 # Title and description
@@ -110,13 +831,29 @@ if 'season_year' in df.columns and not df['season_year'].isna().all():
 else:
     selected_season = "All"
 
-# Athlete search
-athlete_list = sorted(df['athlete_full_name'].dropna().unique())
-selected_athlete = st.sidebar.selectbox(
+# Athlete search: the index answers the query, so only the best few names
+# (not every athlete in the league) are sent to the browser
+athlete_query = st.sidebar.text_input(
     "Search Athlete",
-    ["All Athletes"] + athlete_list,
-    help="Select an athlete to view their progress"
+    key="athlete_query",
+    placeholder="Type a name",
+    help="Search by first or last name, or the start of either; small typos are fine"
 )
+selected_athlete = "All Athletes"
+if athlete_query.strip():
+    with profiler.section("Athlete search", cache='athlete_index'):
+        athlete_matches = get_athlete_index(data_version, df).search(athlete_query)
+    if athlete_matches:
+        match_labels = {match.name: match.label for match in athlete_matches}
+        # Nothing is picked until the user chooses a match
+        selected_athlete = st.sidebar.selectbox(
+            "Matching Athletes",
+            ["All Athletes"] + list(match_labels),
+            format_func=lambda name: match_labels.get(name, name),
+            help="Select an athlete to view their progress; clear the search to see all athletes"
+        )
+    else:
+        st.sidebar.caption(f"No athletes match \"{athlete_query.strip()}\"")
 
 # Team filter
 team_list = sorted(df['team_name'].dropna().unique())
@@ -141,22 +878,42 @@ selected_meets = st.sidebar.multiselect(
     default=meet_list
 )
 
-# Apply filters
-filtered_df = df.copy()
+# Apply filters (each mask produces a new frame; the shared df is never copied whole)
+with profiler.section("Filtering"):
+    filtered_df = df
 
-# Apply season filter first
-if selected_season != "All" and 'season_year' in df.columns:
-    filtered_df = filtered_df[filtered_df['season_year'] == selected_season]
+    # Apply season filter first
+    if selected_season != "All" and 'season_year' in df.columns:
+        filtered_df = filtered_df[filtered_df['season_year'] == selected_season]
 
-if selected_athlete != "All Athletes":
-    filtered_df = filtered_df[filtered_df['athlete_full_name'] == selected_athlete]
-if selected_team != "All Teams":
-    filtered_df = filtered_df[filtered_df['team_name'] == selected_team]
-if selected_grade:
-    # Convert selected grades to float for comparison with the dataframe
-    filtered_df = filtered_df[filtered_df['grade'].isin([float(g) for g in selected_grade])]
-if selected_meets:
-    filtered_df = filtered_df[filtered_df['meet_number'].isin(selected_meets)]
+    if selected_athlete != "All Athletes":
+        filtered_df = filtered_df[filtered_df['athlete_full_name'] == selected_athlete]
+    if selected_team != "All Teams":
+        filtered_df = filtered_df[filtered_df['team_name'] == selected_team]
+    if selected_grade:
+        # Convert selected grades to float for comparison with the dataframe
+        filtered_df = filtered_df[filtered_df['grade'].isin([float(g) for g in selected_grade])]
+    if selected_meets:
+        filtered_df = filtered_df[filtered_df['meet_number'].isin(selected_meets)]
+
+# Identifies filtered_df for cached section computations
+filter_key = (selected_season, selected_athlete, selected_team, tuple(selected_grade), tuple(selected_meets))
+
+# PRs, season bests and leaderboards are lookups in the records table; they
+# cover whole seasons, so a meet filter falls back to the filtered results
+records_table = records_view = None
+if set(selected_meets) == set(meet_list):
+    with profiler.section("Records lookup", cache='records'):
+        records_table = get_records(data_version, df)
+        records_view = filter_records(records_table, selected_season, selected_athlete, selected_team, selected_grade)
+profiler.context = {
+    'season': selected_season,
+    'athlete': selected_athlete != "All Athletes",
+    'team': selected_team,
+    'grades': len(selected_grade),
+    'meets': len(selected_meets),
+    'rows': len(filtered_df),
+}
 
 # Main dashboard
 if selected_athlete != "All Athletes":
@@ -169,9 +926,14 @@ if selected_athlete != "All Athletes":
     else:
         athlete_data = filtered_df.sort_values('meet_number')
     
+    # Same rows as athlete_data, from the records table (None when a meet filter is set)
+    athlete_records = None
+    if records_table is not None:
+        athlete_records = records.athlete_records(records_table, selected_athlete) if selected_season == "All" else records_view
+
     if len(athlete_data) > 0:
         # Check if multi-season data exists
-        has_multi_season = 'season_year' in athlete_data.columns and athlete_data['season_year'].nunique() > 1
+        has_multi_season = figures.has_multi_season(athlete_data)
         
         # Key metrics row
         col1, col2, col3, col4 = st.columns(4)
@@ -192,11 +954,15 @@ if selected_athlete != "All Athletes":
             else:
                 st.metric(
                     "Grade",
-                    athlete_data.iloc[0]['grade']
+                    athlete_records['grade'].iloc[-1] if athlete_records is not None and len(athlete_records)
+                    else athlete_data.iloc[0]['grade']
                 )
         
         with col3:
-            best_time = athlete_data['finish_time_s'].min()
+            if athlete_records is not None and len(athlete_records):
+                best_time = athlete_records['season_best_time_s'].min()
+            else:
+                best_time = athlete_data['finish_time_s'].min()
             if pd.notna(best_time):
                 st.metric(
                     "Career Best" if has_multi_season else "Best Time",
@@ -204,207 +970,100 @@ if selected_athlete != "All Athletes":
                 )
         
         with col4:
-            best_place = athlete_data['place_overall'].min()
+            if athlete_records is not None and len(athlete_records):
+                best_place = athlete_records['best_place'].min()
+            else:
+                best_place = athlete_data['place_overall'].min()
             if pd.notna(best_place):
                 st.metric(
                     "Best Place",
                     f"#{int(best_place)}"
                 )
         
+        # Next-meet forecast from the league-wide trend fit
+        with profiler.section("Forecasts", cache='forecasts'):
+            forecasts = get_forecasts(data_version, df)
+        athlete_forecast = forecasts[forecasts['athlete_full_name'] == selected_athlete] if not forecasts.empty else forecasts
+        latest_tier = athlete_data['performance_tier'].dropna()
+        fcol1, fcol2, fcol3, fcol4 = st.columns(4)
+        if not athlete_forecast.empty and athlete_forecast.iloc[0]['races'] >= 2:
+            fc = athlete_forecast.iloc[0]
+            with fcol1:
+                st.metric(
+                    "Projected Next Meet Pace",
+                    f"{fc['projected_pace_str']}/mi",
+                    delta=f"{(fc['projected_pace'] - fc['latest_pace']) * 60:+.1f} sec/mi",
+                    delta_color="inverse"
+                )
+            with fcol2:
+                st.metric(
+                    "95% Range",
+                    f"{format_pace(fc['projected_pace_low'])} - {format_pace(fc['projected_pace_high'])}/mi"
+                )
+            with fcol3:
+                st.metric(
+                    "Forecast Confidence",
+                    f"{fc['confidence'].title()}{' 🚀 Breakout' if fc['breakout'] else ''}"
+                )
+        if not latest_tier.empty:
+            with fcol4:
+                st.metric(
+                    "Performance Tier",
+                    latest_tier.iloc[-1],
+                    help="Pace cluster within the athlete's season, division and gender"
+                )
+
         # Progress chart
         st.subheader("⏱️ Time Progress")
+
+        # The charts draw the athlete's row of the progression matrix, already
+        # in (season, meet) order; a single season keeps the filtered meets
+        with profiler.section("Progression matrix", cache='progression'):
+            athlete_series = get_progression(data_version, df).series(selected_athlete)
+        if selected_season != "All":
+            athlete_series = athlete_series[(athlete_series['season_year'] == selected_season)
+                                            & athlete_series['meet_number'].isin(athlete_data['meet_number'])]
         
-        # Create x-axis based on whether multi-season or single season
-        if has_multi_season:
-            # Create combined label for x-axis
-            athlete_data['race_label'] = athlete_data.apply(
-                lambda row: f"{int(row['season_year'])} M{int(row['meet_number'])}" 
-                if pd.notna(row['season_year']) and pd.notna(row['meet_number']) else '', 
-                axis=1
-            )
-            x_data = athlete_data['race_label']
-            x_title = "Season & Meet"
-        else:
-            x_data = athlete_data['meet_number']
-            x_title = "Meet Number"
+        # x-axis: meet number, or season & meet across seasons
+        x_data, x_title = figures.race_axis(athlete_series, has_multi_season)
         
         # Show raw time, normalized pace, and speed
-        col_chart1, col_chart2, col_chart3 = st.columns(3)
-        
-        # Prepare numeric x-axis for trendline
-        athlete_data_with_index = athlete_data.copy()
-        athlete_data_with_index['x_numeric'] = range(len(athlete_data))
-        
-        with col_chart1:
-            st.caption("Raw Finish Time (varies by division)")
-            fig_time = go.Figure()
-            
-            # Add actual data
-            fig_time.add_trace(go.Scatter(
-                x=x_data,
-                y=athlete_data['finish_time_s'],
-                mode='lines+markers',
-                name='Finish Time',
-                line=dict(color='#1f77b4', width=3),
-                marker=dict(size=10),
-                text=athlete_data['finish_time_str'],
-                hovertemplate='<b>%{text}</b><extra></extra>'
-            ))
-            
-            # Add trendline
-            valid_data = athlete_data_with_index[athlete_data_with_index['finish_time_s'].notna()]
-            if len(valid_data) >= 2:
-                z = np.polyfit(valid_data['x_numeric'], valid_data['finish_time_s'], 1)
-                p = np.poly1d(z)
-                fig_time.add_trace(go.Scatter(
-                    x=x_data,
-                    y=p(athlete_data_with_index['x_numeric']),
-                    mode='lines',
-                    name='Trend',
-                    line=dict(color='rgba(31, 119, 180, 0.3)', width=2, dash='dash'),
-                    hoverinfo='skip'
-                ))
-            
-            fig_time.update_layout(
-                xaxis_title=x_title,
-                yaxis_title="Time (seconds)",
-                hovermode='x unified',
-                height=350,
-                showlegend=False,
-                margin=dict(l=0, r=0, t=0, b=0)
-            )
-            
-            st.plotly_chart(fig_time, use_container_width=True)
-        
-        with col_chart2:
-            st.caption("Pace per Mile (normalized by distance)")
-            fig_pace = go.Figure()
-            
-            # Add actual data
-            fig_pace.add_trace(go.Scatter(
-                x=x_data,
-                y=athlete_data['pace_per_mi_min'],
-                mode='lines+markers',
-                name='Pace per Mile',
-                line=dict(color='#2ca02c', width=3),
-                marker=dict(size=10),
-                text=athlete_data['pace_per_mi_str'],
-                hovertemplate='<b>%{text}/mile</b><extra></extra>'
-            ))
-            
-            # Add trendline
-            valid_data = athlete_data_with_index[athlete_data_with_index['pace_per_mi_min'].notna()]
-            if len(valid_data) >= 2:
-                z = np.polyfit(valid_data['x_numeric'], valid_data['pace_per_mi_min'], 1)
-                p = np.poly1d(z)
-                fig_pace.add_trace(go.Scatter(
-                    x=x_data,
-                    y=p(athlete_data_with_index['x_numeric']),
-                    mode='lines',
-                    name='Trend',
-                    line=dict(color='rgba(44, 160, 44, 0.3)', width=2, dash='dash'),
-                    hoverinfo='skip'
-                ))
-            
-            fig_pace.update_layout(
-                xaxis_title=x_title,
-                yaxis_title="Pace (min/mile)",
-                hovermode='x unified',
-                height=350,
-                showlegend=False,
-                margin=dict(l=0, r=0, t=0, b=0)
-            )
-            
-            st.plotly_chart(fig_pace, use_container_width=True)
-        
-        with col_chart3:
-            st.caption("Speed (mph - higher is better)")
-            fig_speed = go.Figure()
-            
-            # Add actual data
-            fig_speed.add_trace(go.Scatter(
-                x=x_data,
-                y=athlete_data['speed_mph'],
-                mode='lines+markers',
-                name='Speed',
-                line=dict(color='#d62728', width=3),
-                marker=dict(size=10),
-                text=[f"{s:.2f} mph" for s in athlete_data['speed_mph']],
-                hovertemplate='<b>%{text}</b><extra></extra>'
-            ))
-            
-            # Add trendline
-            valid_data = athlete_data_with_index[athlete_data_with_index['speed_mph'].notna()]
-            if len(valid_data) >= 2:
-                z = np.polyfit(valid_data['x_numeric'], valid_data['speed_mph'], 1)
-                p = np.poly1d(z)
-                fig_speed.add_trace(go.Scatter(
-                    x=x_data,
-                    y=p(athlete_data_with_index['x_numeric']),
-                    mode='lines',
-                    name='Trend',
-                    line=dict(color='rgba(214, 39, 40, 0.3)', width=2, dash='dash'),
-                    hoverinfo='skip'
-                ))
-            
-            fig_speed.update_layout(
-                xaxis_title=x_title,
-                yaxis_title="Speed (mph)",
-                hovermode='x unified',
-                height=350,
-                showlegend=False,
-                margin=dict(l=0, r=0, t=0, b=0)
-            )
-            
-            st.plotly_chart(fig_speed, use_container_width=True)
+        chart_titles = {'finish_time_s': "Chart: finish time", 'adjusted_pace_per_mi_min': "Chart: pace",
+                        'speed_mph': "Chart: speed"}
+        for chart_col, (column, chart_title) in zip(st.columns(3), chart_titles.items()):
+            with chart_col:
+                st.caption(figures.PROGRESS_CHARTS[column]['caption'])
+                fig = figures.progress_figure(athlete_series, x_data, x_title, column)
+                with profiler.section(chart_title):
+                    st.plotly_chart(fig, use_container_width=True)
         
         # Placement chart
         st.subheader("🏆 Placement Progress")
         
-        fig_place = go.Figure()
-        fig_place.add_trace(go.Scatter(
-            x=x_data,
-            y=athlete_data['place_overall'],
-            mode='lines+markers',
-            name='Overall Place',
-            line=dict(color='#ff7f0e', width=3),
-            marker=dict(size=12),
-            hovertemplate='<b>Place %{y}</b><extra></extra>'
-        ))
-        
-        fig_place.update_layout(
-            xaxis_title=x_title,
-            yaxis_title="Overall Place",
-            yaxis_autorange='reversed',  # Lower place is better
-            hovermode='x unified',
-            height=400,
-            showlegend=False
-        )
-        
-        st.plotly_chart(fig_place, width='stretch')
+        fig_place = figures.placement_figure(athlete_series, x_data, x_title)
+        with profiler.section("Chart: placement"):
+            st.plotly_chart(fig_place, width='stretch')
         
+        if has_multi_season:
+            year_over_year_section(data_version, df, selected_athlete)
+
         # Detailed results table
         st.subheader("📋 Race Results")
+
+        with profiler.section("Ratings", cache='ratings'):
+            rating_history = get_ratings(data_version, df)
+        athlete_data = ratings.add_rating_column(
+            athlete_data, rating_history[rating_history['athlete_full_name'] == selected_athlete])
         
-        display_cols = ['meet_name', 'meet_number', 'place_overall', 'finish_time_str', 'pace_str']
-        if has_multi_season:
-            display_cols.insert(0, 'season_year')
-        
-        results_display = athlete_data[display_cols].copy()
-        
-        # Format season_year as integer without comma separator
-        if has_multi_season and 'season_year' in results_display.columns:
-            results_display['season_year'] = results_display['season_year'].astype(int).astype(str)
-        
-        # Rename columns for display
-        col_names = ['Season', 'Meet', 'Meet #', 'Place', 'Time', 'Pace'] if has_multi_season else ['Meet', 'Meet #', 'Place', 'Time', 'Pace']
-        results_display.columns = col_names
+        results_display = figures.athlete_results_table(athlete_data, has_multi_season)
         
         st.dataframe(
             results_display,
             hide_index=True,
             use_container_width=True
         )
+
+        head_to_head_section(data_version, df, selected_athlete)
         
     else:
         st.info("No results found for this athlete with the selected filters.")
@@ -415,58 +1074,6 @@ else:
         st.header("📈 Multi-Season Overview")
     else:
         st.header(f"📈 {selected_season} Season Overview")
-    
-    # Prepare Saint Sebastian standings when viewing a single season
-    saint_standings = pd.DataFrame()
-    saint_categories = []
-    school_options = ["All Teams"]
-    completed_meets = []
-    meets_completed = 0
-
-    if selected_season != "All":
-        season_scope_df = df[df['season_year'] == selected_season].copy()
-        if not season_scope_df.empty:
-            saint_base = season_scope_df.dropna(
-                subset=['finish_time_s', 'meet_number', 'athlete_full_name']
-            ).copy()
-
-            if not saint_base.empty:
-                saint_base['meet_number'] = saint_base['meet_number'].astype(int)
-                saint_base['division'] = saint_base['division'].fillna("Unknown")
-                saint_base['gender'] = saint_base['gender'].fillna("Unknown")
-                saint_base['team_name'] = saint_base['team_name'].fillna("Unknown")
-                saint_base['gender_label'] = saint_base['gender'].map({'M': 'Boys', 'F': 'Girls'}).fillna(saint_base['gender'])
-                saint_base['category'] = saint_base['gender_label'] + " " + saint_base['division']
-
-                completed_meets = sorted(saint_base['meet_number'].unique())
-                meets_completed = len(completed_meets)
-
-                if meets_completed > 0:
-                    group_cols = ['division', 'gender', 'gender_label', 'category', 'athlete_full_name', 'team_name']
-                    saint_standings = saint_base.groupby(group_cols).agg(
-                        cumulative_time=('finish_time_s', 'sum'),
-                        meets_run=('meet_number', 'nunique')
-                    ).reset_index()
-
-                    saint_standings = saint_standings[saint_standings['meets_run'] == meets_completed].copy()
-
-                    if not saint_standings.empty:
-                        saint_standings = saint_standings.sort_values(['division', 'gender', 'cumulative_time'])
-                        saint_standings['rank'] = saint_standings.groupby(['division', 'gender']).cumcount() + 1
-                        leader_time = saint_standings.groupby(['division', 'gender'])['cumulative_time'].transform('min')
-                        saint_standings['time_back'] = saint_standings['cumulative_time'] - leader_time
-                        saint_standings['cumulative_time_str'] = saint_standings['cumulative_time'].apply(format_seconds_to_time)
-                        saint_standings['time_back_str'] = saint_standings['time_back'].apply(
-                            lambda x: "--" if pd.isna(x) or x <= 0 else format_seconds_to_time(x)
-                        )
-                        saint_categories = (
-                            saint_standings[['category', 'division', 'gender', 'gender_label']]
-                            .drop_duplicates()
-                            .sort_values(['division', 'gender'])
-                            .to_dict('records')
-                        )
-
-                school_options = ["All Teams"] + sorted(saint_base['team_name'].dropna().unique().tolist())
 
     # Add info box about pace normalization
     with st.expander("ℹ️ Why Pace Per Mile?", expanded=False):
@@ -484,291 +1091,92 @@ else:
         **Example:** A 11:37 Frosh time (2km) = 5:48/mile pace  
         vs. a 16:50 JV time (3km) = 5:36/mile pace → **Actually faster!**
         """)
-
-    if selected_season != "All":
-        st.subheader("Saint Sebastian Award Tracker")
-        st.caption(
-            f"Lowest cumulative race time after {meets_completed} completed meet{'s' if meets_completed != 1 else ''}. "
-            f"Athletes must finish all {SAINT_SEBASTIAN_REQUIRED_MEETS} meets."
+    
+    # Summary metrics are sums over the pre-aggregated cube cells for the current filters
+    with profiler.section("Summary cube", cache='cube'):
+        cube_table, athlete_rollups = get_summary_cube(data_version, df)
+        cube_cells = cube.slice_cube(
+            cube_table, selected_season, selected_team, selected_grade or None, selected_meets or None
         )
-
-        if meets_completed == 0 or saint_standings.empty:
-            st.info("Standings will appear once athletes have results for each completed meet.")
+        # Distinct athletes are only pre-counted for the default grade and meet selection
+        if set(selected_grade) == set(grade_list) and set(selected_meets) == set(meet_list):
+            total_athletes, progress_athletes = cube.athlete_counts(athlete_rollups, selected_season, selected_team)
         else:
-            remaining_meets = max(SAINT_SEBASTIAN_REQUIRED_MEETS - meets_completed, 0)
-            if remaining_meets > 0:
-                st.warning(
-                    f"Provisional standings after {meets_completed} meet{'s' if meets_completed != 1 else ''}. "
-                    f"{remaining_meets} meet{'s' if remaining_meets != 1 else ''} remaining before the award is finalized. "
-                    "Everyone listed is in the hunt heading into the next meet."
-                )
-
-            standings_tab, by_school_tab = st.tabs(["Standings", "By School"])
-
-            with standings_tab:
-                saint_top3 = saint_standings[saint_standings['rank'] <= 3].copy()
-
-                if saint_top3.empty or not saint_categories:
-                    st.info("Not enough athletes have completed each meet to show standings.")
-                else:
-                    for category in saint_categories:
-                        category_df = saint_top3[
-                            (saint_top3['division'] == category['division']) &
-                            (saint_top3['gender'] == category['gender'])
-                        ]
-
-                        if category_df.empty:
-                            continue
-
-                        st.markdown(f"**{category['category']}**")
-                        display_df = category_df[
-                            ['rank', 'athlete_full_name', 'team_name', 'cumulative_time_str', 'time_back_str', 'meets_run']
-                        ].copy()
-                        display_df.columns = ['Rank', 'Athlete', 'Team', 'Cumulative Time', 'Time Back', 'Meets Completed']
-                        st.dataframe(display_df, hide_index=True, use_container_width=True)
-
-            with by_school_tab:
-                selected_school = st.selectbox(
-                    "Highlight a school",
-                    school_options,
-                    index=0,
-                    key="saint_sebastian_school"
-                )
+            athlete_counts = filtered_df.groupby('athlete_full_name').size()
+            total_athletes, progress_athletes = len(athlete_counts), int((athlete_counts > 1).sum())
 
-                if not saint_categories:
-                    st.info("No Saint Sebastian standings available yet.")
-                else:
-                    for category in saint_categories:
-                        category_df = saint_standings[
-                            (saint_standings['division'] == category['division']) &
-                            (saint_standings['gender'] == category['gender'])
-                        ]
-
-                        if category_df.empty:
-                            continue
-
-                        st.markdown(f"**{category['category']}**")
-                        display_df = category_df[
-                            ['rank', 'athlete_full_name', 'team_name', 'cumulative_time_str', 'time_back_str', 'meets_run']
-                        ].copy()
-                        display_df.columns = ['Rank', 'Athlete', 'Team', 'Cumulative Time', 'Time Back', 'Meets Completed']
-
-                        if selected_school != "All Teams":
-                            st.dataframe(
-                                display_df.style.apply(highlight_team_row, axis=1, team_name=selected_school),
-                                hide_index=True,
-                                use_container_width=True
-                            )
-                        else:
-                            st.dataframe(display_df, hide_index=True, use_container_width=True)
-    
-    # Summary metrics
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
         st.metric(
             "Total Athletes",
-            len(filtered_df['athlete_full_name'].unique())
+            total_athletes
         )
     
     with col2:
         if selected_season == "All":
             st.metric(
                 "Seasons",
-                len(filtered_df['season_year'].dropna().unique()) if 'season_year' in filtered_df.columns else 1
+                cube_cells['season_year'].nunique()
             )
         else:
             st.metric(
                 "Total Meets",
-                len(filtered_df['meet_number'].unique())
+                cube_cells['meet_number'].nunique()
             )
     
     with col3:
         st.metric(
             "Teams",
-            len(filtered_df['team_name'].unique())
+            cube_cells['team_name'].nunique(dropna=False)
         )
     
     with col4:
         st.metric(
             "Total Results",
-            len(filtered_df)
+            int(cube_cells['results'].sum())
         )
     
-    # Athletes with multiple meets
-    athlete_counts = filtered_df.groupby('athlete_full_name').size()
-    multi_meet_athletes = athlete_counts[athlete_counts > 1]
-    
-    st.subheader(f"🎯 Athletes with Progress Data: {len(multi_meet_athletes)}")
-    
-    # Top performers
-    col1, col2 = st.columns(2)
+    st.subheader(f"🎯 Athletes with Progress Data: {progress_athletes}")
     
-    with col1:
-        st.subheader("⚡ Fastest Pace (Normalized)")
-        st.caption("Best pace per mile - fair comparison across all divisions")
-        # Filter valid paces
-        fastest_pace_df = filtered_df[filtered_df['pace_per_mi_min'].notna() & (filtered_df['pace_per_mi_min'] > 0)]
-        if len(fastest_pace_df) > 0:
-            fastest = fastest_pace_df.nsmallest(10, 'pace_per_mi_min')[[
-                'athlete_full_name', 'team_name', 'pace_per_mi_str', 'division', 'meet_name'
-            ]]
-            fastest.columns = ['Athlete', 'Team', 'Pace/mi', 'Division', 'Meet']
-            st.dataframe(fastest, hide_index=True, use_container_width=True)
-        else:
-            st.info("No pace data available")
-    
-    with col2:
-        st.subheader("🏆 Top Placements")
-        top_places = filtered_df[filtered_df['place_overall'] <= 10].sort_values('place_overall')[[
-            'athlete_full_name', 'team_name', 'place_overall', 'meet_name'
-        ]].head(10)
-        top_places.columns = ['Athlete', 'Team', 'Place', 'Meet']
-        st.dataframe(top_places, hide_index=True, use_container_width=True)
-    
-    # Most improved athletes
-    if len(multi_meet_athletes) > 0:
-        st.subheader("📊 Most Improved Athletes (By Pace)")
-        st.caption("Improvement calculated using pace per mile for fair comparison across divisions")
-        
-        improvements = []
-        # Sort athletes by name for consistent ordering
-        for athlete in sorted(multi_meet_athletes.index):
-            athlete_data = filtered_df[filtered_df['athlete_full_name'] == athlete].sort_values('meet_number')
-            if len(athlete_data) >= 2:
-                # Use pace per mile for normalization
-                first_pace = athlete_data.iloc[0]['pace_per_mi_min']
-                last_pace = athlete_data.iloc[-1]['pace_per_mi_min']
-                
-                if pd.notna(first_pace) and pd.notna(last_pace) and first_pace > 0 and last_pace > 0:
-                    # Positive improvement means they got faster (lower pace time)
-                    improvement = first_pace - last_pace
-                    improvements.append({
-                        'Athlete': athlete,
-                        'Team': athlete_data.iloc[0]['team_name'],
-                        'Pace Improvement (sec/mi)': round(improvement * 60, 1),  # Convert to seconds per mile
-                        'First Pace': athlete_data.iloc[0]['pace_per_mi_str'],
-                        'Latest Pace': athlete_data.iloc[-1]['pace_per_mi_str'],
-                        'Division': athlete_data.iloc[-1]['division']
-                    })
-        
-        if improvements:
-            improvements_df = pd.DataFrame(improvements).sort_values('Pace Improvement (sec/mi)', ascending=False)
-            st.dataframe(improvements_df.head(10), hide_index=True, use_container_width=True)
-        else:
-            st.info("No improvement data available for the current selection.")
-    
-    # Team performance using Cross Country scoring (sum of top 5 places)
-    st.subheader("🏫 Team Performance (Cross Country Scoring)")
-    
-    st.info("**Cross Country Scoring**: Each team's score is the sum of their top 5 finishers' places. Lower score wins!")
-    
-    # Calculate team scores by season, meet, division, and gender
-    team_scores_list = []
-    
-    # Determine if we're in multi-season mode
-    seasons_to_process = filtered_df['season_year'].dropna().unique() if 'season_year' in filtered_df.columns else [None]
-    
-    for season in seasons_to_process:
-        if pd.notna(season):
-            season_df = filtered_df[filtered_df['season_year'] == season]
-            season_label = int(season)
-        else:
-            season_df = filtered_df
-            season_label = None
-            
-        for meet in season_df['meet_number'].dropna().unique():
-            for division in season_df['division'].dropna().unique():
-                for gender in season_df['gender'].dropna().unique():
-                    race_df = season_df[
-                        (season_df['meet_number'] == meet) &
-                        (season_df['division'] == division) &
-                        (season_df['gender'] == gender)
-                    ].sort_values('place_overall')
-                    
-                    # Calculate score for each team (sum of top 5 places)
-                    for team in race_df['team_name'].dropna().unique():
-                        team_runners = race_df[race_df['team_name'] == team].head(5)
-                        if len(team_runners) >= 5:  # Only score teams with 5+ runners
-                            score = team_runners['place_overall'].sum()
-                            avg_time = team_runners['finish_time_s'].mean()
-                            
-                            score_entry = {
-                                'Team': team,
-                                'Meet': int(meet),
-                                'Division': division,
-                                'Gender': gender,
-                                'Score': int(score),
-                                'Runners': len(team_runners),
-                                'Avg Time (s)': round(avg_time, 2) if pd.notna(avg_time) else None
-                            }
-                            
-                            if season_label is not None:
-                                score_entry['Season'] = season_label
-                                
-                            team_scores_list.append(score_entry)
-    
-    if team_scores_list:
-        team_scores_df = pd.DataFrame(team_scores_list)
-        
-        # Show team scores table sorted by score (lower is better)
-        st.subheader("📊 Team Scores by Race")
-        
-        # Allow filtering by division and gender
-        filter_cols = st.columns(3) if 'Season' in team_scores_df.columns else st.columns(2)
-        
-        if 'Season' in team_scores_df.columns:
-            with filter_cols[0]:
-                season_filter = st.selectbox("Season", ["All"] + sorted(team_scores_df['Season'].unique().tolist()))
-        
-        with filter_cols[-2]:
-            score_division = st.selectbox("Division", ["All"] + sorted(team_scores_df['Division'].unique().tolist()))
-        with filter_cols[-1]:
-            score_gender = st.selectbox("Gender", ["All"] + sorted(team_scores_df['Gender'].unique().tolist()))
-        
-        score_filtered = team_scores_df.copy()
-        if 'Season' in team_scores_df.columns and season_filter != "All":
-            score_filtered = score_filtered[score_filtered['Season'] == season_filter]
-        if score_division != "All":
-            score_filtered = score_filtered[score_filtered['Division'] == score_division]
-        if score_gender != "All":
-            score_filtered = score_filtered[score_filtered['Gender'] == score_gender]
-        
-        # Sort by season (if applicable), then meet, then score
-        sort_cols = ['Season', 'Meet', 'Score'] if 'Season' in score_filtered.columns else ['Meet', 'Score']
-        score_filtered = score_filtered.sort_values(sort_cols)
-        
-        # Format the Season column to remove comma formatting
-        if 'Season' in score_filtered.columns:
-            score_filtered_display = score_filtered.copy()
-            score_filtered_display['Season'] = score_filtered_display['Season'].astype(str)
-            st.dataframe(score_filtered_display, hide_index=True, use_container_width=True)
-        else:
-            st.dataframe(score_filtered, hide_index=True, use_container_width=True)
-        
-        # Visualization: Best team scores
-        st.subheader("🏆 Top Team Performances (Lowest Scores)")
-        best_scores = team_scores_df.nsmallest(15, 'Score')
-        
-        fig_scores = px.bar(
-            best_scores,
-            x='Team',
-            y='Score',
-            color='Division',
-            hover_data=['Meet', 'Gender', 'Runners'] + (['Season'] if 'Season' in best_scores.columns else []),
-            title='Top 15 Team Scores (Lower is Better)',
-            labels={'Score': 'Team Score (sum of top 5 places)'}
-        )
-        
-        fig_scores.update_layout(height=500, showlegend=True)
-        st.plotly_chart(fig_scores, width='stretch')
-    else:
-        st.warning("Not enough team data for scoring (teams need 5+ runners)")
+    # Sections are fragments: their local controls rerun only the section itself
+    overview_sections(
+        data_version, filter_key, df, filtered_df, records_view, selected_season, progress_athletes > 0
+    )
 
 # Footer
 st.sidebar.markdown("---")
 st.sidebar.markdown(f"**Total Results:** {len(df)}")
+st.sidebar.markdown(f"**Data Updated:** {dataset.version_time(data_version):%Y-%m-%d %H:%M}")
+if st.sidebar.toggle("🔴 Live updates", key='live_updates',
+                     help=f"Check for new results every {LIVE_REFRESH_S} s (for meet day, with watch.py running)"):
+    live_update_check(loaded_version)
+if DATA_SCOPE:
+    st.sidebar.caption(f"Data scope: {DATA_SCOPE}")
 st.sidebar.markdown(f"**Unique Athletes:** {df['athlete_full_name'].nunique()}")
 if 'season_year' in df.columns:
     seasons = sorted([int(y) for y in df['season_year'].dropna().unique()])
-    st.sidebar.markdown(f"**Seasons:** {', '.join(map(str, seasons))}")
\ No newline at end of file
+    st.sidebar.markdown(f"**Seasons:** {', '.join(map(str, seasons))}")
+
+st.sidebar.toggle(
+    "⏱️ Profile render time",
+    value=st.query_params.get('profile') == '1',
+    key='profile_render',
+    help="Time each dashboard section and show a breakdown at the bottom of the page"
+)
+if profiler.enabled:
+    st.sidebar.checkbox(
+        "Append timings to log",
+        key='profile_log',
+        help=f"Write each run's timings to {profiling.PROFILE_LOG_PATH} (summarize with: python profiling.py)"
+    )
+
+profiler.finish_run()
+if profiler.enabled:
+    with st.expander("⏱️ Render Profile", expanded=True):
+        st.caption("Timings for the last full run. Fragment reruns (section-local controls) are logged separately.")
+        prof_col1, prof_col2 = st.columns([2, 1])
+        with prof_col1:
+            st.dataframe(profiler.timings_frame(), hide_index=True, use_container_width=True)
+        with prof_col2:
+            st.dataframe(profiler.cache_frame(), hide_index=True, use_container_width=True)
@@ -0,0 +1,227 @@
+"""
+Shared access to the merged season results dataset
+Every consumer (dashboard sessions, scripts) reads data/merged/season_results.csv
+through here so dtype fix-ups, versioning and safe writes live in one place
+
+pandas is imported on first read, so commands that only need paths and
+versions (see xc.py) start without paying for it
+"""
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# XC_RESULTS_PATH points the dashboard at another dataset (e.g. synthetic load-test data)
+RESULTS_PATH = Path(os.environ.get('XC_RESULTS_PATH', 'data/merged/season_results.csv'))
+MANIFEST_NAME = 'manifest.json'
+
+# The umask can only be read by setting it, which is process-wide: read it
+# once, before any other threads start creating files
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def dataset_version(path=RESULTS_PATH) -> str | None:
+    """
+    Cheap version stamp for a dataset file (mtime + size)
+    Any rewrite of the file, including an atomic replace, changes it
+    """
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return f"{stat.st_mtime_ns}-{stat.st_size}"
+
+
+def derived_dir(results_path=None) -> Path:
+    """Folder holding artifacts derived from a results file (see precompute.py)"""
+    return Path(results_path or RESULTS_PATH).parent / 'derived'
+
+
+def read_manifest(directory: Path) -> dict:
+    """{artifact: dataset version it was built from} for a derived folder"""
+    try:
+        with open(Path(directory) / MANIFEST_NAME, encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def version_time(version: str) -> datetime:
+    """Modification time encoded in a dataset_version() stamp"""
+    return datetime.fromtimestamp(int(version.split('-')[0]) / 1e9)
+
+
+def read_results(path=RESULTS_PATH) -> pd.DataFrame:
+    """Read the merged results CSV and apply the standard dtype fix-ups"""
+    import pandas as pd
+
+    df = pd.read_csv(path)
+    # Ensure season_year is numeric
+    if 'season_year' in df.columns:
+        df['season_year'] = pd.to_numeric(df['season_year'], errors='coerce')
+    return df
+
+
+def read_versioned(path=RESULTS_PATH) -> tuple[str, pd.DataFrame]:
+    """
+    Read the dataset together with the version it was read at
+    Raises RuntimeError if the file changed while it was being read
+    (e.g. someone copied a file over it by hand), so a torn read is never returned
+    """
+    before = dataset_version(path)
+    df = read_results(path)
+    after = dataset_version(path)
+    if before is None or before != after:
+        raise RuntimeError(f"{path} changed while it was being read")
+    return after, df
+
+
+def _file_mode(path: Path) -> int:
+    """Permissions for a rewrite of `path`: those it already has, else the umask default"""
+    try:
+        return os.stat(path).st_mode & 0o7777
+    except FileNotFoundError:
+        return 0o666 & ~_UMASK
+
+
+def atomic_write(path, write_fn, mode='w'):
+    """
+    Write a file atomically: write_fn(file) fills a temp file next to `path`,
+    which is then renamed over it. Readers see the old file or the new one,
+    never a half-written file. The file keeps its permissions (mkstemp
+    creates the temp file private to the owner)
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.stem}.", suffix='.tmp')
+    try:
+        if 'b' in mode:
+            with os.fdopen(fd, mode) as f:
+                write_fn(f)
+        else:
+            with os.fdopen(fd, mode, newline='', encoding='utf-8') as f:
+                write_fn(f)
+        os.chmod(tmp_path, _file_mode(path))
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def write_results(df: pd.DataFrame, path=RESULTS_PATH):
+    """Write the dataset atomically (see atomic_write)"""
+    atomic_write(path, lambda f: df.to_csv(f, index=False))
+
+
+def write_arrow(df: pd.DataFrame, path):
+    """
+    Write a DataFrame as an uncompressed Arrow IPC (Feather v2) file, atomically
+    Float NaNs are stored as values rather than nulls, so read_arrow() can hand
+    numeric columns out as views of the mapped file instead of copies
+    """
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    for i, name in enumerate(table.column_names):
+        if df[name].dtype.kind == 'f' and table.column(i).null_count:
+            table = table.set_column(i, table.field(i), pa.array(df[name].to_numpy(), from_pandas=False))
+
+    def write(f):
+        with ipc.new_file(f, table.schema) as writer:
+            writer.write_table(table)
+
+    atomic_write(path, write, mode='wb')
+
+
+def read_arrow(path) -> pd.DataFrame:
+    """
+    Memory-map an Arrow IPC file written by write_arrow()
+    Numeric columns are read-only views of the mapping: processes reading the
+    same file share those pages through the OS page cache. Only text columns
+    are materialised per process
+    """
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+
+    # The mapping stays open as long as a column still points into it
+    table = ipc.open_file(pa.memory_map(str(path))).read_all()
+    df = table.to_pandas(split_blocks=True)
+    for name in table.column_names:
+        if df[name].dtype == object and table.column(name).null_count:
+            # Missing text comes back as None; pd.read_csv gives NaN
+            values = df[name].to_numpy(copy=True)
+            values[table.column(name).is_null().to_numpy(zero_copy_only=False)] = float('nan')
+            df[name] = values
+    return df
+
+
+def frame_memory_mb(df: pd.DataFrame) -> float:
+    """Deep memory footprint of a DataFrame in megabytes"""
+    return df.memory_usage(deep=True).sum() / 1024 / 1024
+
+
+class DatasetStore:
+    """
+    Process-wide holder of the current dataset version
+
+    snapshot() always returns a complete (version, DataFrame) pair. When the file
+    on disk changes, the new version is loaded on a background thread while callers
+    keep getting the previous snapshot; the swap is a single reference assignment.
+    """
+
+    def __init__(self, path=RESULTS_PATH, loader=read_versioned):
+        self.path = Path(path)
+        self._loader = loader
+        self._lock = threading.Lock()
+        self._loading = None
+        self.last_error = None
+        # First load is synchronous so there is always something to serve
+        self._current = self._loader(self.path)
+
+    @property
+    def version(self) -> str:
+        return self._current[0]
+
+    def snapshot(self) -> tuple[str, pd.DataFrame]:
+        current = self._current
+        on_disk = dataset_version(self.path)
+        if on_disk is not None and on_disk != current[0]:
+            self._start_reload(on_disk)
+        return current
+
+    def _start_reload(self, target_version: str):
+        with self._lock:
+            if self._loading is not None:
+                return
+            self._loading = target_version
+        threading.Thread(target=self._reload, name='dataset-reload', daemon=True).start()
+
+    def _reload(self):
+        try:
+            self._current = self._loader(self.path)
+            self.last_error = None
+        except Exception as e:
+            # Keep serving the previous version; the next snapshot() retries
+            self.last_error = e
+        finally:
+            with self._lock:
+                self._loading = None
+
+    def wait_for_reload(self, timeout: float = 30.0) -> str:
+        """Block until any in-flight reload finishes (used by scripts and load tests)"""
+        deadline = time.monotonic() + timeout
+        while self._loading is not None and time.monotonic() < deadline:
+            time.sleep(0.05)
+        return self.version
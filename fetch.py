@@ -0,0 +1,408 @@
+"""
+Fetch result pages over HTTP instead of saving them by hand
+An asyncio fetcher for the pages listed in data/sources.csv (url,name -
+name is the page's filename in the data/pages convention, which carries
+the season, meet, division and gender). Pages are downloaded with bounded
+concurrency over a pool of keep-alive connections and parsed in memory by
+parse_saved_pages, writing the per-race CSVs to data/raw; no .htm copies
+are kept.
+
+Redirects are followed (up to MAX_REDIRECTS), and connecting, sending and
+reading each time out after TIMEOUT_S, so one stalled host fails its pages
+instead of hanging the run.
+
+Each page's ETag / Last-Modified is remembered in data/raw/fetch_state.json
+and sent back as If-None-Match / If-Modified-Since, so an unchanged page
+costs a 304 and is not parsed again.
+
+Usage:
+    python fetch.py                           # pages listed in data/sources.csv
+    python fetch.py --mirror http://host/dir/ # every page name in data/pages, fetched from a mirror
+    python fetch.py --check                   # against a local server serving data/pages
+"""
+import argparse
+import asyncio
+import csv
+import gzip
+import json
+import ssl
+import time
+from pathlib import Path
+from urllib.parse import quote, urljoin, urlsplit
+
+import pandas as pd
+
+import dataset
+import parse_saved_pages
+
+SOURCES_PATH = Path("data/sources.csv")
+PAGES_DIR = Path("data/pages")
+RAW_DIR = Path("data/raw")
+STATE_FILENAME = 'fetch_state.json'
+CONCURRENCY = 8
+TIMEOUT_S = 30
+MAX_REDIRECTS = 5
+REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+USER_AGENT = 'xc-data-analysis-fetcher'
+
+
+class FetchError(Exception):
+    pass
+
+
+class ConnectionPool:
+    """
+    Keep-alive HTTP/1.1 connections per origin (scheme, host, port)
+    A request takes an idle connection or opens a new one; the number open
+    at once is bounded by the fetcher's concurrency, not by the pool.
+    """
+
+    def __init__(self):
+        self._idle = {}
+        self.opened = 0
+
+    async def acquire(self, origin):
+        idle = self._idle.get(origin, [])
+        while idle:
+            reader, writer = idle.pop()
+            if not writer.is_closing() and not reader.at_eof():
+                return reader, writer, True
+            writer.close()
+        scheme, host, port = origin
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(
+            host, port, ssl=ssl.create_default_context() if scheme == 'https' else None), TIMEOUT_S)
+        self.opened += 1
+        return reader, writer, False
+
+    def release(self, origin, connection, keep_alive: bool):
+        reader, writer = connection
+        if keep_alive:
+            self._idle.setdefault(origin, []).append((reader, writer))
+        else:
+            writer.close()
+
+    def close(self):
+        for connections in self._idle.values():
+            for _, writer in connections:
+                writer.close()
+        self._idle.clear()
+
+
+class HTTPClient:
+    """Minimal asyncio GET client over a ConnectionPool: (status, headers, body)"""
+
+    def __init__(self, pool: ConnectionPool | None = None):
+        self.pool = pool or ConnectionPool()
+        self.requests = 0
+
+    async def get(self, url: str, headers: dict | None = None) -> tuple[int, dict, bytes]:
+        """GET url, following redirects"""
+        for _ in range(MAX_REDIRECTS + 1):
+            status, response_headers, body = await self._get_once(url, headers)
+            if status not in REDIRECT_STATUSES or 'location' not in response_headers:
+                return status, response_headers, body
+            url = urljoin(url, response_headers['location'])
+        raise FetchError(f"{url}: more than {MAX_REDIRECTS} redirects")
+
+    async def _get_once(self, url: str, headers: dict | None = None) -> tuple[int, dict, bytes]:
+        parts = urlsplit(url)
+        if parts.scheme not in ('http', 'https'):
+            raise FetchError(f"unsupported URL {url}")
+        origin = (parts.scheme, parts.hostname, parts.port or (443 if parts.scheme == 'https' else 80))
+        target = (parts.path or '/') + (f'?{parts.query}' if parts.query else '')
+        lines = [f"GET {target} HTTP/1.1", f"Host: {parts.netloc}", f"User-Agent: {USER_AGENT}",
+                 "Accept-Encoding: gzip", "Connection: keep-alive"]
+        lines += [f"{name}: {value}" for name, value in (headers or {}).items()]
+        request = ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1')
+
+        # A pooled connection may have been closed by the server while idle: retry once on a fresh one
+        for attempt in range(2):
+            reader, writer, reused = await self.pool.acquire(origin)
+            try:
+                writer.write(request)
+                await asyncio.wait_for(writer.drain(), TIMEOUT_S)
+                status, response_headers, body = await asyncio.wait_for(_read_response(reader), TIMEOUT_S)
+            except (ConnectionError, asyncio.IncompleteReadError) as e:
+                writer.close()
+                if reused and attempt == 0:
+                    continue
+                raise FetchError(f"{url}: {e!r}") from e
+            except BaseException:
+                writer.close()
+                raise
+            self.requests += 1
+            keep_alive = response_headers.get('connection', '').lower() != 'close'
+            self.pool.release(origin, (reader, writer), keep_alive)
+            if response_headers.get('content-encoding', '').lower() == 'gzip':
+                body = gzip.decompress(body)
+            return status, response_headers, body
+
+
+async def _read_response(reader: asyncio.StreamReader) -> tuple[int, dict, bytes]:
+    status_line = await reader.readline()
+    if not status_line:
+        raise asyncio.IncompleteReadError(b'', None)
+    status = int(status_line.split()[1])
+    headers = {}
+    while (line := await reader.readline()) not in (b'\r\n', b'\n', b''):
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+
+    if status in (204, 304) or 100 <= status < 200:
+        body = b''
+    elif headers.get('transfer-encoding', '').lower() == 'chunked':
+        chunks = []
+        while size := int((await reader.readline()).split(b';')[0], 16):
+            chunks.append(await reader.readexactly(size))
+            await reader.readline()
+        while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+            pass
+        body = b''.join(chunks)
+    elif 'content-length' in headers:
+        body = await reader.readexactly(int(headers['content-length']))
+    else:
+        body = await reader.read()
+        headers['connection'] = 'close'
+    return status, headers, body
+
+
+def _decode(body: bytes, headers: dict) -> str:
+    charset = 'utf-8'
+    for param in headers.get('content-type', '').split(';')[1:]:
+        key, _, value = param.strip().partition('=')
+        if key.lower() == 'charset':
+            charset = value.strip('"') or charset
+    return body.decode(charset, errors='replace')
+
+
+def load_sources(path=SOURCES_PATH) -> list[tuple[str, str]]:
+    """(url, name) pairs from a CSV with url and name columns (none if the file is missing)"""
+    try:
+        with open(path, newline='', encoding='utf-8') as f:
+            return [(row['url'].strip(), row['name'].strip()) for row in csv.DictReader(f) if row.get('url')]
+    except FileNotFoundError:
+        return []
+
+
+def nothing_to_fetch(sources_path=SOURCES_PATH) -> str:
+    return f"No pages to fetch - list result page URLs in {sources_path} (columns url,name)"
+
+
+def mirror_sources(base_url: str, pages_dir=PAGES_DIR) -> list[tuple[str, str]]:
+    """Every saved page name, fetched from base_url instead of the local folder"""
+    base_url = base_url if base_url.endswith('/') else base_url + '/'
+    names = sorted(path.name for pattern in ('*.htm', '*.html', '*.mhtml') for path in Path(pages_dir).glob(pattern))
+    return [(base_url + quote(name), name) for name in names]
+
+
+def load_state(output_dir=RAW_DIR) -> dict:
+    try:
+        with open(Path(output_dir) / STATE_FILENAME, encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def save_state(state: dict, output_dir=RAW_DIR):
+    dataset.atomic_write(Path(output_dir) / STATE_FILENAME,
+                         lambda f: json.dump(state, f, indent=2, sort_keys=True))
+
+
+def _parse(content: str, name: str):
+    """(output filename, DataFrame) for a fetched page, or None if it has no results table"""
+    file_info, df = parse_saved_pages.parse_page(content, name)
+    if df is None:
+        return None
+    return parse_saved_pages.raw_output_name(file_info), df
+
+
+async def fetch_pages(sources: list[tuple[str, str]], output_dir=RAW_DIR, state: dict | None = None,
+                      concurrency: int = CONCURRENCY, client: HTTPClient | None = None) -> list[dict]:
+    """
+    Fetch, parse and write every page; returns one outcome per page:
+    status 'updated', 'unchanged' (304), 'empty' (no results table) or 'failed'
+    `state` (url -> validators and output file) is updated in place
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    state = {} if state is None else state
+    client = client or HTTPClient()
+    limit = asyncio.Semaphore(concurrency)
+
+    async def fetch_one(url: str, name: str) -> dict:
+        known = state.get(url, {})
+        headers = {}
+        # Only revalidate when the CSV from the last fetch is still there
+        if known.get('output') and (output_dir / known['output']).exists():
+            if known.get('etag'):
+                headers['If-None-Match'] = known['etag']
+            if known.get('last_modified'):
+                headers['If-Modified-Since'] = known['last_modified']
+        start = time.perf_counter()
+        async with limit:
+            try:
+                status, response_headers, body = await client.get(url, headers)
+            except (FetchError, OSError, asyncio.TimeoutError) as e:
+                return {'name': name, 'status': 'failed', 'detail': str(e) or repr(e)}
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        if status == 304:
+            return {'name': name, 'status': 'unchanged', 'output': known['output'], 'ms': elapsed_ms}
+        if status != 200:
+            return {'name': name, 'status': 'failed', 'detail': f"HTTP {status}"}
+
+        parsed = await asyncio.to_thread(_parse, _decode(body, response_headers), name)
+        if parsed is None:
+            return {'name': name, 'status': 'empty', 'ms': elapsed_ms}
+        state[url] = {
+            'etag': response_headers.get('etag'),
+            'last_modified': response_headers.get('last-modified'),
+            'output': parsed[0],
+        }
+        return {'name': name, 'status': 'updated', 'output': parsed[0], 'frame': parsed[1], 'ms': elapsed_ms}
+
+    try:
+        outcomes = list(await asyncio.gather(*(fetch_one(url, name) for url, name in sources)))
+    finally:
+        client.pool.close()
+
+    # Written in source order, not completion order: two pages of the same race
+    # (e.g. an .htm and an .mhtml save) map to one CSV and the later one wins, as in parse_saved_pages
+    for outcome in outcomes:
+        if outcome['status'] == 'updated':
+            df = outcome.pop('frame')
+            dataset.atomic_write(output_dir / outcome['output'], lambda f: df.to_csv(f, index=False))
+            outcome['rows'] = len(df)
+    return outcomes
+
+
+def run(sources: list[tuple[str, str]], output_dir=RAW_DIR, concurrency: int = CONCURRENCY) -> list[dict]:
+    """Fetch with the saved validators and save the updated ones"""
+    state = load_state(output_dir)
+    outcomes = asyncio.run(fetch_pages(sources, output_dir, state, concurrency))
+    save_state(state, output_dir)
+    return outcomes
+
+
+def summary(outcomes: list[dict]) -> str:
+    counts = pd.Series([outcome['status'] for outcome in outcomes]).value_counts()
+    return ', '.join(f"{count} {status}" for status, count in counts.items())
+
+
+def _stand_in_server(pages_dir: Path):
+    """
+    Threaded local HTTP/1.1 server for the saved pages, with keep-alive,
+    ETag / If-None-Match and (from http.server) Last-Modified / If-Modified-Since
+    """
+    import functools
+    import http.server
+    import os
+
+    class Handler(http.server.SimpleHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def send_head(self):
+            self._etag = None
+            path = self.translate_path(self.path)
+            if os.path.isfile(path):
+                stat = os.stat(path)
+                self._etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+                if self.headers.get('If-None-Match') == self._etag:
+                    self.send_response(304)
+                    self.end_headers()
+                    return None
+            return super().send_head()
+
+        def end_headers(self):
+            if self._etag:
+                self.send_header('ETag', self._etag)
+            super().end_headers()
+
+        def log_message(self, format, *args):
+            pass
+
+    handler = functools.partial(Handler, directory=str(pages_dir))
+    return http.server.ThreadingHTTPServer(('127.0.0.1', 0), handler)
+
+
+def check(pages_dir=PAGES_DIR, concurrency: int = CONCURRENCY):
+    """
+    Fetch every saved page from a local stand-in server into a temporary
+    folder, compare each CSV with parsing the file directly, then fetch again
+    expecting only 304s
+    """
+    import tempfile
+    import threading
+
+    server = _stand_in_server(Path(pages_dir))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    sources = mirror_sources(f"http://127.0.0.1:{server.server_address[1]}/", pages_dir)
+    print(f"Serving {len(sources)} pages from {pages_dir} on http://127.0.0.1:{server.server_address[1]}\n")
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            for label in ('Cold fetch', 'Revalidate'):
+                state = load_state(tmp)
+                client = HTTPClient()
+                start = time.perf_counter()
+                outcomes = asyncio.run(fetch_pages(sources, tmp, state, concurrency, client))
+                elapsed = time.perf_counter() - start
+                save_state(state, tmp)
+                print(f"{label}: {summary(outcomes)} in {elapsed:.2f} s "
+                      f"({client.requests} requests over {client.pool.opened} connections)")
+
+                if label == 'Cold fetch':
+                    # The last page written to each CSV is the one it must match
+                    final = {outcome['output']: outcome for outcome in outcomes if outcome['status'] == 'updated'}
+                    mismatched = []
+                    for outcome in final.values():
+                        with open(Path(pages_dir) / outcome['name'], encoding='utf-8') as f:
+                            _, expected = parse_saved_pages.parse_page(f.read(), outcome['name'])
+                        written = (Path(tmp) / outcome['output']).read_text(encoding='utf-8')
+                        if written != expected.to_csv(index=False):
+                            mismatched.append(outcome['name'])
+                    print(f"  {len(final)} CSVs written, identical to parsing the saved files: {not mismatched}")
+                    for name in mismatched:
+                        print(f"    differs: {name}")
+                print()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fetch result pages and parse them into data/raw")
+    parser.add_argument('--sources', default=str(SOURCES_PATH), help="CSV with url and name columns")
+    parser.add_argument('--mirror', help="fetch every page name in data/pages from this base URL instead")
+    parser.add_argument('--output', default=str(RAW_DIR))
+    parser.add_argument('--concurrency', type=int, default=CONCURRENCY)
+    parser.add_argument('--check', action='store_true', help="fetch from a local server serving data/pages and exit")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("FETCH RESULT PAGES")
+    print("=" * 60)
+    if args.check:
+        check(concurrency=args.concurrency)
+        return
+
+    sources = mirror_sources(args.mirror) if args.mirror else load_sources(args.sources)
+    if not sources:
+        print(nothing_to_fetch(args.sources))
+        return
+    start = time.perf_counter()
+    outcomes = run(sources, args.output, args.concurrency)
+    for outcome in outcomes:
+        if outcome['status'] == 'updated':
+            print(f"  Saved {outcome['rows']} rows to {outcome['output']}  ({outcome['name']})")
+        elif outcome['status'] in ('failed', 'empty'):
+            print(f"  {outcome['status'].capitalize()}: {outcome['name']} {outcome.get('detail', '')}")
+    print(f"\n{len(sources)} pages: {summary(outcomes)} in {time.perf_counter() - start:.2f} s")
+    if any(outcome['status'] == 'updated' for outcome in outcomes):
+        print("\nNext steps:")
+        print("  1. Run: python manual_merge.py")
+        print("  2. Run: python clean_duplicates.py")
+
+
+if __name__ == "__main__":
+    main()
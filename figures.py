@@ -0,0 +1,193 @@
+"""
+Charts and display tables shared by the dashboard and the static reports
+Everything here takes plain DataFrames and returns plotly figures or frames,
+so reports.py draws the same views as dashboard.py without Streamlit
+"""
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+# Athlete progress charts: column -> caption, series name, colours and axis title
+PROGRESS_CHARTS = {
+    'finish_time_s': {
+        'caption': "Raw Finish Time (varies by division)",
+        'name': 'Finish Time',
+        'color': '#1f77b4',
+        'trend_color': 'rgba(31, 119, 180, 0.3)',
+        'yaxis_title': "Time (seconds)",
+    },
+    'adjusted_pace_per_mi_min': {
+        'caption': "Pace per Mile (normalized by distance and adjusted for course)",
+        'name': 'Adjusted Pace per Mile',
+        'color': '#2ca02c',
+        'trend_color': 'rgba(44, 160, 44, 0.3)',
+        'yaxis_title': "Pace (min/mile)",
+    },
+    'speed_mph': {
+        'caption': "Speed (mph - higher is better)",
+        'name': 'Speed',
+        'color': '#d62728',
+        'trend_color': 'rgba(214, 39, 40, 0.3)',
+        'yaxis_title': "Speed (mph)",
+    },
+}
+
+STANDINGS_COLUMNS = ['rank', 'athlete_full_name', 'team_name', 'cumulative_time_str', 'time_back_str', 'meets_run']
+STANDINGS_LABELS = ['Rank', 'Athlete', 'Team', 'Cumulative Time', 'Time Back', 'Meets Completed']
+
+
+def highlight_team_row(row: pd.Series, team_name: str) -> list[str]:
+    """Highlight rows that match the selected team."""
+    if team_name == "All Teams":
+        return [""] * len(row)
+    highlight = row.get("Team") == team_name
+    color = "background-color: #fff3cd" if highlight else ""
+    return [color] * len(row)
+
+
+def has_multi_season(athlete_data: pd.DataFrame) -> bool:
+    return 'season_year' in athlete_data.columns and athlete_data['season_year'].nunique() > 1
+
+
+def race_axis(athlete_data: pd.DataFrame, multi_season: bool) -> tuple[pd.Series, str]:
+    """x values and axis title for an athlete's races (season & meet labels across seasons)"""
+    if multi_season:
+        labels = athlete_data.apply(
+            lambda row: f"{int(row['season_year'])} M{int(row['meet_number'])}"
+            if pd.notna(row['season_year']) and pd.notna(row['meet_number']) else '',
+            axis=1
+        )
+        return labels, "Season & Meet"
+    return athlete_data['meet_number'], "Meet Number"
+
+
+def _progress_hover(athlete_data: pd.DataFrame, column: str) -> dict:
+    if column == 'adjusted_pace_per_mi_min':
+        return {
+            'customdata': athlete_data[['adjusted_pace_per_mi_str', 'pace_per_mi_str']],
+            'hovertemplate': '<b>%{customdata[0]}/mile</b> (raw %{customdata[1]})<extra></extra>',
+        }
+    if column == 'speed_mph':
+        return {'text': [f"{s:.2f} mph" for s in athlete_data['speed_mph']],
+                'hovertemplate': '<b>%{text}</b><extra></extra>'}
+    return {'text': athlete_data['finish_time_str'], 'hovertemplate': '<b>%{text}</b><extra></extra>'}
+
+
+def progress_figure(athlete_data: pd.DataFrame, x_data, x_title: str, column: str) -> go.Figure:
+    """One of the PROGRESS_CHARTS for an athlete, with a linear trendline over their races"""
+    chart = PROGRESS_CHARTS[column]
+    fig = go.Figure()
+
+    # Add actual data
+    fig.add_trace(go.Scatter(
+        x=x_data,
+        y=athlete_data[column],
+        mode='lines+markers',
+        name=chart['name'],
+        line=dict(color=chart['color'], width=3),
+        marker=dict(size=10),
+        **_progress_hover(athlete_data, column)
+    ))
+
+    # Add trendline
+    x_numeric = np.arange(len(athlete_data))
+    valid = athlete_data[column].notna().to_numpy()
+    if valid.sum() >= 2:
+        z = np.polyfit(x_numeric[valid], athlete_data[column].to_numpy()[valid], 1)
+        p = np.poly1d(z)
+        fig.add_trace(go.Scatter(
+            x=x_data,
+            y=p(x_numeric),
+            mode='lines',
+            name='Trend',
+            line=dict(color=chart['trend_color'], width=2, dash='dash'),
+            hoverinfo='skip'
+        ))
+
+    fig.update_layout(
+        xaxis_title=x_title,
+        yaxis_title=chart['yaxis_title'],
+        hovermode='x unified',
+        height=350,
+        showlegend=False,
+        margin=dict(l=0, r=0, t=0, b=0)
+    )
+    return fig
+
+
+def placement_figure(athlete_data: pd.DataFrame, x_data, x_title: str) -> go.Figure:
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=x_data,
+        y=athlete_data['place_overall'],
+        mode='lines+markers',
+        name='Overall Place',
+        line=dict(color='#ff7f0e', width=3),
+        marker=dict(size=12),
+        hovertemplate='<b>Place %{y}</b><extra></extra>'
+    ))
+
+    fig.update_layout(
+        xaxis_title=x_title,
+        yaxis_title="Overall Place",
+        yaxis_autorange='reversed',  # Lower place is better
+        hovermode='x unified',
+        height=400,
+        showlegend=False
+    )
+    return fig
+
+
+def athlete_results_table(athlete_data: pd.DataFrame, multi_season: bool) -> pd.DataFrame:
+    """Race results table for an athlete (athlete_data carries the rating column)"""
+    display_cols = ['meet_name', 'meet_number', 'place_overall', 'field_size', 'finish_percentile', 'finish_time_str', 'pace_str', 'rating']
+    if multi_season:
+        display_cols.insert(0, 'season_year')
+
+    results_display = athlete_data[display_cols].copy()
+
+    # Format season_year as integer without comma separator
+    if multi_season and 'season_year' in results_display.columns:
+        results_display['season_year'] = results_display['season_year'].astype(int).astype(str)
+
+    # Rename columns for display
+    col_names = ['Meet', 'Meet #', 'Place', 'Field', 'Percentile', 'Time', 'Pace', 'Rating']
+    if multi_season:
+        col_names.insert(0, 'Season')
+    results_display.columns = col_names
+    return results_display
+
+
+def team_scores_table(scores: pd.DataFrame) -> pd.DataFrame:
+    """Team scores sorted by season, meet and score, with the season shown without a thousands separator"""
+    sort_cols = ['Season', 'Meet', 'Score'] if 'Season' in scores.columns else ['Meet', 'Score']
+    scores = scores.sort_values(sort_cols)
+    if 'Season' in scores.columns:
+        scores = scores.copy()
+        scores['Season'] = scores['Season'].astype(str)
+    return scores
+
+
+def top_team_scores_figure(team_scores_df: pd.DataFrame, n: int = 15) -> go.Figure:
+    best_scores = team_scores_df.nsmallest(n, 'Score')
+
+    fig = px.bar(
+        best_scores,
+        x='Team',
+        y='Score',
+        color='Division',
+        hover_data=['Meet', 'Gender', 'Runners'] + (['Season'] if 'Season' in best_scores.columns else []),
+        title=f'Top {n} Team Scores (Lower is Better)',
+        labels={'Score': 'Team Score (sum of top 5 places)'}
+    )
+
+    fig.update_layout(height=500, showlegend=True)
+    return fig
+
+
+def standings_table(category_df: pd.DataFrame) -> pd.DataFrame:
+    """Saint Sebastian standings of one category, with display column names"""
+    display_df = category_df[STANDINGS_COLUMNS].copy()
+    display_df.columns = STANDINGS_LABELS
+    return display_df
@@ -1,5 +1,7 @@
 import pandas as pd
 
+import dataset
+
 # Load fresh
 df = pd.read_csv('data/merged/season_results.csv')
 
@@ -13,5 +15,5 @@ print(f"\nAfter: {df['team_name'].nunique()} unique teams")
 print(f"St Rita total records: {len(df[df['team_name'] == 'St Rita'])}")
 
 # Save
-df.to_csv('data/merged/season_results.csv', index=False)
+dataset.write_results(df)
 print("\n✅ Fixed and saved!")
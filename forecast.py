@@ -0,0 +1,158 @@
+"""
+League-wide progression and next-meet forecasts
+Fits a straight line to every athlete's distance-normalized pace at once using
+grouped least-squares sums (no per-athlete loop), then projects the next meet
+"""
+import numpy as np
+import pandas as pd
+
+from add_distance_metrics import DISTANCE_MAP, format_pace
+
+# Riegel's endurance model: time scales with distance ** 1.06, so pace scales
+# with distance ** 0.06. Paces are compared at a common reference distance.
+RIEGEL_EXPONENT = 1.06
+REFERENCE_DISTANCE_KM = 3.0
+
+# 95% prediction interval half-width thresholds for the confidence label (sec/mi)
+HIGH_CONFIDENCE_SEC = 60
+MEDIUM_CONFIDENCE_SEC = 120
+
+# Ridge penalty on the slope (in race-index units squared). With only two or
+# three races a single bad day would otherwise extrapolate to absurd paces.
+SLOPE_SHRINKAGE = 2.0
+
+BREAKOUT_MIN_RACES = 3
+BREAKOUT_PERCENTILE = 0.10
+
+
+def distance_factor(distance_km) -> pd.Series:
+    """Multiplier that converts pace at `distance_km` to pace at the reference distance"""
+    return (REFERENCE_DISTANCE_KM / distance_km) ** (RIEGEL_EXPONENT - 1)
+
+
+def race_axis(season_year, meet_number, meets_per_season=None):
+    """
+    Consecutive meet index across seasons (the meet after a season's last is the next season's first)
+    A season spans the largest meet number present, so a season with an extra
+    meet never overlaps the next one
+    """
+    if meets_per_season is None:
+        meets_per_season = int(np.max(meet_number)) if len(meet_number) else 1
+    return season_year * meets_per_season + meet_number
+
+
+def _valid_results(df: pd.DataFrame) -> pd.DataFrame:
+    """One normalized pace per athlete per race, ordered by race"""
+    base = df[['athlete_full_name', 'team_name', 'division', 'gender',
+               'season_year', 'meet_number', 'pace_per_mi_min']].copy()
+    distance_km = df['distance_km'] if 'distance_km' in df.columns else df['division'].map(DISTANCE_MAP)
+    base['distance_km'] = distance_km.fillna(df['division'].map(DISTANCE_MAP))
+    base = base.dropna(subset=['athlete_full_name', 'season_year', 'meet_number', 'pace_per_mi_min', 'distance_km'])
+    base = base[base['pace_per_mi_min'] > 0]
+
+    base['x'] = race_axis(base['season_year'].astype(int), base['meet_number'].astype(int))
+    base['norm_pace'] = base['pace_per_mi_min'] * distance_factor(base['distance_km'])
+    base = base.sort_values(['athlete_full_name', 'x', 'norm_pace'])
+    return base.drop_duplicates(['athlete_full_name', 'x'], keep='first')
+
+
+def build_forecasts(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Per-athlete trend, projected next-meet pace and breakout flag for everyone
+
+    Columns: athlete_full_name, team_name, division, gender, last_season, races,
+    latest_pace, trend_sec_per_race (negative = getting faster), projected_pace,
+    projected_pace_low/high (95% interval, min/mi at the latest division's distance),
+    confidence (high/medium/low), breakout
+    """
+    base = _valid_results(df)
+    if base.empty:
+        return pd.DataFrame()
+
+    codes, athletes = pd.factorize(base['athlete_full_name'], sort=True)
+    x = base['x'].to_numpy(dtype=float)
+    y = base['norm_pace'].to_numpy(dtype=float)
+    k = len(athletes)
+
+    # Grouped sums give every athlete's least-squares fit in one pass
+    n = np.bincount(codes, minlength=k).astype(float)
+    x_mean = np.bincount(codes, x, k) / n
+    y_mean = np.bincount(codes, y, k) / n
+    dx = x - x_mean[codes]
+    dy = y - y_mean[codes]
+    sxx = np.bincount(codes, dx * dx, k)
+    sxy = np.bincount(codes, dx * dy, k)
+    syy = np.bincount(codes, dy * dy, k)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        slope = sxy / (sxx + SLOPE_SHRINKAGE)
+        sse = np.clip(syy - 2 * slope * sxy + slope * slope * sxx, 0, None)
+        dof = n - 2
+        # Athletes with too few races borrow the league's pooled residual variance
+        pooled_var = sse[dof > 0].sum() / dof[dof > 0].sum() if (dof > 0).any() else 0.0
+        resid_var = np.where(dof > 0, sse / np.maximum(dof, 1), pooled_var)
+
+        x_last = np.zeros(k)
+        np.maximum.at(x_last, codes, x)
+        x_next = x_last + 1
+        projected_norm = y_mean + slope * (x_next - x_mean)
+        leverage = np.where(sxx > 0, (x_next - x_mean) ** 2 / sxx, 0.0)
+        half_width = 1.96 * np.sqrt(resid_var * (1 + 1 / n + leverage))
+
+    latest = base.groupby(codes, sort=True).last()
+    to_latest_distance = 1 / distance_factor(latest['distance_km'].to_numpy())
+
+    forecasts = pd.DataFrame({
+        'athlete_full_name': athletes,
+        'team_name': latest['team_name'].to_numpy(),
+        'division': latest['division'].to_numpy(),
+        'gender': latest['gender'].to_numpy(),
+        'last_season': latest['season_year'].astype(int).to_numpy(),
+        'races': n.astype(int),
+        'latest_pace': latest['pace_per_mi_min'].to_numpy(),
+        'trend_sec_per_race': slope * to_latest_distance * 60,
+        'projected_pace': projected_norm * to_latest_distance,
+        'projected_pace_low': (projected_norm - half_width) * to_latest_distance,
+        'projected_pace_high': (projected_norm + half_width) * to_latest_distance,
+    })
+    half_width_sec = half_width * to_latest_distance * 60
+    forecasts['confidence'] = np.select(
+        [(n >= 3) & (half_width_sec <= HIGH_CONFIDENCE_SEC), (n >= 2) & (half_width_sec <= MEDIUM_CONFIDENCE_SEC)],
+        ['high', 'medium'],
+        default='low'
+    )
+
+    # Breakout: improving faster than 90% of peers in the same division and gender
+    eligible = forecasts['races'] >= BREAKOUT_MIN_RACES
+    trend_pct = forecasts[eligible].groupby(['division', 'gender'])['trend_sec_per_race'].rank(pct=True)
+    forecasts['breakout'] = False
+    forecasts.loc[trend_pct.index, 'breakout'] = (
+        (trend_pct <= BREAKOUT_PERCENTILE) & (forecasts.loc[trend_pct.index, 'trend_sec_per_race'] < 0)
+    )
+
+    forecasts['projected_pace_str'] = forecasts['projected_pace'].apply(format_pace)
+    return forecasts
+
+
+def main():
+    import dataset
+
+    df = dataset.read_results()
+    forecasts = build_forecasts(df)
+
+    print("=" * 80)
+    print("ATHLETE FORECASTS")
+    print("=" * 80)
+    print(f"\nAthletes: {len(forecasts):,}")
+    print(f"Confidence: {forecasts['confidence'].value_counts().to_dict()}")
+    print(f"Breakout runners: {forecasts['breakout'].sum()}")
+
+    breakouts = forecasts[forecasts['breakout']].sort_values('trend_sec_per_race')
+    print("\nTop breakout runners:")
+    for _, row in breakouts.head(10).iterrows():
+        print(f"  {row['athlete_full_name']:<28} {row['team_name']:<22} "
+              f"{row['trend_sec_per_race']:+6.1f} s/mi per race -> {row['projected_pace_str']}/mi next")
+
+
+if __name__ == "__main__":
+    main()
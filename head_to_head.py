@@ -0,0 +1,205 @@
+"""
+Head-to-head matchup index
+Holds every result as a sparse athlete x race structure (compressed rows per
+athlete and per race) so pair, group and "closest rivals" queries touch only
+the races involved instead of filtering the whole results frame
+"""
+import numpy as np
+import pandas as pd
+
+import dataset
+
+RACE_KEYS = ['season_year', 'meet_number', 'division', 'gender']
+
+
+def _compressed_rows(row_ids: np.ndarray, n_rows: int):
+    """Order and row pointers that group entries by row id (CSR layout)"""
+    order = np.argsort(row_ids, kind='stable')
+    indptr = np.zeros(n_rows + 1, dtype=np.int64)
+    np.cumsum(np.bincount(row_ids, minlength=n_rows), out=indptr[1:])
+    return order, indptr
+
+
+class MatchupIndex:
+    """
+    Sparse athlete x race index of finishing positions and times
+
+    Entries are stored once, sorted by athlete then race; a second pointer
+    array gives the same entries grouped by race. Within a race, position is
+    the finish order (place, then time), so any two entrants compare directly.
+    """
+
+    def __init__(self, athletes, teams, races, entry_athlete, entry_race, entry_position, entry_time):
+        self.athletes = np.asarray(athletes, dtype=str)
+        self.teams = np.asarray(teams, dtype=str)
+        self.races = races.reset_index(drop=True)
+        self.entry_athlete = np.asarray(entry_athlete, dtype=np.int64)
+        self.entry_race = np.asarray(entry_race, dtype=np.int64)
+        self.entry_position = np.asarray(entry_position, dtype=np.int64)
+        self.entry_time = np.asarray(entry_time, dtype=float)
+
+        self._athlete_code = {name: i for i, name in enumerate(self.athletes)}
+        _, self.athlete_ptr = _compressed_rows(self.entry_athlete, len(self.athletes))
+        self.race_order, self.race_ptr = _compressed_rows(self.entry_race, len(self.races))
+
+    @classmethod
+    def build(cls, df: pd.DataFrame) -> 'MatchupIndex':
+        results = df.dropna(subset=['athlete_full_name'] + RACE_KEYS)
+        results = results[results['finish_time_s'].notna() | results['place_overall'].notna()]
+        results = results.sort_values(RACE_KEYS + ['place_overall', 'finish_time_s'], kind='stable')
+        # An athlete listed twice in a race keeps the better finish
+        results = results.drop_duplicates(['athlete_full_name'] + RACE_KEYS, keep='first')
+
+        race_codes, race_index = pd.MultiIndex.from_frame(results[RACE_KEYS]).factorize()
+        position = results.groupby(race_codes).cumcount().to_numpy() + 1
+        athlete_codes, athletes = pd.factorize(results['athlete_full_name'], sort=True)
+        teams = results.groupby(athlete_codes)['team_name'].last().reindex(range(len(athletes))).fillna('')
+
+        races = race_index.to_frame(index=False, name=RACE_KEYS)
+        meet_names = results.groupby(race_codes)['meet_name'].first() if 'meet_name' in results.columns else None
+        races['meet_name'] = meet_names.to_numpy() if meet_names is not None else ''
+
+        order = np.lexsort((race_codes, athlete_codes))
+        return cls(
+            athletes, teams.to_numpy(), races,
+            athlete_codes[order], race_codes[order], position[order],
+            results['finish_time_s'].to_numpy(dtype=float)[order]
+        )
+
+    def save(self, path):
+        arrays = {
+            'athletes': self.athletes, 'teams': self.teams,
+            'entry_athlete': self.entry_athlete, 'entry_race': self.entry_race,
+            'entry_position': self.entry_position, 'entry_time': self.entry_time,
+        }
+        for column in self.races.columns:
+            values = self.races[column].to_numpy()
+            arrays[f'race_{column}'] = values.astype(str) if values.dtype == object else values
+        dataset.atomic_write(path, lambda f: np.savez(f, **arrays), mode='wb')
+
+    @classmethod
+    def load(cls, path) -> 'MatchupIndex':
+        with np.load(path, allow_pickle=False) as data:
+            races = pd.DataFrame({
+                key[len('race_'):]: data[key] for key in data.files if key.startswith('race_')
+            })
+            return cls(
+                data['athletes'], data['teams'], races, data['entry_athlete'], data['entry_race'],
+                data['entry_position'], data['entry_time']
+            )
+
+    def _athlete_entries(self, name: str) -> slice:
+        code = self._athlete_code.get(name)
+        if code is None:
+            return slice(0, 0)
+        return slice(self.athlete_ptr[code], self.athlete_ptr[code + 1])
+
+    def head_to_head(self, athlete_a: str, athlete_b: str) -> pd.DataFrame:
+        """
+        Every race both athletes ran, with places and times
+        Margin (s) is B's time minus A's time: positive means A finished ahead
+        """
+        a, b = self._athlete_entries(athlete_a), self._athlete_entries(athlete_b)
+        shared, ia, ib = np.intersect1d(self.entry_race[a], self.entry_race[b], return_indices=True)
+        a_pos, b_pos = self.entry_position[a][ia], self.entry_position[b][ib]
+        a_time, b_time = self.entry_time[a][ia], self.entry_time[b][ib]
+
+        matchups = self.races.iloc[shared].reset_index(drop=True)
+        matchups[f'{athlete_a} Pos'] = a_pos
+        matchups[f'{athlete_b} Pos'] = b_pos
+        matchups['Margin (s)'] = np.round(b_time - a_time, 1)
+        matchups['Winner'] = np.where(a_pos < b_pos, athlete_a, athlete_b)
+        return matchups
+
+    def record(self, athlete_a: str, athlete_b: str) -> dict:
+        """Win/loss record of A against B and A's average margin (s)"""
+        matchups = self.head_to_head(athlete_a, athlete_b)
+        wins = int((matchups['Winner'] == athlete_a).sum())
+        return {
+            'races': len(matchups),
+            'wins': wins,
+            'losses': len(matchups) - wins,
+            'avg_margin_s': float(matchups['Margin (s)'].mean()) if len(matchups) else np.nan,
+        }
+
+    def group_records(self, athletes: list) -> pd.DataFrame:
+        """Square table of wins: row athlete's wins over column athlete in shared races"""
+        wins = pd.DataFrame(0, index=athletes, columns=athletes)
+        for i, a in enumerate(athletes):
+            for b in athletes[i + 1:]:
+                rec = self.record(a, b)
+                wins.loc[a, b], wins.loc[b, a] = rec['wins'], rec['losses']
+        return wins
+
+    def closest_rivals(self, athlete: str, min_races: int = 2, top: int = 10) -> pd.DataFrame:
+        """
+        Athletes who raced this athlete at least `min_races` times, closest first
+        (smallest average absolute time gap), with the head-to-head record
+        """
+        entries = self._athlete_entries(athlete)
+        my_races = self.entry_race[entries]
+        my_position = self.entry_position[entries]
+        my_time = self.entry_time[entries]
+        if len(my_races) == 0:
+            return pd.DataFrame()
+
+        # Gather every entrant of this athlete's races from the race-major view
+        starts, ends = self.race_ptr[my_races], self.race_ptr[my_races + 1]
+        lengths = ends - starts
+        slot = np.repeat(np.arange(len(my_races)), lengths)
+        gathered = self.race_order[np.repeat(starts - np.cumsum(np.r_[0, lengths[:-1]]), lengths) + np.arange(lengths.sum())]
+
+        rival = self.entry_athlete[gathered]
+        me = self._athlete_code[athlete]
+        keep = rival != me
+        rival, gathered, slot = rival[keep], gathered[keep], slot[keep]
+
+        won = my_position[slot] < self.entry_position[gathered]
+        gap = np.abs(self.entry_time[gathered] - my_time[slot])
+        has_gap = ~np.isnan(gap)
+
+        n = len(self.athletes)
+        races = np.bincount(rival, minlength=n)
+        wins = np.bincount(rival, won, minlength=n)
+        gap_total = np.bincount(rival[has_gap], gap[has_gap], minlength=n)
+        gap_count = np.bincount(rival[has_gap], minlength=n)
+
+        candidates = np.flatnonzero((races >= min_races) & (gap_count > 0))
+        rivals = pd.DataFrame({
+            'Rival': self.athletes[candidates],
+            'Team': self.teams[candidates],
+            'Races': races[candidates],
+            'Wins': wins[candidates].astype(int),
+            'Losses': (races - wins)[candidates].astype(int),
+            'Avg Gap (s)': np.round(gap_total[candidates] / gap_count[candidates], 1),
+        })
+        return rivals.sort_values(['Avg Gap (s)', 'Races'], ascending=[True, False]).head(top).reset_index(drop=True)
+
+
+def build_matchups(df: pd.DataFrame) -> MatchupIndex:
+    return MatchupIndex.build(df)
+
+
+def main():
+    import time
+
+    df = dataset.read_results()
+    start = time.perf_counter()
+    index = build_matchups(df)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    print("=" * 80)
+    print("HEAD-TO-HEAD MATCHUP INDEX")
+    print("=" * 80)
+    print(f"\n{len(index.athletes):,} athletes x {len(index.races):,} races, "
+          f"{len(index.entry_athlete):,} entries (built in {build_ms:.0f} ms)")
+
+    athlete = df['athlete_full_name'].value_counts().index[0]
+    start = time.perf_counter()
+    rivals = index.closest_rivals(athlete)
+    print(f"\nClosest rivals of {athlete} ({(time.perf_counter() - start) * 1000:.1f} ms):")
+    print(rivals.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
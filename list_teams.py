@@ -1,10 +1,16 @@
-import pandas as pd
+import store
 
-df = pd.read_csv('data/merged/season_results.csv')
-teams = df['team_name'].dropna().unique()
 
-print(f"Total unique teams: {len(teams)}")
-print("\nAll teams:")
-for team in sorted(teams):
-    count = len(df[df['team_name'] == team])
-    print(f"  {team} ({count})")
+def main(results_store=None):
+    # Counts come straight from the indexed store: no CSV read, no pandas
+    results_store = results_store or store.open_store()
+    teams = results_store.execute(store.TEAM_COUNTS_SQL)
+
+    print(f"Total unique teams: {len(teams)}")
+    print("\nAll teams:")
+    for team, count in teams:
+        print(f"  {team} ({count})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,375 @@
+"""
+Headless load test for the Streamlit dashboard
+
+Starts `streamlit run dashboard.py` on a local port and drives concurrent
+browser-like sessions over Streamlit's websocket protocol (the same protobuf
+messages the frontend sends), so shared caches and fragment reruns behave
+exactly as they do on the dyno. Each session scripts a realistic visit:
+switch season, search for an athlete and pick a match, change the team
+filter, open team scores and change the division there. Reports p50/p95 rerun latency per action and the
+server's peak RSS.
+
+Usage:
+    python load_test.py --sessions 20 --iterations 3
+    python load_test.py --sessions 50 --synthetic-athletes 20000
+"""
+import argparse
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from add_distance_metrics import DISTANCE_MAP, add_distance_columns
+import dataset
+
+DASHBOARD_PATH = Path(__file__).parent / 'dashboard.py'
+
+# Widget kinds the client knows how to drive (see DashboardSession._encode)
+_WIDGET_KINDS = ('selectbox', 'multiselect', 'radio', 'checkbox', 'toggle', 'text_input')
+
+
+def make_synthetic_results(athletes: int = 3000, seasons=(2023, 2024, 2025), teams: int = 30,
+                           meets: int = 3, seed: int = 0) -> pd.DataFrame:
+    """
+    Build a merged-results-shaped dataset with `athletes` runners per season
+    Runners have a stable ability and improve a little meet to meet, so
+    progress, scoring and standings views all have realistic work to do
+    """
+    rng = np.random.default_rng(seed)
+    divisions = list(DISTANCE_MAP)
+    team_names = [f"Team {i:02d}" for i in range(teams)]
+    frames = []
+
+    for season in seasons:
+        roster = pd.DataFrame({
+            'athlete_full_name': [f"Runner {season % 100:02d}-{i:05d}" for i in range(athletes)],
+            'team_name': rng.choice(team_names, athletes),
+            'division': rng.choice(divisions, athletes),
+            'gender': rng.choice(['M', 'F'], athletes),
+            'ability': rng.normal(8.5, 1.2, athletes).clip(5.5, 14.0),  # min/mile
+        })
+        roster['grade'] = roster['division'].map({'2nd Grade': 2, 'Frosh': 3, 'JV': 5, 'Varsity': 7})
+        roster['grade'] += rng.integers(0, 2, athletes)
+
+        for meet in range(1, meets + 1):
+            ran = roster[rng.random(athletes) < 0.85].copy()
+            distance_mi = ran['division'].map(DISTANCE_MAP) * 0.621371
+            pace = ran['ability'] * (1 - 0.01 * meet) + rng.normal(0, 0.25, len(ran))
+            ran['finish_time_s'] = (pace * distance_mi * 60).round(1)
+            ran['season_year'] = season
+            ran['meet_number'] = meet
+            ran['meet_series'] = "NVJCYO Cross Country Developmental"
+            ran['meet_name'] = f"NVJCYO Cross Country Developmental Meet {meet}"
+            ran['place_overall'] = (
+                ran.groupby(['division', 'gender'])['finish_time_s'].rank(method='first').astype(int)
+            )
+            frames.append(ran.drop(columns='ability'))
+
+    df = pd.concat(frames, ignore_index=True)
+    df['finish_time_str'] = [f"{int(t // 60)}:{t % 60:04.1f}" for t in df['finish_time_s']]
+    df = add_distance_columns(df)
+    df['pace_str'] = df['pace_per_mi_str']
+    return df
+
+
+def _rss_peak_mb(pid: int) -> float | None:
+    """Peak resident set size (VmHWM) of a process, Linux only"""
+    try:
+        with open(f'/proc/{pid}/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        return None
+    return None
+
+
+def start_server(port: int, results_path: Path | None) -> subprocess.Popen:
+    """Launch the dashboard headless and wait for its health endpoint"""
+    env = dict(os.environ)
+    if results_path is not None:
+        env['XC_RESULTS_PATH'] = str(results_path)
+    proc = subprocess.Popen(
+        [sys.executable, '-m', 'streamlit', 'run', str(DASHBOARD_PATH),
+         '--server.headless', 'true',
+         '--server.port', str(port),
+         '--server.fileWatcherType', 'none',
+         '--browser.gatherUsageStats', 'false'],
+        cwd=DASHBOARD_PATH.parent,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"streamlit exited with code {proc.returncode}")
+        try:
+            with urllib.request.urlopen(f'http://127.0.0.1:{port}/_stcore/health', timeout=1) as resp:
+                if resp.status == 200:
+                    return proc
+        except OSError:
+            time.sleep(0.25)
+    proc.terminate()
+    raise RuntimeError("streamlit did not become healthy within 60s")
+
+
+@dataclass
+class Widget:
+    kind: str
+    id: str
+    label: str
+    options: list
+    fragment_id: str
+    state: object = None
+
+
+@dataclass
+class SessionStats:
+    timings: list = field(default_factory=list)  # (action, seconds)
+    errors: list = field(default_factory=list)
+
+
+class DashboardSession:
+    """One simulated browser tab talking to the dashboard over its websocket"""
+
+    def __init__(self, port: int):
+        self.url = f'ws://127.0.0.1:{port}/_stcore/stream'
+        self.ws = None
+        self.widgets = {}  # label -> Widget (latest render)
+
+    async def connect(self):
+        from tornado.websocket import websocket_connect
+        self.ws = await websocket_connect(self.url, max_message_size=256 * 1024 * 1024)
+
+    def close(self):
+        if self.ws is not None:
+            self.ws.close()
+
+    async def rerun(self, fragment_id: str = '') -> list[str]:
+        """Send the current widget states and wait for the run to finish; returns exceptions seen"""
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        msg = BackMsg()
+        msg.rerun_script.query_string = ''
+        msg.rerun_script.page_script_hash = ''
+        msg.rerun_script.fragment_id = fragment_id
+        for widget in self.widgets.values():
+            if widget.state is not None:
+                self._encode(widget, msg.rerun_script.widget_states.widgets.add())
+        await self.ws.write_message(msg.SerializeToString(), binary=True)
+
+        errors = []
+        while True:
+            raw = await self.ws.read_message()
+            if raw is None:
+                raise ConnectionError("websocket closed by server")
+            forward = ForwardMsg()
+            forward.ParseFromString(raw)
+            kind = forward.WhichOneof('type')
+            if kind == 'delta' and forward.delta.WhichOneof('type') == 'new_element':
+                element = forward.delta.new_element
+                element_kind = element.WhichOneof('type')
+                if element_kind == 'exception':
+                    errors.append(element.exception.message)
+                elif element_kind in _WIDGET_KINDS:
+                    self._track(element_kind, getattr(element, element_kind), forward.delta.fragment_id)
+            elif kind == 'script_finished':
+                return errors
+
+    def _track(self, kind: str, proto, fragment_id: str):
+        known = self.widgets.get(proto.label)
+        if known is not None and known.id == proto.id:
+            known.fragment_id = fragment_id
+            return
+        options = list(getattr(proto, 'options', []))
+        if kind == 'selectbox':
+            state = options[proto.default] if options and proto.HasField('default') else None
+        elif kind == 'multiselect':
+            state = [options[i] for i in proto.default]
+        elif kind in ('radio', 'text_input'):
+            state = proto.default if proto.HasField('default') else None
+        else:
+            state = proto.default
+        self.widgets[proto.label] = Widget(kind, proto.id, proto.label, options, fragment_id, state)
+
+    @staticmethod
+    def _encode(widget: Widget, ws):
+        ws.id = widget.id
+        if widget.kind in ('selectbox', 'text_input'):
+            ws.string_value = widget.state
+        elif widget.kind == 'multiselect':
+            ws.string_array_value.data[:] = widget.state
+        elif widget.kind == 'radio':
+            ws.int_value = widget.state
+        else:
+            ws.bool_value = widget.state
+
+    async def choose(self, label: str, value) -> list[str] | None:
+        """Set a selectbox/radio by option and rerun (only the owning fragment, if any)"""
+        widget = self.widgets.get(label)
+        if widget is None or value not in widget.options:
+            return None
+        widget.state = widget.options.index(value) if widget.kind == 'radio' else value
+        return await self.rerun(widget.fragment_id)
+
+    async def enter(self, label: str, text: str) -> list[str] | None:
+        """Type into a text input and rerun"""
+        widget = self.widgets.get(label)
+        if widget is None:
+            return None
+        widget.state = text
+        return await self.rerun(widget.fragment_id)
+
+    def options(self, label: str) -> list:
+        widget = self.widgets.get(label)
+        return widget.options if widget else []
+
+
+async def run_session(port: int, iterations: int, think_time: float, rng: random.Random,
+                      stats: SessionStats, athletes: list[str]):
+    session = DashboardSession(port)
+    await session.connect()
+
+    async def timed(action, coro):
+        start = time.perf_counter()
+        try:
+            errors = await coro
+        except Exception as e:
+            stats.errors.append(f"{action}: {e}")
+            return
+        if errors is None:
+            return  # widget not on the page for this state; nothing was run
+        stats.timings.append((action, time.perf_counter() - start))
+        stats.errors.extend(f"{action}: {e}" for e in errors)
+        if think_time:
+            await asyncio.sleep(rng.uniform(0, think_time))
+
+    try:
+        await timed('initial load', session.rerun())
+        for _ in range(iterations):
+            await timed('switch season', session.choose('📅 Season', rng.choice(session.options('📅 Season'))))
+            if athletes:
+                # Type part of a name, as a visitor would, then pick one of the matches
+                name = rng.choice(athletes)
+                await timed('search athlete', session.enter('Search Athlete', name[:rng.randint(3, len(name))]))
+                matches = session.options('Matching Athletes')[1:]
+                if matches:
+                    await timed('pick athlete', session.choose('Matching Athletes', rng.choice(matches)))
+                await timed('clear athlete', session.enter('Search Athlete', ''))
+            teams = session.options('Filter by Team')[1:]
+            if teams:
+                await timed('change team', session.choose('Filter by Team', rng.choice(teams)))
+            await timed('open team scores', session.choose('Section', 'Team Scores'))
+            divisions = session.options('Division')[1:]
+            if divisions:
+                await timed('team score division', session.choose('Division', rng.choice(divisions)))
+            await timed('reset team', session.choose('Filter by Team', 'All Teams'))
+    finally:
+        session.close()
+
+
+async def run_load(port: int, sessions: int, iterations: int, think_time: float, seed: int,
+                   ramp: float, athletes: list[str]) -> list[SessionStats]:
+    stats = [SessionStats() for _ in range(sessions)]
+
+    async def start(i):
+        await asyncio.sleep(ramp * i / max(sessions, 1))
+        await run_session(port, iterations, think_time, random.Random(seed + i), stats[i], athletes)
+
+    await asyncio.gather(*(start(i) for i in range(sessions)))
+    return stats
+
+
+def summarize(stats: list[SessionStats]) -> pd.DataFrame:
+    timings = pd.DataFrame(
+        [(action, seconds * 1000) for s in stats for action, seconds in s.timings],
+        columns=['action', 'ms']
+    )
+    if timings.empty:
+        return timings
+    by_action = timings.groupby('action', sort=False)['ms']
+    summary = pd.DataFrame({
+        'runs': by_action.count(),
+        'p50': by_action.quantile(0.5),
+        'p95': by_action.quantile(0.95),
+        'max': by_action.max(),
+    })
+    summary.loc['ALL'] = [len(timings), timings['ms'].quantile(0.5), timings['ms'].quantile(0.95), timings['ms'].max()]
+    summary = summary.round(1)
+    summary['runs'] = summary['runs'].astype(int)
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless load test for dashboard.py")
+    parser.add_argument('--sessions', type=int, default=10, help="concurrent sessions")
+    parser.add_argument('--iterations', type=int, default=2, help="scripted visits per session")
+    parser.add_argument('--think-time', type=float, default=0.0, help="max random pause between actions (s)")
+    parser.add_argument('--ramp', type=float, default=1.0, help="seconds over which sessions start")
+    parser.add_argument('--port', type=int, default=8599)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--synthetic-athletes', type=int, default=0,
+                        help="use generated data with this many athletes per season instead of the real dataset")
+    args = parser.parse_args()
+
+    results_path = None
+    tmp_dir = None
+    if args.synthetic_athletes:
+        tmp_dir = tempfile.TemporaryDirectory()
+        results_path = Path(tmp_dir.name) / 'season_results.csv'
+        synthetic = make_synthetic_results(args.synthetic_athletes, seed=args.seed)
+        dataset.write_results(synthetic, results_path)
+        data_label = f"synthetic, {len(synthetic):,} rows"
+    else:
+        data_label = f"{dataset.RESULTS_PATH}"
+    # Names the sessions search for
+    athletes = sorted(dataset.read_results(results_path or dataset.RESULTS_PATH)['athlete_full_name'].dropna().unique())
+
+    print("=" * 60)
+    print("DASHBOARD LOAD TEST")
+    print("=" * 60)
+    print(f"Data: {data_label}")
+    print(f"Sessions: {args.sessions} concurrent x {args.iterations} iterations\n")
+
+    server = start_server(args.port, results_path)
+    try:
+        baseline_rss = _rss_peak_mb(server.pid)
+        started = time.perf_counter()
+        stats = asyncio.run(run_load(
+            args.port, args.sessions, args.iterations, args.think_time, args.seed, args.ramp, athletes
+        ))
+        elapsed = time.perf_counter() - started
+        peak_rss = _rss_peak_mb(server.pid)
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+        if tmp_dir is not None:
+            tmp_dir.cleanup()
+
+    summary = summarize(stats)
+    print("Rerun latency (ms):")
+    print(summary.to_string())
+
+    errors = [e for s in stats for e in s.errors]
+    print(f"\nWall time: {elapsed:.1f}s")
+    if peak_rss is not None:
+        print(f"Server RSS: {baseline_rss:.0f} MB idle -> {peak_rss:.0f} MB peak")
+    print(f"Errors: {len(errors)}")
+    for error in errors[:10]:
+        print(f"  {error}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,29 +1,45 @@
 import pandas as pd
 import glob
 
-# Read all CSV files in data/raw/
-csv_files = glob.glob("data/raw/*.csv")
-print(f"Found {len(csv_files)} CSV files")
+import dataset
 
-dfs = []
-for file in csv_files:
-    df = pd.read_csv(file)
-    print(f"File: {file} - {len(df)} rows")
-    dfs.append(df)
 
-if dfs:
+def merge_raw(pattern: str = "data/raw/*.csv") -> pd.DataFrame | None:
+    """Concatenate the parsed per-race CSVs (None if there are none)"""
+    # Read all CSV files in data/raw/
+    csv_files = glob.glob(pattern)
+    print(f"Found {len(csv_files)} CSV files")
+
+    dfs = []
+    for file in csv_files:
+        df = pd.read_csv(file)
+        print(f"File: {file} - {len(df)} rows")
+        dfs.append(df)
+
+    if not dfs:
+        return None
+
     # Merge all dataframes
     merged = pd.concat(dfs, ignore_index=True)
-    
+
     # Sort by meet_number and then by place_overall for better organization
-    merged = merged.sort_values(['meet_number', 'place_overall'], na_position='last')
-    
+    return merged.sort_values(['meet_number', 'place_overall'], na_position='last')
+
+
+def main():
+    merged = merge_raw()
+    if merged is None:
+        print("No data to merge")
+        return
+
     # Save merged file
-    merged.to_csv("data/merged/season_results.csv", index=False)
+    dataset.write_results(merged)
     print(f"\nMerged {len(merged)} total rows")
-    
+
     # Show sample data
     print("\nSample data:")
     print(merged[['athlete_full_name', 'meet_name', 'meet_number', 'place_overall', 'finish_time_s']].head(10))
-else:
-    print("No data to merge")
\ No newline at end of file
+
+
+if __name__ == "__main__":
+    main()
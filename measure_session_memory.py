@@ -0,0 +1,65 @@
+"""
+Measure per-session memory of the dashboard's data loading strategy
+
+Compares the old path (st.cache_data unpickles a private copy for every
+caller, then the script does a full df.copy()) against the shared frame
+held in st.cache_resource, where a session only owns what its filters select.
+
+Usage: python measure_session_memory.py [sessions]
+"""
+import gc
+import pickle
+import sys
+import tracemalloc
+
+import pandas as pd
+
+import dataset
+
+
+def simulate_sessions(df: pd.DataFrame, sessions: int, shared: bool) -> float:
+    """Return traced memory (MB) held by `sessions` concurrent dashboard reruns"""
+    cached_bytes = pickle.dumps(df)
+    season = df['season_year'].max()
+
+    gc.collect()
+    tracemalloc.start()
+    held = []
+    for _ in range(sessions):
+        if shared:
+            session_df = df
+        else:
+            # What st.cache_data + filtered_df = df.copy() did per rerun
+            session_df = pickle.loads(cached_bytes).copy()
+        filtered = session_df[session_df['season_year'] == season]
+        held.append((session_df, filtered))
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del held
+    gc.collect()
+    return current / 1024 / 1024
+
+
+def main():
+    sessions = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    pd.set_option('mode.copy_on_write', True)
+    df = dataset.read_results()
+
+    print("=" * 60)
+    print("PER-SESSION MEMORY")
+    print("=" * 60)
+    print(f"Dataset: {len(df):,} rows, {dataset.frame_memory_mb(df):.1f} MB in memory")
+    print(f"Simulated concurrent sessions: {sessions}\n")
+
+    before = simulate_sessions(df, sessions, shared=False)
+    after = simulate_sessions(df, sessions, shared=True)
+
+    print(f"  {'Strategy':<32} {'Total MB':>10} {'MB/session':>12}")
+    print(f"  {'cache_data + df.copy()':<32} {before:>10.1f} {before / sessions:>12.2f}")
+    print(f"  {'cache_resource shared frame':<32} {after:>10.1f} {after / sessions:>12.2f}")
+    if after > 0:
+        print(f"\n  Reduction: {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -102,9 +102,12 @@ def parse_html_table(html_path: str) -> pd.DataFrame:
     """Extract table data from saved HTML or MHTML file"""
     with open(html_path, 'r', encoding='utf-8') as f:
         content = f.read()
-    
+    return parse_html_content(content, html_path)
+
+def parse_html_content(content: str, source: str) -> pd.DataFrame:
+    """Extract table data from page content (HTML or MHTML); source names it in messages"""
     # Check if it's an MHTML file
-    if html_path.endswith('.mhtml') or 'MIME-Version:' in content[:1000]:
+    if source.endswith('.mhtml') or 'MIME-Version:' in content[:1000]:
         content = decode_mhtml(content)
     
     soup = BeautifulSoup(content, 'html.parser')
@@ -115,7 +118,7 @@ def parse_html_table(html_path: str) -> pd.DataFrame:
         table = soup.find('table')
     
     if not table:
-        print(f"  Warning: No table found in {html_path}")
+        print(f"  Warning: No table found in {source}")
         return None
     
     # Extract headers
@@ -269,6 +272,32 @@ def standardize_columns(df: pd.DataFrame, file_info: dict) -> pd.DataFrame:
     
     return df
 
+def raw_output_name(file_info: dict) -> str:
+    """data/raw filename for a race, e.g. 2025_meet_1_varsity_girls.csv"""
+    year = file_info['season_year']
+    meet_num = file_info['meet_number']
+    division = file_info['division'].lower()
+    gender = file_info['gender'].lower()
+    return f"{year}_meet_{meet_num}_{division}_{gender}.csv"
+
+def parse_page(content: str, filename: str):
+    """
+    Parse one results page held in memory: (file_info, standardized DataFrame),
+    with None for the DataFrame if the page has no results table
+    The filename (saved or as listed for a fetched page) supplies the meet info
+    """
+    # Parse filename to get metadata
+    file_info = parse_filename(filename)
+    print(f"  {file_info['season_year']} | Meet {file_info['meet_number']} | {file_info['division']} {file_info['gender']}")
+    
+    # Parse HTML table
+    df = parse_html_content(content, filename)
+    if df is None or len(df) == 0:
+        return file_info, None
+    
+    # Standardize columns and add metadata
+    return file_info, standardize_columns(df, file_info)
+
 def main():
     pages_dir = Path("data/pages")
     output_dir = Path("data/raw")
@@ -290,26 +319,14 @@ def main():
         filename = html_file.name
         print(f"Processing: {filename}")
         
-        # Parse filename to get metadata
-        file_info = parse_filename(filename)
+        with open(html_file, 'r', encoding='utf-8') as f:
+            file_info, df = parse_page(f.read(), filename)
         years_found.add(file_info['season_year'])
-        print(f"  {file_info['season_year']} | Meet {file_info['meet_number']} | {file_info['division']} {file_info['gender']}")
-        
-        # Parse HTML table
-        df = parse_html_table(str(html_file))
-        if df is None or len(df) == 0:
+        if df is None:
             print(f"  Skipping - no data found")
             continue
         
-        # Standardize columns and add metadata
-        df = standardize_columns(df, file_info)
-        
-        # Create output filename with year
-        year = file_info['season_year']
-        meet_num = file_info['meet_number']
-        division = file_info['division'].lower()
-        gender = file_info['gender'].lower()
-        output_filename = f"{year}_meet_{meet_num}_{division}_{gender}.csv"
+        output_filename = raw_output_name(file_info)
         output_path = output_dir / output_filename
         
         # Save to CSV
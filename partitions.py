@@ -0,0 +1,248 @@
+"""
+Partitioned layout of the results, with a loader that reads only what it needs
+precompute.py ('partitions' stage) splits the prepared dataset into one CSV
+per meet series, season and meet under data/merged/derived/partitions/:
+
+    nvjcyo-cross-country-developmental/season=2025/meet=2.csv
+    nyjcyo-cross-country-championship/season=2024/meet=3.csv
+    index.json    dataset version, column dtypes, and rows / hash per partition
+
+Only partitions whose content changed are rewritten, so ingesting a meet
+touches one folder. load() takes series / season / meet filters and reads
+just the matching partitions, picked from the index without opening the
+others. A deployment can be limited to a scope (XC_SCOPE, e.g.
+"series=nvjcyo-cross-country-developmental; seasons=2024-2025"); its
+dataset store then holds only that slice, so memory and load time follow
+the scope instead of the whole history.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+from dataclasses import dataclass
+from pathlib import Path
+
+import pandas as pd
+
+import dataset
+
+PARTITIONS_DIRNAME = 'partitions'
+INDEX_NAME = 'index.json'
+PARTITION_KEYS = ['meet_series', 'season_year', 'meet_number']
+
+
+def series_slug(series) -> str:
+    """Folder name for a meet series ('unknown' when missing)"""
+    if pd.isna(series):
+        return 'unknown'
+    return re.sub(r'[^a-z0-9]+', '-', str(series).lower()).strip('-') or 'unknown'
+
+
+def _key_part(value) -> str:
+    return 'none' if pd.isna(value) else str(int(value))
+
+
+def partitions_dir(results_path=None) -> Path:
+    return dataset.derived_dir(results_path) / PARTITIONS_DIRNAME
+
+
+@dataclass(frozen=True)
+class Scope:
+    """Partition filter: series slugs, seasons and meet numbers (empty = all)"""
+    series: tuple = ()
+    seasons: tuple = ()
+    meets: tuple = ()
+
+    @classmethod
+    def parse(cls, text: str) -> 'Scope':
+        """
+        "series=a,b; seasons=2024-2025; meets=1,2" (any part optional)
+        Series are slugs (see series_slug) or full names
+        """
+        parts = {}
+        for item in filter(None, (part.strip() for part in text.split(';'))):
+            key, _, value = item.partition('=')
+            values = [value.strip() for value in value.split(',') if value.strip()]
+            if key.strip() == 'series':
+                parts['series'] = tuple(sorted(series_slug(value) for value in values))
+            elif key.strip() in ('seasons', 'meets'):
+                numbers = set()
+                for value in values:
+                    low, _, high = value.partition('-')
+                    numbers.update(range(int(low), int(high or low) + 1))
+                parts[key.strip()] = tuple(sorted(numbers))
+            else:
+                raise ValueError(f"Unknown scope key {key!r} (expected series, seasons or meets)")
+        return cls(**parts)
+
+    def __bool__(self):
+        return bool(self.series or self.seasons or self.meets)
+
+    def __str__(self):
+        parts = [f"series={','.join(self.series)}" if self.series else '',
+                 f"seasons={','.join(map(str, self.seasons))}" if self.seasons else '',
+                 f"meets={','.join(map(str, self.meets))}" if self.meets else '']
+        return '; '.join(part for part in parts if part)
+
+    def matches(self, entry: dict) -> bool:
+        return ((not self.series or entry['series'] in self.series)
+                and (not self.seasons or entry['season_year'] in self.seasons)
+                and (not self.meets or entry['meet_number'] in self.meets))
+
+    def mask(self, df: pd.DataFrame) -> pd.Series:
+        """Rows of df inside the scope"""
+        keep = pd.Series(True, index=df.index)
+        if self.series:
+            keep &= df['meet_series'].map(series_slug).isin(self.series)
+        if self.seasons:
+            keep &= df['season_year'].isin(self.seasons)
+        if self.meets:
+            keep &= df['meet_number'].isin(self.meets)
+        return keep
+
+
+def build_partitions(df: pd.DataFrame) -> dict:
+    """{relative path: rows} for every series, season and meet in df"""
+    keys = [df['meet_series'].map(series_slug), df['season_year'].map(_key_part), df['meet_number'].map(_key_part)]
+    return {
+        f"{slug}/season={season}/meet={meet}.csv": rows
+        for (slug, season, meet), rows in df.groupby(keys, sort=True, dropna=False)
+    }
+
+
+def save_partitions(parts: dict, directory: Path):
+    """
+    Write the partitions and their index; unchanged partitions are left as
+    they are and partitions no longer in the dataset are removed
+    The index is written last, so readers never see it point at a missing file
+    """
+    directory = Path(directory)
+    previous = read_index(directory).get('partitions', {})
+    entries = {}
+    columns = None
+    for relative, rows in parts.items():
+        text = rows.to_csv(index=False)
+        digest = hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+        path = directory / relative
+        if previous.get(relative, {}).get('hash') != digest or not path.exists():
+            dataset.atomic_write(path, lambda f: f.write(text))
+        first = rows.iloc[0]
+        entries[relative] = {
+            'series': relative.split('/')[0],
+            'meet_series': None if pd.isna(first['meet_series']) else first['meet_series'],
+            'season_year': None if pd.isna(first['season_year']) else int(first['season_year']),
+            'meet_number': None if pd.isna(first['meet_number']) else int(first['meet_number']),
+            'rows': len(rows),
+            'hash': digest,
+        }
+        columns = rows.dtypes
+    index = {
+        'columns': {} if columns is None else {name: str(dtype) for name, dtype in columns.items()},
+        'partitions': entries,
+    }
+    dataset.atomic_write(directory / INDEX_NAME, lambda f: json.dump(index, f, indent=2, sort_keys=True))
+    for relative in set(previous) - set(entries):
+        (directory / relative).unlink(missing_ok=True)
+
+
+def read_index(directory: Path) -> dict:
+    try:
+        with open(Path(directory) / INDEX_NAME, encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def _read_partitions(directory: Path, index: dict, relatives: list[str]) -> pd.DataFrame:
+    dtypes = index['columns']
+    # Text columns are read as text in every partition, numeric ones cast back to the
+    # dataset's dtype, so the slice matches the same rows of the full dataset
+    text_columns = {name: str for name, dtype in dtypes.items() if dtype == 'object'}
+    frames = [pd.read_csv(directory / relative, dtype=text_columns) for relative in relatives]
+    if not frames:
+        return pd.DataFrame({name: pd.Series(dtype=dtype) for name, dtype in dtypes.items()})
+    df = pd.concat(frames, ignore_index=True)
+    return df.astype({name: dtype for name, dtype in dtypes.items() if dtype != 'object'})
+
+
+def load(scope: Scope = Scope(), results_path=None) -> pd.DataFrame:
+    """
+    Rows inside `scope`, read from the matching partitions only
+    Falls back to filtering the full dataset if the partitions are missing
+    or older than it
+    """
+    return load_versioned(scope, results_path)[1]
+
+
+def load_versioned(scope: Scope = Scope(), results_path=None) -> tuple[str, pd.DataFrame]:
+    """
+    load() with the dataset version it was read at (a DatasetStore loader,
+    see scoped_loader); raises RuntimeError if the dataset changed while
+    the partitions were being read
+    """
+    import precompute
+
+    results_path = Path(results_path or dataset.RESULTS_PATH)
+    directory = partitions_dir(results_path)
+    version = dataset.dataset_version(results_path)
+    index = read_index(directory)
+    if dataset.read_manifest(dataset.derived_dir(results_path)).get('partitions') != version or not index:
+        version, df = precompute.read_prepared(results_path)
+        return version, df[scope.mask(df)].reset_index(drop=True) if scope else df
+
+    relatives = [relative for relative, entry in sorted(index['partitions'].items()) if scope.matches(entry)]
+    df = _read_partitions(directory, index, relatives)
+    if dataset.dataset_version(results_path) != version:
+        raise RuntimeError(f"{results_path} changed while its partitions were being read")
+    # Partitions are written from the prepared dataset, so their stage columns are current
+    return version, precompute.prepare(df, fresh=precompute.COLUMN_STAGES)
+
+
+def scoped_loader(scope: Scope):
+    """DatasetStore loader for one scope"""
+    return lambda path: load_versioned(scope, path)
+
+
+def scope_from_env() -> Scope:
+    return Scope.parse(os.environ.get('XC_SCOPE', ''))
+
+
+def scoped_version(version: str, scope: Scope) -> str:
+    """
+    Cache key for data loaded under a scope: derived tables built from a
+    slice must not be mixed up with (or read from) the full-dataset artifacts
+    """
+    return f"{version}@{scope}" if scope else version
+
+
+def main():
+    import sys
+    import time
+
+    print("=" * 80)
+    print("PARTITIONED DATASET")
+    print("=" * 80)
+
+    directory = partitions_dir()
+    index = read_index(directory)
+    if not index:
+        print("\nNo partitions yet - run: python precompute.py partitions")
+        return
+    table = pd.DataFrame(index['partitions'].values(), index=list(index['partitions']))
+    print(f"\n{len(table)} partitions, {table['rows'].sum():,} rows in {directory}\n")
+    print(table[['rows']].to_string())
+
+    scopes = [Scope.parse(text) for text in sys.argv[1:]] or [
+        Scope(), Scope(seasons=(int(table['season_year'].max()),))]
+    for scope in scopes:
+        start = time.perf_counter()
+        df = load(scope)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        print(f"\n{str(scope) or 'everything'}: {len(df):,} rows, "
+              f"{dataset.frame_memory_mb(df):.1f} MB in {elapsed_ms:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+"""
+Precompute derived data from the merged season results
+Run after the cleanup chain so the dashboard reads results instead of fitting
+or aggregating per request.
+
+Column stages add columns to season_results.csv itself, and the manifest
+records the dataset version they were computed from. Loaders call prepare(),
+which recomputes the columns unless the file still is that version, so
+consumers work before (or without) a precompute run and never see columns
+left over from before a cleanup script rewrote the file.
+
+Artifact stages write tables/arrays next to the dataset in a derived/ folder.
+A manifest records the dataset version each artifact was built from, so a
+reader can tell a fresh artifact from a stale one and rebuild in-process
+instead of serving stale numbers.
+
+The 'dataset' stage keeps an Arrow IPC copy of the prepared dataset and the
+table artifacts get an Arrow copy next to their CSV. Readers memory-map
+those instead of parsing CSV (a few ms instead of tens on a cold start) and
+fall back to the CSV when the copy is stale or pyarrow is not installed.
+
+Usage: python precompute.py [stage ...]
+"""
+import json
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+import pandas as pd
+
+import courses
+import cube
+import dataset
+import forecast
+import head_to_head
+import partitions
+import progression
+import race_stats
+import ratings
+import records
+import store
+import tiers
+
+# Layout of the derived folder lives in dataset.py so light readers need not import the stages
+derived_dir = dataset.derived_dir
+read_manifest = dataset.read_manifest
+
+
+DATASET_CACHE_FILENAME = 'season_results.arrow'
+
+
+def save_csv(table: pd.DataFrame, path: Path):
+    dataset.atomic_write(path, lambda f: table.to_csv(f, index=False))
+
+
+def load_csv(path: Path) -> pd.DataFrame:
+    return pd.read_csv(path)
+
+
+def save_table(table: pd.DataFrame, path: Path):
+    """save_csv plus an Arrow copy (same name, .arrow) that load_table maps instead"""
+    save_csv(table, path)
+    arrow_path = Path(path).with_suffix('.arrow')
+    try:
+        dataset.write_arrow(table, arrow_path)
+    except (ImportError, TypeError, ValueError):
+        # No pyarrow, or a column Arrow cannot type: the CSV alone is served
+        arrow_path.unlink(missing_ok=True)
+
+
+def load_table(path: Path) -> pd.DataFrame:
+    arrow_path = Path(path).with_suffix('.arrow')
+    try:
+        # Written after the CSV; an older one is left over from a CSV-only save
+        if arrow_path.stat().st_mtime_ns >= Path(path).stat().st_mtime_ns:
+            return dataset.read_arrow(arrow_path)
+    except (FileNotFoundError, ImportError):
+        pass
+    return load_csv(path)
+
+
+@dataclass(frozen=True)
+class ArtifactStage:
+    build: Callable[[pd.DataFrame], object]
+    filename: str
+    save: Callable[[object, Path], None] = save_table
+    load: Callable[[Path], object] = load_table
+    # update(previous_artifact, df) brings a stale artifact up to date more cheaply than build
+    update: Callable[[object, pd.DataFrame], object] | None = None
+
+
+@dataclass(frozen=True)
+class ColumnStage:
+    add: Callable[[pd.DataFrame], pd.DataFrame]
+    columns: tuple
+
+
+COLUMN_STAGES = {
+    'tiers': ColumnStage(tiers.add_tier_column, ('performance_tier',)),
+    'race_stats': ColumnStage(race_stats.add_race_stat_columns, race_stats.RACE_STAT_COLUMNS),
+    'courses': ColumnStage(courses.add_course_columns, courses.COURSE_COLUMNS),
+}
+
+ARTIFACT_STAGES = {
+    # The prepared dataset itself, for read_prepared
+    'dataset': ArtifactStage(lambda df: df, DATASET_CACHE_FILENAME, save=dataset.write_arrow, load=dataset.read_arrow),
+    'forecasts': ArtifactStage(forecast.build_forecasts, 'athlete_forecasts.csv'),
+    'matchups': ArtifactStage(
+        head_to_head.build_matchups, 'matchup_index.npz',
+        save=head_to_head.MatchupIndex.save, load=head_to_head.MatchupIndex.load
+    ),
+    'tier_centroids': ArtifactStage(tiers.build_tier_centroids, 'tier_centroids.csv'),
+    'course_factors': ArtifactStage(courses.build_course_factors, 'course_factors.csv'),
+    'records': ArtifactStage(records.build_records, 'athlete_records.csv', update=records.update_records),
+    'cube': ArtifactStage(cube.build_cube, 'race_cube.csv'),
+    'athlete_rollups': ArtifactStage(cube.build_athlete_rollups, 'athlete_rollups.csv'),
+    'progression': ArtifactStage(
+        progression.build_progression, 'progression_matrix.npz',
+        save=progression.ProgressionMatrix.save, load=progression.ProgressionMatrix.load
+    ),
+    'ratings': ArtifactStage(ratings.build_ratings, 'rating_history.csv', update=ratings.update_ratings),
+    'store': ArtifactStage(store.build_store, store.STORE_FILENAME, save=store.ResultsStore.save, load=store.ResultsStore.load),
+    # A folder: only partitions whose rows changed are rewritten
+    'partitions': ArtifactStage(partitions.build_partitions, partitions.PARTITIONS_DIRNAME,
+                                save=partitions.save_partitions, load=partitions.read_index),
+}
+
+
+def fresh_column_stages(manifest: dict, version: str | None) -> set:
+    """Column stages whose columns in the dataset file were computed from `version` of it"""
+    return {name for name in COLUMN_STAGES if version is not None and manifest.get(name) == version}
+
+
+def prepare(df: pd.DataFrame, fresh=()) -> pd.DataFrame:
+    """
+    Add or recompute the columns of every column stage, except the `fresh`
+    ones (see fresh_column_stages) that the dataset already has
+    """
+    for name, stage in COLUMN_STAGES.items():
+        if name not in fresh or not set(stage.columns).issubset(df.columns):
+            df = stage.add(df)
+    return df
+
+
+def read_prepared(path=None) -> tuple[str, pd.DataFrame]:
+    """
+    dataset.read_versioned plus prepare(); a DatasetStore loader
+    Maps the 'dataset' Arrow copy when it was built from the current version,
+    otherwise parses the CSV
+    """
+    path = Path(path or dataset.RESULTS_PATH)
+    version = dataset.dataset_version(path)
+    directory = derived_dir(path)
+    if version is not None and read_manifest(directory).get('dataset') == version:
+        try:
+            df = dataset.read_arrow(directory / DATASET_CACHE_FILENAME)
+        except (FileNotFoundError, ImportError):
+            pass
+        else:
+            if dataset.dataset_version(path) != version:
+                raise RuntimeError(f"{path} changed while it was being read")
+            return version, df
+    version, df = dataset.read_versioned(path)
+    return version, prepare(df, fresh_column_stages(read_manifest(directory), version))
+
+
+def write_manifest(directory: Path, manifest: dict):
+    dataset.atomic_write(directory / dataset.MANIFEST_NAME, lambda f: json.dump(manifest, f, indent=2, sort_keys=True))
+
+
+def load_artifact(name: str, df: pd.DataFrame, version: str, results_path=None, from_disk: bool = True):
+    """
+    Return artifact `name` for dataset `version`: read it from disk when the
+    manifest says it was built from that version, bring a stale one up to date
+    when the stage can update incrementally, otherwise build it from df
+    from_disk=False always builds from df, e.g. when df is a slice of the
+    dataset (see partitions.py) that the artifacts on disk do not describe
+    """
+    stage = ARTIFACT_STAGES[name]
+    if not from_disk:
+        return stage.build(df)
+    directory = derived_dir(results_path)
+    path = directory / stage.filename
+    built_from = read_manifest(directory).get(name)
+    if built_from is not None and path.exists():
+        try:
+            if built_from == version:
+                return stage.load(path)
+            if stage.update is not None:
+                return stage.update(stage.load(path), df)
+        except KeyError:
+            # Written before the stage stored a field it now reads: rebuild
+            pass
+    return stage.build(df)
+
+
+def run(stages=None, results_path=None, df=None) -> dict:
+    """
+    Run the requested stages (all by default); returns {stage: seconds}
+    df, if given, is a new dataset (e.g. watch.py's merged races) written in
+    place of the file with every column stage recomputed
+    """
+    import time
+
+    results_path = Path(results_path or dataset.RESULTS_PATH)
+    names = list(stages or [*COLUMN_STAGES, *ARTIFACT_STAGES])
+    unknown = [name for name in names if name not in COLUMN_STAGES and name not in ARTIFACT_STAGES]
+    if unknown:
+        raise ValueError(f"Unknown stage(s): {', '.join(unknown)}")
+
+    directory = derived_dir(results_path)
+    manifest = read_manifest(directory)
+    if df is None:
+        version, df = dataset.read_versioned(results_path)
+        fresh = fresh_column_stages(manifest, version)
+    else:
+        version, fresh = None, set()
+    timings = {}
+
+    # Column stages first: they rewrite the dataset, which gives it a new version.
+    # Stale columns of the stages not asked for are recomputed along with them.
+    column_names = [name for name in names if name in COLUMN_STAGES]
+    if column_names or version is None:
+        for name, stage in COLUMN_STAGES.items():
+            if name in column_names or name not in fresh or not set(stage.columns).issubset(df.columns):
+                start = time.perf_counter()
+                df = stage.add(df)
+                if name in column_names:
+                    timings[name] = time.perf_counter() - start
+        dataset.write_results(df, results_path)
+        version = dataset.dataset_version(results_path)
+        manifest.update(dict.fromkeys(COLUMN_STAGES, version))
+    else:
+        df = prepare(df, fresh)
+
+    for name in [name for name in names if name in ARTIFACT_STAGES]:
+        stage = ARTIFACT_STAGES[name]
+        path = directory / stage.filename
+        start = time.perf_counter()
+        if stage.update is not None and name in manifest and path.exists():
+            artifact = stage.update(stage.load(path), df)
+        else:
+            artifact = stage.build(df)
+        stage.save(artifact, path)
+        timings[name] = time.perf_counter() - start
+        manifest[name] = version
+
+    # Manifest last: an artifact is only advertised once its file is in place
+    write_manifest(directory, manifest)
+    return timings
+
+
+def main():
+    stages = sys.argv[1:] or None
+
+    print("=" * 60)
+    print("PRECOMPUTING DERIVED DATA")
+    print("=" * 60)
+
+    timings = run(stages)
+    for name, seconds in timings.items():
+        target = derived_dir() / ARTIFACT_STAGES[name].filename if name in ARTIFACT_STAGES else dataset.RESULTS_PATH
+        print(f"  {name:<20} {seconds * 1000:>8.1f} ms -> {target}")
+
+    print(f"\n✅ {len(timings)} stage(s) built for dataset version {dataset.dataset_version()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""
+Opt-in render-time profiling for the dashboard
+Times named sections of a script run, records cache hits/misses of the cached
+helpers, and appends each run to a JSON-lines log that can be aggregated across
+sessions with: python profiling.py [log_path]
+"""
+import json
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+PROFILE_LOG_PATH = Path('logs/render_profile.jsonl')
+
+# Cached functions only execute their body on a miss, so the body reports the
+# miss here; the profiler reads it back on the same thread after the call.
+_thread_state = threading.local()
+
+
+def note_cache_miss(name: str):
+    """Call from inside a cached function body to mark this call as a miss"""
+    # One set per open cache= section; a miss counts for every enclosing one
+    for misses in getattr(_thread_state, 'cache_misses', ()):
+        misses.add(name)
+
+
+class RenderProfiler:
+    """
+    Collects section timings for one dashboard session
+
+    A full script run starts with start_run() and ends with finish_run().
+    Sections timed after finish_run() belong to a fragment rerun and are
+    logged on their own as soon as the outermost section closes.
+    """
+
+    def __init__(self, enabled: bool = False, log_path=None, session_id: str | None = None):
+        self.enabled = enabled
+        self.log_path = Path(log_path) if log_path else None
+        self.session_id = session_id or uuid.uuid4().hex[:12]
+        self.context = {}
+        self.records = []
+        self.cache_events = []
+        self.finished = False
+        self._depth = 0
+        self._fragment_start = 0
+        self._fragment_cache_start = 0
+
+    def start_run(self, context: dict | None = None):
+        self.context = dict(context or {})
+        self.records = []
+        self.cache_events = []
+        self.finished = False
+        self._depth = 0
+
+    def finish_run(self):
+        self.finished = True
+        if self.enabled and self.log_path:
+            self.write_log(self.records, self.cache_events, run_kind='full')
+        self._fragment_start = len(self.records)
+        self._fragment_cache_start = len(self.cache_events)
+
+    @contextmanager
+    def section(self, name: str, cache: str | None = None):
+        """Time a block; if `cache` is given, record whether that cached helper hit"""
+        if not self.enabled:
+            yield
+            return
+
+        if cache is not None:
+            if not hasattr(_thread_state, 'cache_misses'):
+                _thread_state.cache_misses = []
+            _thread_state.cache_misses.append(set())
+        # Appended up front so nested sections list after their parent
+        record = {'section': name, 'seconds': 0.0, 'depth': self._depth}
+        self.records.append(record)
+        self._depth += 1
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            record['seconds'] = time.perf_counter() - start
+            self._depth -= 1
+            if cache is not None:
+                hit = cache not in _thread_state.cache_misses.pop()
+                self.cache_events.append({'cache': cache, 'hit': hit})
+            if self.finished and self._depth == 0:
+                self._flush_fragment()
+
+    def _flush_fragment(self):
+        records = self.records[self._fragment_start:]
+        cache_events = self.cache_events[self._fragment_cache_start:]
+        if self.log_path:
+            self.write_log(records, cache_events, run_kind='fragment')
+        self._fragment_start = len(self.records)
+        self._fragment_cache_start = len(self.cache_events)
+
+    def timings_frame(self) -> pd.DataFrame:
+        """Section breakdown of the last full run"""
+        if not self.records:
+            return pd.DataFrame(columns=['Section', 'ms', 'Share'])
+        timings = pd.DataFrame(self.records)
+        total = timings.loc[timings['depth'] == 0, 'seconds'].sum()
+        timings['Section'] = ['  ' * d + s for d, s in zip(timings['depth'], timings['section'])]
+        timings['ms'] = (timings['seconds'] * 1000).round(1)
+        timings['Share'] = (timings['seconds'] / total * 100).round(1).astype(str) + '%' if total else ''
+        return timings[['Section', 'ms', 'Share']]
+
+    def cache_frame(self) -> pd.DataFrame:
+        """Hit/miss counts per cached helper"""
+        if not self.cache_events:
+            return pd.DataFrame(columns=['Cache', 'Hits', 'Misses'])
+        events = pd.DataFrame(self.cache_events)
+        summary = events.groupby('cache')['hit'].agg(Hits='sum', Misses=lambda h: (~h).sum()).reset_index()
+        return summary.rename(columns={'cache': 'Cache'})
+
+    def write_log(self, records: list, cache_events: list, run_kind: str):
+        if not records:
+            return
+        entry = {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'session': self.session_id,
+            'run': run_kind,
+            'context': self.context,
+            'sections': _section_totals_ms(records),
+            'cache': cache_events,
+        }
+        self.log_path.parent.mkdir(parents=True, exist_ok=True)
+        # One short write per run; appends of a single line are not interleaved
+        with open(self.log_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, default=str) + '\n')
+
+
+def _section_totals_ms(records: list) -> dict:
+    """Total milliseconds per section name (a section can run more than once)"""
+    totals = {}
+    for record in records:
+        totals[record['section']] = totals.get(record['section'], 0.0) + record['seconds'] * 1000
+    return {section: round(ms, 2) for section, ms in totals.items()}
+
+
+def summarize_log(log_path=PROFILE_LOG_PATH) -> pd.DataFrame:
+    """Aggregate a profile log into per-section count/p50/p95/max (ms)"""
+    rows = []
+    with open(log_path, encoding='utf-8') as f:
+        for line in f:
+            entry = json.loads(line)
+            for section, ms in entry['sections'].items():
+                rows.append({'run': entry['run'], 'section': section, 'ms': ms})
+    if not rows:
+        return pd.DataFrame()
+    timings = pd.DataFrame(rows)
+    summary = timings.groupby(['run', 'section'])['ms'].agg(
+        count='count',
+        p50=lambda s: s.quantile(0.5),
+        p95=lambda s: s.quantile(0.95),
+        max='max'
+    ).round(1)
+    return summary.sort_values('p95', ascending=False)
+
+
+def main():
+    log_path = Path(sys.argv[1]) if len(sys.argv) > 1 else PROFILE_LOG_PATH
+    if not log_path.exists():
+        print(f"No profile log at {log_path}")
+        return
+
+    summary = summarize_log(log_path)
+    print("=" * 80)
+    print(f"RENDER PROFILE SUMMARY ({log_path})")
+    print("=" * 80)
+    print(summary.to_string())
+
+
+if __name__ == "__main__":
+    main()
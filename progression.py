@@ -0,0 +1,223 @@
+"""
+Cross-season progression matrix
+Every athlete's pace per mile laid out as a dense athletes x (season, meet)
+array with NaN where they did not race, plus the division they ran in each
+slot. An athlete's series is one row slice; cohort curves and year-over-year
+changes are nan-reductions over rows instead of per-athlete groupby/sort.
+"""
+import warnings
+
+import numpy as np
+import pandas as pd
+
+import dataset
+from add_distance_metrics import format_pace
+
+NO_DIVISION = -1
+SERIES_COLUMNS = ['season_year', 'meet_number', 'division', 'pace_per_mi_min', 'pace_per_mi_str',
+                  'adjusted_pace_per_mi_min', 'adjusted_pace_per_mi_str', 'finish_time_s', 'finish_time_str',
+                  'speed_mph', 'place_overall']
+
+
+class ProgressionMatrix:
+    """
+    pace[a, s]: athlete a's pace (min/mi) in slot s, NaN if absent or
+    the race has a place but no time
+    time, place, adjusted[a, s]: finish time (s), overall place and
+    course-adjusted pace of the same race, NaN if absent or unknown
+    time_str[a, s]: the finish time as recorded, '' if absent
+    division[a, s]: index into `divisions`, NO_DIVISION if absent
+    Slots are (season, meet) pairs in chronological order.
+    """
+
+    def __init__(self, athletes, seasons, meets, divisions, pace, division, time, place, adjusted, time_str):
+        self.athletes = np.asarray(athletes, dtype=str)
+        self.seasons = np.asarray(seasons, dtype=np.int64)
+        self.meets = np.asarray(meets, dtype=np.int64)
+        self.divisions = np.asarray(divisions, dtype=str)
+        self.pace = np.asarray(pace, dtype=np.float32)
+        self.division = np.asarray(division, dtype=np.int8)
+        self.time = np.asarray(time, dtype=np.float32)
+        self.place = np.asarray(place, dtype=np.float32)
+        self.adjusted = np.asarray(adjusted, dtype=np.float32)
+        self.time_str = np.asarray(time_str, dtype=str)
+        self._row = {name: i for i, name in enumerate(self.athletes)}
+
+    @classmethod
+    def build(cls, df: pd.DataFrame) -> 'ProgressionMatrix':
+        valid = df.dropna(subset=['athlete_full_name', 'season_year', 'meet_number'])
+        valid = valid.assign(pace_per_mi_min=valid['pace_per_mi_min'].where(valid['pace_per_mi_min'] > 0))
+        # Races with a place but no time still belong in the athlete's series
+        placed = valid['place_overall'].notna() if 'place_overall' in valid.columns else False
+        valid = valid[valid['pace_per_mi_min'].notna() | placed]
+        # One result per athlete per slot: the fastest
+        valid = valid.sort_values('pace_per_mi_min', na_position='last').drop_duplicates(
+            ['athlete_full_name', 'season_year', 'meet_number'])
+
+        athlete_codes, athletes = pd.factorize(valid['athlete_full_name'], sort=True)
+        slots = pd.MultiIndex.from_arrays(
+            [valid['season_year'].astype(int), valid['meet_number'].astype(int)])
+        slot_codes, slot_index = slots.factorize(sort=True)
+        division_codes, divisions = pd.factorize(valid['division'], sort=True)
+
+        pace = np.full((len(athletes), len(slot_index)), np.nan, dtype=np.float32)
+        division = np.full(pace.shape, NO_DIVISION, dtype=np.int8)
+        pace[athlete_codes, slot_codes] = valid['pace_per_mi_min'].to_numpy()
+        division[athlete_codes, slot_codes] = division_codes
+        race = {}
+        for name, column in (('time', 'finish_time_s'), ('place', 'place_overall'), ('adjusted', 'adjusted_pace_per_mi_min')):
+            race[name] = np.full(pace.shape, np.nan, dtype=np.float32)
+            if column in valid.columns:
+                race[name][athlete_codes, slot_codes] = pd.to_numeric(valid[column], errors='coerce').to_numpy()
+        race['time_str'] = np.full(pace.shape, '', dtype=object)
+        if 'finish_time_str' in valid.columns:
+            race['time_str'][athlete_codes, slot_codes] = valid['finish_time_str'].fillna('').astype(str).to_numpy()
+        return cls(athletes, slot_index.get_level_values(0), slot_index.get_level_values(1),
+                   divisions, pace, division, **race)
+
+    def save(self, path):
+        dataset.atomic_write(path, lambda f: np.savez_compressed(
+            f, athletes=self.athletes, seasons=self.seasons, meets=self.meets,
+            divisions=self.divisions, pace=self.pace, division=self.division,
+            time=self.time, place=self.place, adjusted=self.adjusted, time_str=self.time_str
+        ), mode='wb')
+
+    @classmethod
+    def load(cls, path) -> 'ProgressionMatrix':
+        with np.load(path, allow_pickle=False) as data:
+            return cls(data['athletes'], data['seasons'], data['meets'], data['divisions'],
+                       data['pace'], data['division'], data['time'], data['place'], data['adjusted'], data['time_str'])
+
+    def series(self, athlete: str) -> pd.DataFrame:
+        """
+        The athlete's races in chronological order, with the dataset's column
+        names: what the dashboard's progress and placement charts draw
+        """
+        row = self._row.get(athlete)
+        if row is None:
+            return pd.DataFrame(columns=SERIES_COLUMNS)
+        ran = ~np.isnan(self.pace[row]) | ~np.isnan(self.place[row])
+        pace = self.pace[row, ran].astype(float)
+        # Times are recorded to a tenth of a second; round off the float32 storage
+        time = self.time[row, ran].astype(float).round(1)
+        adjusted = pd.Series(self.adjusted[row, ran].astype(float))
+        return pd.DataFrame({
+            'season_year': self.seasons[ran],
+            'meet_number': self.meets[ran],
+            'division': self.divisions[self.division[row, ran]],
+            'pace_per_mi_min': pace,
+            'pace_per_mi_str': [format_pace(p) for p in pace],
+            'adjusted_pace_per_mi_min': adjusted,
+            'adjusted_pace_per_mi_str': adjusted.apply(format_pace),
+            'finish_time_s': time,
+            'finish_time_str': [text or None for text in self.time_str[row, ran]],
+            'speed_mph': 60 / pace,
+            'place_overall': self.place[row, ran].astype(float),
+        }, columns=SERIES_COLUMNS)
+
+    def season_bests(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        (season years, best pace [athletes x seasons], division of the season's
+        last race [athletes x seasons], NaN / NO_DIVISION where absent)
+        """
+        years, slot_season = np.unique(self.seasons, return_inverse=True)
+        best = np.full((len(self.athletes), len(years)), np.nan, dtype=np.float32)
+        last_division = np.full(best.shape, NO_DIVISION, dtype=np.int8)
+        for y in range(len(years)):
+            in_season = slot_season == y
+            with np.errstate(all='ignore'):
+                best[:, y] = np.fmin.reduce(self.pace[:, in_season], axis=1)
+            # Slots are chronological, so the last raced slot wins
+            for s in np.flatnonzero(in_season):
+                ran = self.division[:, s] != NO_DIVISION
+                last_division[ran, y] = self.division[ran, s]
+        return years, best, last_division
+
+    def year_over_year(self) -> pd.DataFrame:
+        """
+        One row per athlete and pair of consecutive seasons raced: season bests,
+        change in sec/mi (negative = faster) and the division move (e.g. Frosh -> JV)
+        """
+        years, best, division = self.season_bests()
+        if len(years) < 2:
+            return pd.DataFrame()
+        rows, cols = np.nonzero(~np.isnan(best[:, :-1]) & ~np.isnan(best[:, 1:]))
+        return pd.DataFrame({
+            'athlete_full_name': self.athletes[rows],
+            'from_season': years[cols],
+            'to_season': years[cols + 1],
+            'from_division': self.divisions[division[rows, cols]],
+            'to_division': self.divisions[division[rows, cols + 1]],
+            'from_best_pace': best[rows, cols].astype(float),
+            'to_best_pace': best[rows, cols + 1].astype(float),
+            'delta_sec_per_mi': ((best[rows, cols + 1] - best[rows, cols]) * 60).astype(float).round(1),
+        })
+
+    def transition_summary(self) -> pd.DataFrame:
+        """Median year-over-year change per division move across all athletes"""
+        yoy = self.year_over_year()
+        if yoy.empty:
+            return yoy
+        yoy['transition'] = yoy['from_division'] + ' → ' + yoy['to_division']
+        return yoy.groupby('transition')['delta_sec_per_mi'].agg(
+            athletes='size', median_change='median', mean_change='mean'
+        ).round(1).reset_index().sort_values('athletes', ascending=False)
+
+    def cohorts(self) -> pd.Series:
+        """Cohort label per athlete with a timed race: first season and the division they started in"""
+        ran = ~np.isnan(self.pace)
+        rows = np.flatnonzero(ran.any(axis=1))
+        first = ran[rows].argmax(axis=1)
+        labels = (self.seasons[first].astype(str) + ' ' + self.divisions[self.division[rows, first]])
+        return pd.Series(labels, index=self.athletes[rows])
+
+    def cohort_curve(self, athletes) -> pd.DataFrame:
+        """Median and count of pace per (season, meet) slot for a group of athletes"""
+        rows = [self._row[name] for name in athletes if name in self._row]
+        block = self.pace[rows]
+        with warnings.catch_warnings():
+            # Slots no one in the group ran are NaN (and dropped below)
+            warnings.simplefilter('ignore', RuntimeWarning)
+            median = np.nanmedian(block, axis=0) if len(rows) else np.full(len(self.seasons), np.nan)
+        counts = (~np.isnan(block)).sum(axis=0)
+        curve = pd.DataFrame({
+            'season_year': self.seasons,
+            'meet_number': self.meets,
+            'median_pace': median.astype(float),
+            'athletes': counts,
+        })
+        return curve[curve['athletes'] > 0].reset_index(drop=True)
+
+
+def build_progression(df: pd.DataFrame) -> ProgressionMatrix:
+    return ProgressionMatrix.build(df)
+
+
+def main():
+    import time
+
+    df = dataset.read_results()
+    start = time.perf_counter()
+    matrix = build_progression(df)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    print("=" * 80)
+    print("CROSS-SEASON PROGRESSION MATRIX")
+    print("=" * 80)
+    filled = (~np.isnan(matrix.pace)).mean() * 100
+    print(f"\n{len(matrix.athletes):,} athletes x {len(matrix.seasons)} (season, meet) slots, "
+          f"{filled:.0f}% filled, {matrix.pace.nbytes / 1024:.0f} KB (built in {build_ms:.0f} ms)")
+
+    print("\nYear-over-year change in season-best pace by division move (sec/mi, negative = faster):")
+    print(matrix.transition_summary().to_string(index=False))
+
+    cohorts = matrix.cohorts()
+    largest = cohorts.value_counts().index[0]
+    print(f"\nCohort curve: {largest} ({(cohorts == largest).sum()} athletes)")
+    curve = matrix.cohort_curve(cohorts.index[cohorts == largest])
+    for row in curve.itertuples():
+        print(f"  {row.season_year} meet {row.meet_number}: {format_pace(row.median_pace)}/mi ({row.athletes} athletes)")
+
+
+if __name__ == "__main__":
+    main()
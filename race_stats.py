@@ -0,0 +1,63 @@
+"""
+Within-race standing columns
+Places only compare inside one race (a 14-runner 2nd Grade race vs. a
+100-runner Frosh race), so each result also gets its field size, finish
+percentile and pace z-score within its race, computed with grouped
+transforms in one pass over the dataset
+"""
+import numpy as np
+import pandas as pd
+
+import dataset
+
+RACE_KEYS = ['season_year', 'meet_number', 'division', 'gender']
+RACE_STAT_COLUMNS = ('field_size', 'finish_percentile', 'pace_z')
+
+
+def add_race_stat_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    field_size: finishers in the race
+    finish_percentile: 100 for the winner down to 0 for last place
+    pace_z: pace_per_mi_min in standard deviations from the race mean (negative = faster)
+    """
+    df = df.drop(columns=list(RACE_STAT_COLUMNS), errors='ignore')
+    race = df.groupby(RACE_KEYS, dropna=False, sort=False)
+
+    # Position in the race: recorded place, or finish-time rank where places are missing
+    time_rank = race['finish_time_s'].rank(method='min')
+    position = df['place_overall'].fillna(time_rank)
+    field_size = position.notna().groupby([df[key] for key in RACE_KEYS], dropna=False, sort=False).transform('sum')
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        percentile = np.where(field_size > 1, (field_size - position) / (field_size - 1) * 100, 100.0)
+    df['field_size'] = field_size.astype(int)
+    df['finish_percentile'] = np.where(position.notna(), np.round(percentile, 1), np.nan)
+
+    pace = df['pace_per_mi_min'].where(df['pace_per_mi_min'] > 0)
+    pace_groups = pace.groupby([df[key] for key in RACE_KEYS], dropna=False, sort=False)
+    df['pace_z'] = ((pace - pace_groups.transform('mean')) / pace_groups.transform('std')).round(3)
+    return df
+
+
+def main():
+    import time
+
+    df = dataset.read_results()
+    start = time.perf_counter()
+    df = add_race_stat_columns(df)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    print("=" * 80)
+    print("RACE STANDING COLUMNS")
+    print("=" * 80)
+    print(f"\nComputed for {len(df):,} results in {elapsed_ms:.0f} ms")
+    print(f"Field sizes: {df['field_size'].min()}-{df['field_size'].max()}")
+
+    top = df.sort_values(['finish_percentile', 'pace_z'], ascending=[False, True]).head(10)
+    print("\nBest finishes across all races (percentile, then pace z-score):")
+    print(top[['athlete_full_name', 'division', 'season_year', 'meet_number', 'place_overall',
+               'field_size', 'finish_percentile', 'pace_z']].to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
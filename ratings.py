@@ -0,0 +1,194 @@
+"""
+Performance ratings (multi-runner Elo)
+Every race is treated as all pairwise matchups between its finishers: each
+runner's rating moves by how many rivals they beat compared with how many
+their rating said they should. A race is one vectorized n x n update, and
+races are replayed in meet order.
+
+The rating history (one row per rated result) is the persisted state: the
+current rating of every athlete is their last row, so a new meet is applied
+on top of it without replaying earlier meets. The history also records who
+finished where in every rated race, so a meet whose results were since
+corrected is found by comparing per-meet hashes, and replayed from there.
+"""
+import numpy as np
+import pandas as pd
+
+import dataset
+
+RACE_KEYS = ['season_year', 'meet_number', 'division', 'gender']
+INITIAL_RATING = 1500.0
+SCALE = 400.0
+K_FACTOR = 32.0
+# New athletes move faster until their rating has settled
+PROVISIONAL_RACES = 3
+PROVISIONAL_K_FACTOR = 64.0
+
+HISTORY_COLUMNS = RACE_KEYS + ['athlete_full_name', 'team_name', 'position', 'field', 'rating_before', 'rating']
+# What a replay reads from the results: history rows carry the same columns
+REPLAY_COLUMNS = RACE_KEYS + ['athlete_full_name', 'team_name', 'position']
+
+
+def _rateable_results(df: pd.DataFrame) -> pd.DataFrame:
+    """Finishers in finish order (place, then time) with their position in the race"""
+    results = df.dropna(subset=['athlete_full_name'] + RACE_KEYS)
+    results = results[results['finish_time_s'].notna() | results['place_overall'].notna()]
+    results = results.sort_values(RACE_KEYS + ['place_overall', 'finish_time_s'], kind='stable')
+    # An athlete listed twice in a race keeps the better finish
+    results = results.drop_duplicates(['athlete_full_name'] + RACE_KEYS, keep='first')
+    results = results[RACE_KEYS + ['athlete_full_name', 'team_name']].reset_index(drop=True)
+    results['position'] = results.groupby(RACE_KEYS, sort=False).cumcount() + 1
+    return results
+
+
+def race_update(ratings: np.ndarray, positions: np.ndarray, k: np.ndarray) -> np.ndarray:
+    """
+    Rating changes for one race
+    Actual score against each rival is 1 (finished ahead), 0.5 (tie) or 0;
+    expected score is the Elo win probability. The sum over rivals is
+    scaled by k / (n - 1), so a race moves a rating by at most k.
+    """
+    n = len(ratings)
+    if n < 2:
+        return np.zeros(n)
+    expected = 1.0 / (1.0 + 10.0 ** ((ratings[None, :] - ratings[:, None]) / SCALE))
+    actual = (positions[:, None] < positions[None, :]) + 0.5 * (positions[:, None] == positions[None, :])
+    # The diagonal is 0.5 in both and cancels out
+    return k / (n - 1) * (actual - expected).sum(axis=1)
+
+
+def _replay(results: pd.DataFrame, current: dict, races_run: dict) -> pd.DataFrame:
+    """Apply races in order to the current ratings/race counts (updated in place); returns history rows"""
+    athletes = results['athlete_full_name'].to_numpy()
+    before = np.empty(len(results))
+    after = np.empty(len(results))
+    field = np.empty(len(results), dtype=np.int64)
+
+    race_codes = pd.MultiIndex.from_frame(results[RACE_KEYS]).factorize()[0]
+    bounds = np.flatnonzero(np.diff(race_codes)) + 1
+    for rows in np.split(np.arange(len(results)), bounds):
+        names = athletes[rows]
+        ratings = np.array([current.get(name, INITIAL_RATING) for name in names])
+        k = np.array([PROVISIONAL_K_FACTOR if races_run.get(name, 0) < PROVISIONAL_RACES else K_FACTOR
+                      for name in names])
+        # Ratings are kept to 0.1 so a replay from the saved history continues exactly
+        new = np.round(ratings + race_update(ratings, results['position'].to_numpy()[rows], k), 1)
+        before[rows], after[rows], field[rows] = ratings, new, len(rows)
+        for name, rating in zip(names, new):
+            current[name] = rating
+            races_run[name] = races_run.get(name, 0) + 1
+
+    history = results.copy()
+    history['field'] = field
+    history['rating_before'] = before
+    history['rating'] = after
+    return history[HISTORY_COLUMNS]
+
+
+def _meet_order(table: pd.DataFrame) -> pd.Series:
+    """Sortable (season, meet) key"""
+    return table['season_year'] * 1000 + table['meet_number']
+
+
+def meet_digests(table: pd.DataFrame) -> pd.Series:
+    """
+    Content hash of the replay input of each meet, indexed by _meet_order
+    (independent of row order; results and history rows hash alike)
+    """
+    rows = table[REPLAY_COLUMNS].astype({'season_year': float, 'meet_number': float, 'position': float})
+    hashes = pd.util.hash_pandas_object(rows, index=False).to_numpy() >> np.uint64(16)
+    return pd.Series(hashes.astype(np.int64)).groupby(_meet_order(table).to_numpy()).sum()
+
+
+def build_ratings(df: pd.DataFrame) -> pd.DataFrame:
+    """Rating history for every result, replaying all races from the initial rating"""
+    return _replay(_rateable_results(df), {}, {})
+
+
+def update_ratings(history: pd.DataFrame, df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Bring a rating history up to date with df by replaying only the meets
+    from the first one whose results differ from what was rated
+
+    Usually that is the first new meet. Ratings depend on race order, so a
+    rated meet that changed (results added, removed or corrected, or a meet
+    inserted before the latest one) is replayed along with every meet after it.
+    """
+    results = _rateable_results(df)
+    if history.empty:
+        return _replay(results, {}, {})
+
+    rated, current = meet_digests(history), meet_digests(results)
+    slots = rated.index.union(current.index)
+    changed = slots[rated.reindex(slots).ne(current.reindex(slots)).to_numpy()]
+    if changed.empty:
+        return history
+
+    kept = history[(_meet_order(history) < changed[0]).to_numpy()]
+    ratings = kept.groupby('athlete_full_name', sort=False)['rating'].last().to_dict()
+    races_run = kept.groupby('athlete_full_name', sort=False).size().to_dict()
+    replayed = _replay(results[(_meet_order(results) >= changed[0]).to_numpy()].reset_index(drop=True), ratings, races_run)
+    return pd.concat([kept, replayed], ignore_index=True)
+
+
+def current_ratings(history: pd.DataFrame, season=None) -> pd.DataFrame:
+    """
+    One row per athlete: rating after their last race (up to the end of
+    `season` if given), races rated, peak rating and the division/gender/team
+    of that last race
+    """
+    if season is not None:
+        history = history[history['season_year'] <= season]
+    grouped = history.groupby('athlete_full_name', sort=False)
+    table = grouped.agg(
+        team_name=('team_name', 'last'),
+        season_year=('season_year', 'last'),
+        division=('division', 'last'),
+        gender=('gender', 'last'),
+        rating=('rating', 'last'),
+        peak_rating=('rating', 'max'),
+        races=('rating', 'size'),
+    ).reset_index()
+    return table.sort_values('rating', ascending=False, kind='stable').reset_index(drop=True)
+
+
+def add_rating_column(df: pd.DataFrame, history: pd.DataFrame) -> pd.DataFrame:
+    """Label result rows with the athlete's rating after that race"""
+    df = df.drop(columns=['rating'], errors='ignore')
+    return df.merge(history[RACE_KEYS + ['athlete_full_name', 'rating']],
+                    on=RACE_KEYS + ['athlete_full_name'], how='left')
+
+
+def main():
+    import time
+
+    df = dataset.read_results()
+    start = time.perf_counter()
+    history = build_ratings(df)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    # Simulate ingesting the latest meet on top of a history built without it
+    latest_season = df['season_year'].max()
+    latest_meet = df.loc[df['season_year'] == latest_season, 'meet_number'].max()
+    earlier = df[~((df['season_year'] == latest_season) & (df['meet_number'] == latest_meet))]
+    previous = build_ratings(earlier)
+    start = time.perf_counter()
+    updated = update_ratings(previous, df)
+    update_ms = (time.perf_counter() - start) * 1000
+
+    print("=" * 80)
+    print("PERFORMANCE RATINGS")
+    print("=" * 80)
+    print(f"\n{len(history):,} rated results in {history.groupby(RACE_KEYS).ngroups} races, "
+          f"replayed in {build_ms:.0f} ms")
+    print(f"Incremental update for {int(latest_season)} meet {int(latest_meet)}: {update_ms:.0f} ms, "
+          f"matches full replay: {updated.equals(history)}")
+
+    table = current_ratings(history)
+    for (division, gender), group in table.groupby(['division', 'gender']):
+        print(f"\nTop 5 - {division} {gender}:")
+        print(group.head(5)[['athlete_full_name', 'team_name', 'rating', 'peak_rating', 'races']].to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
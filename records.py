@@ -0,0 +1,167 @@
+"""
+Personal records and season bests
+One row per athlete, season and division: race count, season best, PR (best
+time at that division's distance up to and including that season), first and
+latest pace, best place and grade. Built once at ingest and then updated
+incrementally as later meets are added, so the dashboard looks values up
+instead of scanning raw results.
+
+Each row carries a digest of the result rows it was built from, so an
+update can tell results edited in place (names corrected, teams renamed,
+times fixed) from a season that only grew.
+"""
+import numpy as np
+import pandas as pd
+
+import dataset
+
+RECORD_KEYS = ['athlete_full_name', 'season_year', 'division', 'gender']
+# Result columns a record is built from
+SOURCE_COLUMNS = RECORD_KEYS + ['meet_number', 'meet_name', 'team_name', 'grade', 'finish_time_s',
+                                'pace_per_mi_min', 'place_overall']
+
+
+def _valid_results(df: pd.DataFrame) -> pd.DataFrame:
+    return df.dropna(subset=RECORD_KEYS + ['meet_number', 'finish_time_s'])
+
+
+def _row_digests(results: pd.DataFrame) -> np.ndarray:
+    """
+    Content hash of each result row, cut to 48 bits so a group's sum (its
+    results_digest, independent of row order) fits in an int64
+    """
+    columns = [column for column in SOURCE_COLUMNS if column in results.columns]
+    hashes = pd.util.hash_pandas_object(results[columns], index=False).to_numpy()
+    return (hashes >> np.uint64(16)).astype(np.int64)
+
+
+def _aggregate(results: pd.DataFrame) -> pd.DataFrame:
+    """Per-group record columns for a set of result rows (PR not included)"""
+    ordered = results.sort_values(RECORD_KEYS + ['meet_number'], kind='stable')
+    ordered = ordered.assign(results_digest=_row_digests(ordered))
+    grouped = ordered.groupby(RECORD_KEYS, sort=False)
+    best_rows = ordered.loc[grouped['finish_time_s'].idxmin()]
+
+    table = grouped.agg(
+        team_name=('team_name', 'last'),
+        grade=('grade', 'last'),
+        races=('finish_time_s', 'size'),
+        first_meet=('meet_number', 'first'),
+        latest_meet=('meet_number', 'last'),
+        first_pace=('pace_per_mi_min', 'first'),
+        latest_pace=('pace_per_mi_min', 'last'),
+        season_best_time_s=('finish_time_s', 'min'),
+        season_best_pace=('pace_per_mi_min', 'min'),
+        best_place=('place_overall', 'min'),
+        results_digest=('results_digest', 'sum'),
+    ).reset_index()
+    table['season_best_meet'] = best_rows['meet_name'].to_numpy() if 'meet_name' in best_rows.columns else ''
+    return table
+
+
+def _with_prs(table: pd.DataFrame) -> pd.DataFrame:
+    """PR = running best season time per athlete and division, in season order"""
+    table = table.sort_values(RECORD_KEYS, kind='stable').reset_index(drop=True)
+    table['pr_time_s'] = table.groupby(['athlete_full_name', 'division'])['season_best_time_s'].cummin()
+    return table
+
+
+def build_records(df: pd.DataFrame) -> pd.DataFrame:
+    return _with_prs(_aggregate(_valid_results(df)))
+
+
+def update_records(previous: pd.DataFrame, df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Bring a records table up to date with df by folding in only the new rows
+
+    New rows are results from a meet later than the latest one already
+    recorded for that athlete, season and division (how a season grows).
+    If the digests show anything else changed (rows added to earlier meets,
+    removed or edited by the cleanup scripts), the table is rebuilt from scratch.
+    """
+    if 'results_digest' not in previous.columns:
+        return build_records(df)
+    results = _valid_results(df)
+    # Only the latest recorded season (or newer ones) can gain rows
+    since = previous['season_year'].max() if len(previous) else -np.inf
+    known = results.merge(previous[RECORD_KEYS + ['latest_meet']], on=RECORD_KEYS, how='left')
+    is_new = ((known['season_year'] >= since)
+              & (known['latest_meet'].isna() | (known['meet_number'] > known['latest_meet']))).to_numpy()
+
+    # Everything else must be exactly the rows each record was built from
+    recorded = results[~is_new]
+    digests = pd.Series(_row_digests(recorded)).groupby(
+        [recorded[key].to_numpy() for key in RECORD_KEYS]).sum()
+    expected = previous.set_index(RECORD_KEYS)['results_digest']
+    if len(digests) != len(expected) or not digests.reindex(expected.index).eq(expected).all():
+        return build_records(df)
+    if not is_new.any():
+        return previous
+
+    added = _aggregate(results[is_new])
+    key_index = pd.MultiIndex.from_frame(previous[RECORD_KEYS])
+    touched = (previous['season_year'] >= since).to_numpy() & key_index.isin(
+        pd.MultiIndex.from_frame(added[RECORD_KEYS]))
+    old = previous[touched].drop(columns='pr_time_s')
+
+    # Old part covers earlier meets, new part later ones
+    combined = pd.concat([old, added], ignore_index=True).sort_values('first_meet', kind='stable')
+    grouped = combined.groupby(RECORD_KEYS, sort=False)
+    best = combined.loc[grouped['season_best_time_s'].idxmin(), RECORD_KEYS + ['season_best_meet']]
+    merged = grouped.agg(
+        team_name=('team_name', 'last'),
+        grade=('grade', 'last'),
+        races=('races', 'sum'),
+        first_meet=('first_meet', 'first'),
+        latest_meet=('latest_meet', 'last'),
+        first_pace=('first_pace', 'first'),
+        latest_pace=('latest_pace', 'last'),
+        season_best_time_s=('season_best_time_s', 'min'),
+        season_best_pace=('season_best_pace', 'min'),
+        best_place=('best_place', 'min'),
+        results_digest=('results_digest', 'sum'),
+    ).reset_index().merge(best, on=RECORD_KEYS)
+
+    # PRs run over every season, so the updated rows continue from the best
+    # of all earlier recorded seasons, including untouched ones
+    table = pd.concat([previous[~touched].drop(columns='pr_time_s'), merged], ignore_index=True)
+    return _with_prs(table)[previous.columns]
+
+
+def athlete_records(table: pd.DataFrame, athlete: str, season=None) -> pd.DataFrame:
+    """An athlete's rows, optionally limited to one season"""
+    rows = table[table['athlete_full_name'] == athlete]
+    if season is not None:
+        rows = rows[rows['season_year'] == season]
+    return rows
+
+
+def main():
+    import time
+
+    df = dataset.read_results()
+    start = time.perf_counter()
+    table = build_records(df)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    # Simulate ingesting the latest meet on top of a table built without it
+    latest_season = df['season_year'].max()
+    latest_meet = df.loc[df['season_year'] == latest_season, 'meet_number'].max()
+    earlier = df[~((df['season_year'] == latest_season) & (df['meet_number'] == latest_meet))]
+    previous = build_records(earlier)
+    start = time.perf_counter()
+    updated = update_records(previous, df)
+    update_ms = (time.perf_counter() - start) * 1000
+
+    print("=" * 80)
+    print("PERSONAL RECORDS AND SEASON BESTS")
+    print("=" * 80)
+    print(f"\n{len(table):,} athlete-season-division rows built in {build_ms:.0f} ms")
+    print(f"Incremental update for {int(latest_season)} meet {int(latest_meet)}: {update_ms:.0f} ms, "
+          f"matches full build: {updated.reset_index(drop=True).equals(table)}")
+    print(f"PRs set in {int(latest_season)}: "
+          f"{int((np.isclose(table['pr_time_s'], table['season_best_time_s']) & (table['season_year'] == latest_season)).sum())}")
+
+
+if __name__ == "__main__":
+    main()
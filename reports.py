@@ -0,0 +1,453 @@
+"""
+Static HTML reports: a printable season report per team and an archived page per athlete
+Both are drawn with the dashboard's charts and tables (figures.py):
+
+    reports/index.html
+    reports/teams/2025/<team>.html     team scores, Saint Sebastian standings, roster
+    reports/athletes/<athlete>.html    time / pace / speed / placement progress, race results
+    reports/plotly.min.js              shared by every page, so the reports open offline
+
+Reports are rendered in parallel worker processes. The dataset and the
+precomputed records and rating tables are loaded once (memory-mapped from the
+precompute Arrow files when fresh), team scores and standings are computed once,
+and the workers inherit all of it instead of loading their own copy.
+
+The rows that go into each report are hashed; a report whose inputs (and
+REPORT_FORMAT) are the same as when it was last written is skipped, so after a
+meet only the teams and athletes that raced are rendered again.
+
+Usage:
+    python reports.py                    # every team (latest season) and athlete
+    python reports.py --season 2024 --teams
+    python reports.py --all-seasons --workers 4
+    python reports.py --force            # render everything again
+"""
+import argparse
+import hashlib
+import html
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+import dataset
+import figures
+import precompute
+import ratings
+import records
+import standings
+import team_scoring
+from add_distance_metrics import format_pace
+
+REPORTS_DIR = Path("reports")
+MANIFEST_NAME = 'manifest.json'
+PLOTLY_JS_NAME = 'plotly.min.js'
+# Bump when the page layout changes, so every report is written again
+REPORT_FORMAT = 3
+ROSTER_COLUMNS = {
+    'athlete_full_name': 'Athlete', 'division': 'Division', 'gender': 'Gender', 'grade': 'Grade',
+    'races': 'Races', 'season_best_str': 'Season Best', 'season_best_pace_str': 'Best Pace',
+    'best_place': 'Best Place',
+}
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<script src="{plotly_js}"></script>
+<style>
+body {{ font-family: -apple-system, "Segoe UI", Roboto, sans-serif; margin: 2rem auto; max-width: 1100px; color: #262730; }}
+h1 {{ margin-bottom: 0.2rem; }}
+.caption {{ color: #6c757d; font-size: 0.9rem; }}
+.metrics {{ display: flex; gap: 2.5rem; margin: 1rem 0; }}
+.metric .label {{ color: #6c757d; font-size: 0.85rem; }}
+.metric .value {{ font-size: 1.6rem; }}
+.charts {{ display: grid; grid-template-columns: repeat(3, 1fr); gap: 1rem; }}
+table {{ border-collapse: collapse; width: 100%; font-size: 0.9rem; margin-bottom: 1rem; }}
+th, td {{ border-bottom: 1px solid #e6e6e6; padding: 0.3rem 0.5rem; text-align: left; }}
+th {{ background: #f0f2f6; }}
+a {{ color: #1f77b4; }}
+@media print {{ .charts {{ grid-template-columns: 1fr; }} section {{ break-inside: avoid; }} }}
+</style>
+</head>
+<body>
+{body}
+<p class="caption">Generated {generated} from dataset version {version}</p>
+</body>
+</html>
+"""
+
+
+@dataclass
+class ReportInputs:
+    version: str
+    df: pd.DataFrame
+    records: pd.DataFrame
+    rating_history: pd.DataFrame
+    team_scores: pd.DataFrame
+    standings: dict
+
+
+def load_inputs(results_path=None, seasons=None) -> ReportInputs:
+    """
+    The dataset, its precomputed tables, team scores and the standings of the
+    team report seasons (a list, 'all', or None for the latest season)
+    """
+    results_path = results_path or dataset.RESULTS_PATH
+    version, df = precompute.read_prepared(results_path)
+    if seasons is None:
+        seasons = [df['season_year'].max()]
+    elif isinstance(seasons, str) and seasons == 'all':
+        seasons = df['season_year'].dropna().unique()
+    seasons = sorted(int(season) for season in seasons)
+    return ReportInputs(
+        version=version,
+        df=df,
+        records=precompute.load_artifact('records', df, version, results_path),
+        rating_history=precompute.load_artifact('ratings', df, version, results_path),
+        team_scores=team_scoring.team_scores(df),
+        standings={season: standings.saint_sebastian_standings(df, season) for season in seasons},
+    )
+
+
+def slug(name: str) -> str:
+    return re.sub(r'[^a-z0-9]+', '-', str(name).lower()).strip('-') or 'unnamed'
+
+
+def _unique_slugs(names) -> dict:
+    """{name: file stem}; names that slug alike get -2, -3, ... in sorted order"""
+    stems, used = {}, set()
+    for name in sorted(names):
+        stem, n = slug(name), 1
+        while stem in used:
+            n += 1
+            stem = f"{slug(name)}-{n}"
+        used.add(stem)
+        stems[name] = stem
+    return stems
+
+
+def athlete_path(stem: str) -> str:
+    return f"athletes/{stem}.html"
+
+
+def team_path(stem: str, season: int) -> str:
+    return f"teams/{season}/{stem}.html"
+
+
+def _row_digests(frame: pd.DataFrame, by: str) -> dict:
+    """{value of `by`: hash of its rows}; one vectorised hash pass over the frame"""
+    hashes = pd.util.hash_pandas_object(frame, index=False)
+    return {
+        key: hashlib.blake2b(group.to_numpy().tobytes(), digest_size=16).hexdigest()
+        for key, group in hashes.groupby(frame[by].to_numpy(), sort=False)
+    }
+
+
+def _digest(*parts) -> str:
+    return hashlib.blake2b(json.dumps([REPORT_FORMAT, *parts]).encode('utf-8'), digest_size=16).hexdigest()
+
+
+def _table(frame: pd.DataFrame) -> str:
+    return frame.to_html(index=False, na_rep='', border=0, escape=True)
+
+
+def _figure(fig) -> str:
+    return fig.to_html(full_html=False, include_plotlyjs=False, config={'displayModeBar': False})
+
+
+def _metrics(items: list[tuple[str, str]]) -> str:
+    cells = ''.join(
+        f'<div class="metric"><div class="label">{html.escape(label)}</div>'
+        f'<div class="value">{html.escape(str(value))}</div></div>'
+        for label, value in items
+    )
+    return f'<div class="metrics">{cells}</div>'
+
+
+def _page(title: str, body: str, relative: str, version: str) -> str:
+    return PAGE_TEMPLATE.format(
+        title=html.escape(title),
+        plotly_js=os.path.relpath(PLOTLY_JS_NAME, os.path.dirname(relative) or '.'),
+        body=body,
+        generated=datetime.now().strftime('%Y-%m-%d %H:%M'),
+        version=version,
+    )
+
+
+def render_athlete(inputs: ReportInputs, name: str, relative: str) -> str:
+    """Career page for one athlete, as the dashboard's athlete view with all seasons selected"""
+    df = inputs.df
+    athlete_data = df[df['athlete_full_name'] == name].sort_values(['season_year', 'meet_number'])
+    athlete_records = records.athlete_records(inputs.records, name)
+    multi_season = figures.has_multi_season(athlete_data)
+
+    items = [("Team", athlete_data.iloc[-1]['team_name'])]
+    if multi_season:
+        seasons = athlete_data['season_year'].dropna().unique()
+        items.append(("Seasons", f"{len(seasons)} ({int(min(seasons))}-{int(max(seasons))})"))
+    else:
+        items.append(("Grade", athlete_records['grade'].iloc[-1] if len(athlete_records) else athlete_data.iloc[0]['grade']))
+    best_time = athlete_records['season_best_time_s'].min() if len(athlete_records) else athlete_data['finish_time_s'].min()
+    if pd.notna(best_time):
+        items.append(("Career Best" if multi_season else "Best Time", f"{best_time//60:.0f}:{best_time%60:05.2f}"))
+    best_place = athlete_records['best_place'].min() if len(athlete_records) else athlete_data['place_overall'].min()
+    if pd.notna(best_place):
+        items.append(("Best Place", f"#{int(best_place)}"))
+
+    x_data, x_title = figures.race_axis(athlete_data, multi_season)
+    charts = ''.join(
+        f'<div><p class="caption">{html.escape(chart["caption"])}</p>'
+        f'{_figure(figures.progress_figure(athlete_data, x_data, x_title, column))}</div>'
+        for column, chart in figures.PROGRESS_CHARTS.items()
+    )
+    history = inputs.rating_history
+    results = ratings.add_rating_column(athlete_data, history[history['athlete_full_name'] == name])
+
+    body = (
+        f"<h1>{html.escape(name)}</h1>"
+        f"{_metrics(items)}"
+        f"<section><h2>Time Progress</h2><div class=\"charts\">{charts}</div></section>"
+        f"<section><h2>Placement Progress</h2>{_figure(figures.placement_figure(athlete_data, x_data, x_title))}</section>"
+        f"<section><h2>Race Results</h2>{_table(figures.athlete_results_table(results, multi_season))}</section>"
+    )
+    return _page(f"{name} - Cross Country", body, relative, inputs.version)
+
+
+def render_team(inputs: ReportInputs, team: str, season: int, relative: str, athlete_stems: dict) -> str:
+    """Season report for one team: scores by race, Saint Sebastian standings and roster"""
+    season_scores = inputs.team_scores[inputs.team_scores['Season'] == season]
+    scores = season_scores[season_scores['Team'] == team]
+    body = [f"<h1>{html.escape(team)}</h1><p class=\"caption\">{season} Season Report</p>"]
+
+    body.append("<section><h2>Team Scores by Race</h2>")
+    if scores.empty:
+        body.append("<p>Not enough runners for a team score in any race (teams need 5+ runners).</p>")
+    else:
+        body.append(_table(figures.team_scores_table(scores)))
+    body.append("</section>")
+    if not season_scores.empty:
+        body.append(f"<section><h2>Top Team Performances</h2>{_figure(figures.top_team_scores_figure(season_scores))}</section>")
+
+    saint_standings, saint_categories, _, meets_completed = inputs.standings[season]
+    body.append("<section><h2>Saint Sebastian Award Tracker</h2>")
+    body.append(f'<p class="caption">Lowest cumulative race time after {meets_completed} completed '
+                f'meet{"s" if meets_completed != 1 else ""}. Athletes must finish all '
+                f'{standings.SAINT_SEBASTIAN_REQUIRED_MEETS} meets.</p>')
+    team_standings = saint_standings[saint_standings['team_name'] == team] if not saint_standings.empty else saint_standings
+    if team_standings.empty:
+        body.append("<p>No athletes from this team have results for every completed meet.</p>")
+    for category in saint_categories:
+        category_df = team_standings[(team_standings['division'] == category['division']) &
+                                     (team_standings['gender'] == category['gender'])]
+        if not category_df.empty:
+            body.append(f"<h3>{html.escape(category['category'])}</h3>{_table(figures.standings_table(category_df))}")
+    body.append("</section>")
+
+    roster = inputs.records[(inputs.records['team_name'] == team) & (inputs.records['season_year'] == season)]
+    roster = roster.sort_values(['division', 'gender', 'season_best_time_s']).assign(
+        season_best_str=lambda r: r['season_best_time_s'].map(
+            lambda s: f"{s//60:.0f}:{s%60:05.2f}" if pd.notna(s) else ''),
+        season_best_pace_str=lambda r: r['season_best_pace'].apply(format_pace),
+    )
+    roster = roster[list(ROSTER_COLUMNS)].rename(columns=ROSTER_COLUMNS)
+    links = os.path.relpath('athletes', os.path.dirname(relative))
+    roster['Athlete'] = [
+        f'<a href="{links}/{athlete_stems[name]}.html">{html.escape(name)}</a>' if name in athlete_stems else html.escape(name)
+        for name in roster['Athlete']
+    ]
+    body.append(f"<section><h2>Roster</h2>{roster.to_html(index=False, na_rep='', border=0, escape=False)}</section>")
+    return _page(f"{team} - {season} Season Report", ''.join(body), relative, inputs.version)
+
+
+def plan_reports(inputs: ReportInputs, teams: bool = True, athletes: bool = True) -> list[dict]:
+    """
+    Every report to write: {'kind', 'key', 'path', 'digest'}; the digest covers
+    the rows the report is drawn from
+    """
+    df, jobs = inputs.df, []
+    athlete_stems = _unique_slugs(df['athlete_full_name'].dropna().unique())
+    if athletes:
+        results = _row_digests(df.dropna(subset=['athlete_full_name']), 'athlete_full_name')
+        history = _row_digests(inputs.rating_history, 'athlete_full_name')
+        rows = _row_digests(inputs.records, 'athlete_full_name')
+        for name, stem in athlete_stems.items():
+            jobs.append({'kind': 'athlete', 'key': name, 'path': athlete_path(stem),
+                         'digest': _digest(results.get(name), history.get(name), rows.get(name))})
+    if teams:
+        for season in inputs.standings:
+            season_df = df[df['season_year'] == season].dropna(subset=['team_name'])
+            scores = inputs.team_scores[inputs.team_scores['Season'] == season]
+            saint_standings = inputs.standings[season][0]
+            parts = [
+                _row_digests(season_df, 'team_name'),
+                _row_digests(scores, 'Team'),
+                _row_digests(inputs.records[inputs.records['season_year'] == season].dropna(subset=['team_name']), 'team_name'),
+                _row_digests(saint_standings, 'team_name') if not saint_standings.empty else {},
+            ]
+            # The top team scores chart shows the whole league's season
+            league = _digest(*sorted(parts[1].values()))
+            for team, stem in _unique_slugs(season_df['team_name'].unique()).items():
+                # Roster links depend on the athletes' file names
+                roster_stems = sorted(athlete_stems[name] for name in season_df.loc[
+                    season_df['team_name'] == team, 'athlete_full_name'].dropna().unique())
+                jobs.append({'kind': 'team', 'key': [team, int(season)], 'path': team_path(stem, season),
+                             'digest': _digest(league, [part.get(team) for part in parts], roster_stems)})
+    return jobs
+
+
+# Set in the parent before the pool starts; forked workers inherit it, spawned ones load it
+_INPUTS = None
+_ATHLETE_STEMS = None
+
+
+def _init_worker(results_path, seasons):
+    global _INPUTS, _ATHLETE_STEMS
+    if _INPUTS is None:
+        _INPUTS = load_inputs(results_path, seasons)
+    if _ATHLETE_STEMS is None:
+        _ATHLETE_STEMS = _unique_slugs(_INPUTS.df['athlete_full_name'].dropna().unique())
+
+
+def _render_job(job: dict, output_dir: str) -> tuple[dict, float]:
+    start = time.perf_counter()
+    if job['kind'] == 'athlete':
+        page = render_athlete(_INPUTS, job['key'], job['path'])
+    else:
+        team, season = job['key']
+        page = render_team(_INPUTS, team, season, job['path'], _ATHLETE_STEMS)
+    dataset.atomic_write(Path(output_dir) / job['path'], lambda f: f.write(page))
+    return job, time.perf_counter() - start
+
+
+def _render_chunk(jobs: list[dict], output_dir: str) -> list[tuple[dict, float]]:
+    return [_render_job(job, output_dir) for job in jobs]
+
+
+def read_manifest(output_dir) -> dict:
+    """{report path: its job (kind, key, digest)} for every report written so far"""
+    try:
+        with open(Path(output_dir) / MANIFEST_NAME, encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def write_index(output_dir: Path, jobs: list[dict], version: str):
+    """Links to every report in `jobs` (the manifest's, so reports from earlier partial runs stay listed)"""
+    teams = sorted((job for job in jobs if job['kind'] == 'team'), key=lambda job: (-job['key'][1], job['key'][0]))
+    athletes = sorted((job for job in jobs if job['kind'] == 'athlete'), key=lambda job: job['key'])
+    body = ["<h1>Cross Country Reports</h1>"]
+    for season in dict.fromkeys(job['key'][1] for job in teams):
+        links = ''.join(f'<li><a href="{job["path"]}">{html.escape(job["key"][0])}</a></li>'
+                        for job in teams if job['key'][1] == season)
+        body.append(f"<section><h2>{season} Team Reports</h2><ul>{links}</ul></section>")
+    if athletes:
+        links = ''.join(f'<li><a href="{job["path"]}">{html.escape(job["key"])}</a></li>' for job in athletes)
+        body.append(f"<section><h2>Athletes</h2><ul>{links}</ul></section>")
+    page = _page("Cross Country Reports", ''.join(body), 'index.html', version)
+    dataset.atomic_write(output_dir / 'index.html', lambda f: f.write(page))
+
+
+def generate(output_dir=REPORTS_DIR, results_path=None, seasons=None, teams: bool = True, athletes: bool = True,
+             workers: int | None = None, force: bool = False, chunk_size: int = 8) -> dict:
+    """Render every changed report (seasons as for load_inputs); returns counts and timings"""
+    global _INPUTS, _ATHLETE_STEMS
+    from plotly.offline import get_plotlyjs
+
+    start = time.perf_counter()
+    output_dir = Path(output_dir)
+    _INPUTS = load_inputs(results_path, seasons)
+    _ATHLETE_STEMS = _unique_slugs(_INPUTS.df['athlete_full_name'].dropna().unique())
+    seasons = list(_INPUTS.standings)
+    jobs = plan_reports(_INPUTS, teams, athletes)
+    loaded = time.perf_counter()
+
+    manifest = read_manifest(output_dir)
+    pending = [job for job in jobs if force or manifest.get(job['path'], {}).get('digest') != job['digest']
+               or not (output_dir / job['path']).exists()]
+    if not (output_dir / PLOTLY_JS_NAME).exists():
+        dataset.atomic_write(output_dir / PLOTLY_JS_NAME, lambda f: f.write(get_plotlyjs()))
+
+    workers = max(1, min(workers or os.cpu_count() or 1, -(-len(pending) // chunk_size) or 1))
+    print(f"{len(jobs)} reports, {len(jobs) - len(pending)} unchanged, rendering {len(pending)} "
+          f"with {workers} worker process{'es' if workers != 1 else ''}")
+
+    chunks = [pending[i:i + chunk_size] for i in range(0, len(pending), chunk_size)]
+    done, render_s, next_report = 0, 0.0, 0.1
+
+    def progress(results):
+        nonlocal done, render_s, next_report
+        for job, seconds in results:
+            manifest[job['path']] = job
+            render_s += seconds
+        done += len(results)
+        if done >= next_report * len(pending) or done == len(pending):
+            elapsed = time.perf_counter() - loaded
+            print(f"  [{done:>{len(str(len(pending)))}}/{len(pending)}] {done / len(pending):>4.0%}  "
+                  f"{done / elapsed:>6.1f} reports/s")
+            next_report = done / len(pending) + 0.1
+
+    if workers == 1:
+        for chunk in chunks:
+            progress(_render_chunk(chunk, str(output_dir)))
+    elif chunks:
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(results_path, seasons)) as executor:
+            for results in executor.map(_render_chunk, chunks, [str(output_dir)] * len(chunks)):
+                progress(results)
+
+    # Reports this run covers but no longer plans (e.g. a renamed athlete) are removed;
+    # those outside it (other seasons, or athletes on a --teams run) are kept
+    covered = (['athletes/'] if athletes else []) + ([f"teams/{season}/" for season in seasons] if teams else [])
+    planned = {job['path'] for job in jobs}
+    for path in [path for path in manifest if path.startswith(tuple(covered)) and path not in planned]:
+        (output_dir / path).unlink(missing_ok=True)
+        del manifest[path]
+    write_index(output_dir, list(manifest.values()), _INPUTS.version)
+    dataset.atomic_write(output_dir / MANIFEST_NAME, lambda f: json.dump(manifest, f, indent=2, sort_keys=True))
+    return {
+        'reports': len(jobs),
+        'rendered': len(pending),
+        'skipped': len(jobs) - len(pending),
+        'workers': workers,
+        'load_s': loaded - start,
+        'render_s': render_s,
+        'elapsed_s': time.perf_counter() - start,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write static HTML reports per team and athlete")
+    parser.add_argument('--output', default=str(REPORTS_DIR))
+    parser.add_argument('--season', type=int, action='append', help="team report season (default: latest; repeatable)")
+    parser.add_argument('--all-seasons', action='store_true', help="team reports for every season")
+    parser.add_argument('--teams', action='store_true', help="team reports only")
+    parser.add_argument('--athletes', action='store_true', help="athlete reports only")
+    parser.add_argument('--workers', type=int, help="worker processes (default: CPU count)")
+    parser.add_argument('--force', action='store_true', help="render every report, changed or not")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("STATIC REPORTS")
+    print("=" * 60)
+
+    summary = generate(
+        Path(args.output), seasons='all' if args.all_seasons else args.season,
+        teams=args.teams or not args.athletes, athletes=args.athletes or not args.teams,
+        workers=args.workers, force=args.force,
+    )
+    print(f"\n✅ {summary['rendered']} rendered, {summary['skipped']} unchanged in {summary['elapsed_s']:.1f} s "
+          f"(load {summary['load_s']:.1f} s, render {summary['render_s']:.1f} s of worker time "
+          f"on {summary['workers']} worker{'s' if summary['workers'] != 1 else ''})")
+    print(f"   Open {Path(args.output) / 'index.html'}")
+
+
+if __name__ == "__main__":
+    main()
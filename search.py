@@ -0,0 +1,221 @@
+"""
+Athlete name search: prefix and typo-tolerant matching over a token trie
+Built once per dataset version (the dashboard keeps one per process, shared
+by all sessions); a query returns the best few athletes with their team and
+seasons, so the sidebar no longer needs every name in the league.
+
+Names are split into normalised tokens (lower case, accents and apostrophes
+dropped), so "sie and", "anderson" and "Andersn" all find Sienna Anderson.
+Every query token must match a token of the name, either whole or as a
+prefix (the user may still be typing), allowing for typos: one edit for
+tokens of 3+ letters, two for 6+ (Damerau-Levenshtein: insert, delete,
+substitute, swap two neighbours). Edit distances are computed while walking
+the trie, one row per node, so branches already beyond the limit are
+never visited.
+
+Typos are only looked for when exact and prefix matches leave room in the
+results and no name matched whole, so a name being typed correctly only
+walks the trie along the query. Matches are ranked by edit cost (a prefix match costs
+a little more than the whole word), then by most recent season and races
+run. Recent queries are cached, as a dashboard rerun repeats the last one.
+
+Usage: python search.py [query ...]   # time the index build and some queries
+"""
+import heapq
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import pandas as pd
+
+PREFIX_COST = 0.5
+DEFAULT_LIMIT = 10
+CACHE_ENTRIES = 256
+
+
+def normalize(text) -> list[str]:
+    """Search tokens of a name or query"""
+    text = unicodedata.normalize('NFKD', str(text)).encode('ascii', 'ignore').decode('ascii').lower()
+    return re.findall(r'[a-z0-9]+', re.sub(r"['`.]", '', text))
+
+
+def max_edits(token: str) -> int:
+    return 0 if len(token) < 3 else 1 if len(token) < 6 else 2
+
+
+@dataclass(frozen=True)
+class Match:
+    name: str
+    team: str
+    seasons: str
+    division: str
+    races: int
+    cost: float
+
+    @property
+    def label(self) -> str:
+        context = ', '.join(part for part in (self.team, self.seasons) if part)
+        return f"{self.name} ({context})" if context else self.name
+
+
+def _text(value) -> str:
+    return '' if pd.isna(value) else str(value)
+
+
+class AthleteIndex:
+    """
+    Token trie over every athlete name in a results frame
+    Trie nodes are dicts of child characters; the None key marks the end of
+    a token and holds its id. Postings map token ids to athlete ids.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        results = df.dropna(subset=['athlete_full_name'])
+        order = [column for column in ('season_year', 'meet_number') if column in results.columns]
+        athletes = results.sort_values(order, kind='stable').groupby('athlete_full_name', sort=True).agg(
+            team=('team_name', 'last'),
+            first_season=('season_year', 'min'),
+            last_season=('season_year', 'max'),
+            division=('division', 'last'),
+            races=('athlete_full_name', 'size'),
+        )
+        self.names = athletes.index.tolist()
+        self._teams = [_text(team) for team in athletes['team']]
+        self._seasons = [
+            '' if pd.isna(first) else f"{int(first)}" if first == last else f"{int(first)}-{int(last)}"
+            for first, last in zip(athletes['first_season'], athletes['last_season'])
+        ]
+        self._divisions = [_text(division) for division in athletes['division']]
+        self._races = athletes['races'].tolist()
+        # Ties on cost go to the athlete who raced most recently, then most often
+        self._rank = [
+            (-(0 if pd.isna(season) else season), -races)
+            for season, races in zip(athletes['last_season'], athletes['races'])
+        ]
+
+        self._root = {}
+        self._postings = []
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        for athlete_id, name in enumerate(self.names):
+            for token in set(normalize(name)):
+                self._add(token, athlete_id)
+
+    def __len__(self):
+        return len(self.names)
+
+    def _add(self, token: str, athlete_id: int):
+        node = self._root
+        for char in token:
+            node = node.setdefault(char, {})
+        if None not in node:
+            node[None] = len(self._postings)
+            self._postings.append([])
+        self._postings[node[None]].append(athlete_id)
+
+    def match_token(self, word: str, typos: bool = True) -> dict:
+        """{token id: cost} for index tokens matching `word` whole or as a prefix"""
+        limit = max_edits(word) if typos else 0
+        matches = {}
+        # (node, its char, parent's char, parent's distance row, grandparent's row,
+        #  lowest cost at which an ancestor already matched `word` as a prefix)
+        first_row = list(range(len(word) + 1))
+        stack = [(child, char, None, first_row, None, None) for char, child in self._root.items() if char is not None]
+        while stack:
+            node, char, parent_char, parent_row, grand_row, prefix_cost = stack.pop()
+            row = [parent_row[0] + 1]
+            for i in range(1, len(word) + 1):
+                cost = min(row[i - 1] + 1, parent_row[i] + 1, parent_row[i - 1] + (word[i - 1] != char))
+                if i > 1 and grand_row is not None and word[i - 1] == parent_char and word[i - 2] == char:
+                    cost = min(cost, grand_row[i - 2] + 1)
+                row.append(cost)
+
+            if None in node:
+                costs = [cost for cost in (row[-1] if row[-1] <= limit else None,
+                                           None if prefix_cost is None else prefix_cost + PREFIX_COST)
+                         if cost is not None]
+                if costs:
+                    matches[node[None]] = min(costs)
+            if row[-1] <= limit:
+                prefix_cost = row[-1] if prefix_cost is None else min(prefix_cost, row[-1])
+            # Below a prefix match every token matches; otherwise stop once no alignment is within the limit
+            if prefix_cost is not None or min(row) <= limit:
+                stack.extend((child, next_char, char, row, parent_row, prefix_cost)
+                             for next_char, child in node.items() if next_char is not None)
+        return matches
+
+    def search(self, query: str, limit: int = DEFAULT_LIMIT) -> list[Match]:
+        """Best `limit` athletes whose names match every token of `query`"""
+        words = tuple(normalize(query))
+        if not words:
+            return []
+        key = (words, limit)
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+        matches = self._ranked(words, limit, typos=False)
+        # A name typed in full and correctly needs no typo pass
+        if len(matches) < limit and not (matches and matches[0].cost == 0):
+            matches = self._ranked(words, limit, typos=True)
+        with self._lock:
+            self._cache[key] = matches
+            while len(self._cache) > CACHE_ENTRIES:
+                self._cache.popitem(last=False)
+        return matches
+
+    def _ranked(self, words, limit: int, typos: bool) -> list[Match]:
+        totals = None
+        for word in words:
+            costs = {}
+            for token_id, cost in self.match_token(word, typos).items():
+                for athlete_id in self._postings[token_id]:
+                    if cost < costs.get(athlete_id, float('inf')):
+                        costs[athlete_id] = cost
+            if totals is None:
+                totals = costs
+            else:
+                totals = {athlete_id: total + costs[athlete_id] for athlete_id, total in totals.items() if athlete_id in costs}
+            if not totals:
+                return []
+        best = heapq.nsmallest(limit, totals.items(), key=lambda item: (item[1], self._rank[item[0]], self.names[item[0]]))
+        return [
+            Match(self.names[athlete_id], self._teams[athlete_id], self._seasons[athlete_id],
+                  self._divisions[athlete_id], self._races[athlete_id], cost)
+            for athlete_id, cost in best
+        ]
+
+
+def main():
+    import sys
+    import time
+
+    import dataset
+
+    print("=" * 60)
+    print("ATHLETE SEARCH")
+    print("=" * 60)
+
+    df = dataset.read_results()
+    start = time.perf_counter()
+    index = AthleteIndex(df)
+    build_ms = (time.perf_counter() - start) * 1000
+    print(f"\nIndexed {len(index):,} athletes in {build_ms:.1f} ms")
+
+    sample = index.names[len(index.names) // 2]
+    first, *rest = sample.split()
+    queries = sys.argv[1:] or [first[:3], sample, sample.lower()[:-1], f"{first[:2]} {rest[-1][:3]}" if rest else first,
+                              sample[:2] + sample[3] + sample[2] + sample[4:]]
+    for query in queries:
+        start = time.perf_counter()
+        matches = index.search(query)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        print(f"\n{query!r}: {len(matches)} match{'es' if len(matches) != 1 else ''} in {elapsed_ms:.2f} ms")
+        for match in matches[:5]:
+            print(f"  {match.cost:>4.1f}  {match.label}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,379 @@
+"""
+Content-addressed snapshots of the merged dataset
+Replaces full-file copies (season_results_backup.csv and friends) with a
+history where each version is a list of races, and each race's rows are
+stored once under the hash of their bytes in data/merged/snapshots/:
+
+    objects/ab/ab12....gz   a race's CSV records, gzipped, named by content hash
+    <snapshot id>.json      header, race -> object list and row order
+    log.jsonl               one line per snapshot taken (time, id, message)
+
+A snapshot that differs from the previous one in one race adds one object,
+so keeping history costs space roughly proportional to what changed.
+Records are kept as the exact bytes of the file, so restoring a snapshot
+rebuilds the file byte for byte (no pandas involved), and comparing two
+snapshots only opens the races whose hashes differ.
+
+Usage:
+    python snapshots.py save -m "before name corrections"
+    python snapshots.py list
+    python snapshots.py diff <id> [<id>]      # second id defaults to the current file
+    python snapshots.py restore <id>
+    python snapshots.py import data/merged/season_results_backup.csv ...
+"""
+import argparse
+import csv
+import gzip
+import hashlib
+import json
+import os
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+
+import dataset
+
+SNAPSHOTS_DIRNAME = 'snapshots'
+LOG_NAME = 'log.jsonl'
+RACE_KEYS = ['season_year', 'meet_number', 'division', 'gender']
+HASH_BYTES = 16
+# How a diff recognises an edited result: same bib, else same athlete name
+IDENTITY_COLUMNS = ['bib', 'athlete_full_name']
+
+
+def _hash(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=HASH_BYTES).hexdigest()
+
+
+def _records(text: str):
+    """(fields, raw text) per CSV record; a quoted field may span lines"""
+    buffer = []
+
+    def lines():
+        # Split on '\n' only (str.splitlines also breaks on characters a field may contain)
+        start = 0
+        while start < len(text):
+            end = text.find('\n', start)
+            end = len(text) if end == -1 else end + 1
+            buffer.append(text[start:end])
+            yield text[start:end]
+            start = end
+
+    for fields in csv.reader(lines()):
+        raw = ''.join(buffer)
+        buffer.clear()
+        yield fields, raw
+
+
+def _key_value(value: str) -> str:
+    """Race key part; '2023.0' and '2023' name the same season"""
+    try:
+        number = float(value)
+    except ValueError:
+        return value
+    return str(int(number)) if number.is_integer() else value
+
+
+def split_races(text: str) -> tuple[str, dict, list]:
+    """
+    Split a dataset file into (header, {race key: records text}, row order)
+    The row order lists each record's race key in file order, so races can
+    be interleaved again exactly as they were
+    """
+    records = _records(text)
+    header_fields, header = next(records)
+    positions = [header_fields.index(key) for key in RACE_KEYS]
+    races, order = {}, []
+    for fields, raw in records:
+        key = '|'.join(_key_value(fields[position]) if position < len(fields) else '' for position in positions)
+        races.setdefault(key, []).append(raw)
+        order.append(key)
+    return header, {key: ''.join(rows) for key, rows in races.items()}, order
+
+
+def _encode_order(order: list, keys: list) -> str:
+    """Row order as runs of race numbers: '3x120,0x5,...'"""
+    number = {key: i for i, key in enumerate(keys)}
+    runs = []
+    for key in order:
+        if runs and runs[-1][0] == number[key]:
+            runs[-1][1] += 1
+        else:
+            runs.append([number[key], 1])
+    return ','.join(f"{race}x{count}" for race, count in runs)
+
+
+def _decode_order(encoded: str) -> list:
+    order = []
+    for run in filter(None, encoded.split(',')):
+        race, count = run.split('x')
+        order.extend([int(race)] * int(count))
+    return order
+
+
+def _identities(rows: Counter, header: list) -> list[dict]:
+    """The IDENTITY_COLUMNS values of each record"""
+    positions = {column: header.index(column) for column in IDENTITY_COLUMNS if column in header}
+    return [{column: _key_value(fields[position].strip()) if position < len(fields) else ''
+             for column, position in positions.items()}
+            for fields, _ in _records(''.join(rows.elements()))]
+
+
+def _paired(removed: list[dict], added: list[dict]) -> int:
+    """
+    Removed and added records that are the same result edited: paired on
+    the first identity column (bib) where set, then on the next (name)
+    """
+    pairs = 0
+    for column in IDENTITY_COLUMNS:
+        available = Counter(row.get(column) for row in added if row.get(column))
+        matched = Counter()
+        for row in removed:
+            value = row.get(column)
+            if value and available[value] > matched[value]:
+                matched[value] += 1
+        pairs += sum(matched.values())
+        # Matched records are taken out before trying the next column
+        for pool in (removed, added):
+            left = matched.copy()
+            kept = []
+            for row in pool:
+                if left[row.get(column)] > 0:
+                    left[row.get(column)] -= 1
+                else:
+                    kept.append(row)
+            pool[:] = kept
+    return pairs
+
+
+def snapshots_dir(results_path=None) -> Path:
+    """Snapshot store of a dataset: a folder next to it"""
+    return Path(results_path or dataset.RESULTS_PATH).parent / SNAPSHOTS_DIRNAME
+
+
+class SnapshotStore:
+    def __init__(self, directory=None):
+        self.directory = Path(directory or snapshots_dir())
+
+    # Objects
+    def _object_path(self, digest: str) -> Path:
+        return self.directory / 'objects' / digest[:2] / f"{digest}.gz"
+
+    def _put(self, data: bytes) -> tuple[str, bool]:
+        """Store data under its hash; returns (hash, whether it was new)"""
+        digest = _hash(data)
+        path = self._object_path(digest)
+        if path.exists():
+            return digest, False
+        # mtime=0 keeps the compressed bytes a function of the content alone
+        dataset.atomic_write(path, lambda f: f.write(gzip.compress(data, mtime=0)), mode='wb')
+        return digest, True
+
+    def _get(self, digest: str) -> bytes:
+        with open(self._object_path(digest), 'rb') as f:
+            return gzip.decompress(f.read())
+
+    # Snapshots
+    def save(self, path=None, message: str = '') -> dict:
+        """
+        Snapshot a dataset file (the current one by default); returns the
+        log entry, with the number of new objects and bytes stored
+        """
+        path = Path(path or dataset.RESULTS_PATH)
+        text = path.read_bytes().decode('utf-8')
+        header, races, order = split_races(text)
+        keys = sorted(races)
+        rows = Counter(order)
+
+        new_objects = 0
+        stored_before = self.size_bytes()
+        entries = []
+        for key in keys:
+            digest, new = self._put(races[key].encode('utf-8'))
+            new_objects += new
+            entries.append({'race': key, 'object': digest, 'rows': rows[key]})
+        order_digest, new = self._put(_encode_order(order, keys).encode('utf-8'))
+        new_objects += new
+
+        manifest = {'header': header, 'races': entries, 'order': order_digest}
+        body = json.dumps(manifest, indent=1, sort_keys=True)
+        snapshot_id = _hash(body.encode('utf-8'))[:12]
+        manifest_path = self.directory / f"{snapshot_id}.json"
+        if not manifest_path.exists():
+            dataset.atomic_write(manifest_path, lambda f: f.write(body))
+
+        entry = {
+            'id': snapshot_id,
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'message': message,
+            'source': str(path),
+            'rows': len(order),
+            'races': len(keys),
+            'file_bytes': len(text.encode('utf-8')),
+            'new_objects': new_objects,
+            'stored_bytes': self.size_bytes() - stored_before,
+        }
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(self.directory / LOG_NAME, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry) + '\n')
+        return entry
+
+    def log(self) -> list[dict]:
+        try:
+            with open(self.directory / LOG_NAME, encoding='utf-8') as f:
+                return [json.loads(line) for line in f if line.strip()]
+        except FileNotFoundError:
+            return []
+
+    def resolve(self, prefix: str) -> str:
+        """Full snapshot id from a unique prefix"""
+        matches = sorted({path.stem for path in self.directory.glob(f"{prefix}*.json") if path.name != LOG_NAME})
+        if len(matches) != 1:
+            raise KeyError(f"{'No' if not matches else 'Ambiguous'} snapshot id {prefix!r}")
+        return matches[0]
+
+    def manifest(self, snapshot_id: str) -> dict:
+        with open(self.directory / f"{self.resolve(snapshot_id)}.json", encoding='utf-8') as f:
+            return json.load(f)
+
+    def read_bytes(self, snapshot_id: str) -> bytes:
+        """The dataset file exactly as it was when the snapshot was taken"""
+        manifest = self.manifest(snapshot_id)
+        keys = [entry['race'] for entry in manifest['races']]
+        rows = {key: iter(list(_records(self._get(entry['object']).decode('utf-8'))))
+                for key, entry in zip(keys, manifest['races'])}
+        order = _decode_order(self._get(manifest['order']).decode('utf-8'))
+        parts = [manifest['header']]
+        parts.extend(next(rows[keys[race]])[1] for race in order)
+        return ''.join(parts).encode('utf-8')
+
+    def restore(self, snapshot_id: str, path=None, message: str = '') -> dict:
+        """
+        Replace the dataset with a snapshot (atomically); the current file is
+        snapshotted first so a rollback can itself be undone
+        """
+        path = Path(path or dataset.RESULTS_PATH)
+        data = self.read_bytes(snapshot_id)
+        before = self.save(path, message or f"before restoring {self.resolve(snapshot_id)}") if path.exists() else None
+        dataset.atomic_write(path, lambda f: f.write(data), mode='wb')
+        return before
+
+    def diff(self, old_id: str, new_id: str | None = None, path=None) -> list[dict]:
+        """
+        Per-race changes between two snapshots (the second defaults to the
+        current file): status added / removed / changed, with rows added,
+        removed and changed (same bib or athlete, different record). Races whose
+        bytes are identical are skipped without being read.
+        """
+        old = self.manifest(old_id)
+        if new_id is not None:
+            new = self.manifest(new_id)
+            new_objects = {entry['race']: entry['object'] for entry in new['races']}
+            read_new = self._get
+        else:
+            header, races, _ = split_races(Path(path or dataset.RESULTS_PATH).read_bytes().decode('utf-8'))
+            new = {'header': header}
+            encoded = {key: text.encode('utf-8') for key, text in races.items()}
+            new_objects = {key: _hash(data) for key, data in encoded.items()}
+            read_new = {digest: encoded[key] for key, digest in new_objects.items()}.__getitem__
+        old_objects = {entry['race']: entry['object'] for entry in old['races']}
+
+        old_header, new_header = (next(csv.reader([side['header']])) for side in (old, new))
+        changes = []
+        for key in sorted(set(old_objects) | set(new_objects)):
+            if old_objects.get(key) == new_objects.get(key):
+                continue
+            old_rows = Counter(raw for _, raw in _records(self._get(old_objects[key]).decode('utf-8'))) \
+                if key in old_objects else Counter()
+            new_rows = Counter(raw for _, raw in _records(read_new(new_objects[key]).decode('utf-8'))) \
+                if key in new_objects else Counter()
+            removed, added = old_rows - new_rows, new_rows - old_rows
+            changed = _paired(_identities(removed, old_header), _identities(added, new_header))
+            changes.append({
+                'race': key,
+                'status': 'added' if key not in old_objects else 'removed' if key not in new_objects else 'changed',
+                'rows_added': sum(added.values()) - changed,
+                'rows_removed': sum(removed.values()) - changed,
+                'rows_changed': changed,
+            })
+        if old['header'] != new['header']:
+            changes.insert(0, {'race': '(columns)', 'status': 'changed', 'rows_added': 0,
+                               'rows_removed': 0, 'rows_changed': 0})
+        return changes
+
+    def size_bytes(self) -> int:
+        if not self.directory.exists():
+            return 0
+        return sum(entry.stat().st_size for entry in _walk(self.directory))
+
+
+def _walk(directory: Path):
+    for entry in os.scandir(directory):
+        if entry.is_dir():
+            yield from _walk(Path(entry.path))
+        else:
+            yield entry
+
+
+def _print_diff(changes: list[dict]):
+    if not changes:
+        print("No differences")
+        return
+    for change in changes:
+        if change['race'] == '(columns)':
+            print("  columns changed (every race's records differ)")
+            continue
+        season, meet, division, gender = change['race'].split('|')
+        print(f"  {change['status']:<8} {season} Meet {meet} {division} {gender}: "
+              f"+{change['rows_added']} -{change['rows_removed']} ~{change['rows_changed']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Content-addressed snapshots of the merged dataset")
+    parser.add_argument('--dir', help="snapshot store (default: snapshots/ next to the dataset)")
+    commands = parser.add_subparsers(dest='command', required=True)
+    save = commands.add_parser('save', help="snapshot the current dataset")
+    save.add_argument('-m', '--message', default='')
+    commands.add_parser('list', help="snapshots taken, oldest first")
+    diff = commands.add_parser('diff', help="per-race changes between snapshots")
+    diff.add_argument('old')
+    diff.add_argument('new', nargs='?', help="defaults to the current dataset file")
+    restore = commands.add_parser('restore', help="replace the dataset with a snapshot")
+    restore.add_argument('id')
+    import_ = commands.add_parser('import', help="snapshot other dataset files (e.g. old full-file backups)")
+    import_.add_argument('paths', nargs='+')
+    args = parser.parse_args()
+
+    store = SnapshotStore(args.dir)
+    print("=" * 60)
+    print("DATASET SNAPSHOTS")
+    print("=" * 60)
+
+    if args.command in ('save', 'import'):
+        paths = args.paths if args.command == 'import' else [dataset.RESULTS_PATH]
+        for path in paths:
+            entry = store.save(path, args.message if args.command == 'save' else f"imported {Path(path).name}")
+            print(f"\n{entry['id']}  {entry['rows']:,} rows in {entry['races']} races from {path}")
+            print(f"   {entry['new_objects']} new objects, {entry['stored_bytes'] / 1024:.1f} KB stored "
+                  f"(file is {entry['file_bytes'] / 1024:.1f} KB)")
+        print(f"\nSnapshot store: {store.size_bytes() / 1024:.1f} KB in {store.directory}")
+    elif args.command == 'list':
+        entries = store.log()
+        print()
+        for entry in entries:
+            print(f"{entry['id']}  {entry['created']}  {entry['rows']:>6,} rows  "
+                  f"+{entry['stored_bytes'] / 1024:>7.1f} KB  {entry['message']}")
+        print(f"\n{len(entries)} snapshots, {store.size_bytes() / 1024:.1f} KB "
+              f"(full copies would be {sum(entry['file_bytes'] for entry in entries) / 1024:.1f} KB)")
+    elif args.command == 'diff':
+        print(f"\n{store.resolve(args.old)} -> {store.resolve(args.new) if args.new else 'current file'}")
+        _print_diff(store.diff(args.old, args.new))
+    elif args.command == 'restore':
+        before = store.restore(args.id)
+        if before:
+            print(f"\nCurrent dataset saved as {before['id']} (restore it to undo)")
+        print(f"Restored {store.resolve(args.id)} to {dataset.RESULTS_PATH}")
+
+
+if __name__ == "__main__":
+    main()
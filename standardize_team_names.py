@@ -3,6 +3,8 @@ Standardize team names to remove duplicates
 """
 import pandas as pd
 
+import dataset
+
 # Define team name mappings
 # Format: old_name -> standardized_name
 team_name_mapping = {
@@ -75,40 +77,51 @@ team_name_mapping = {
     'Queen of Apostles Parish': 'Q of A',
 }
 
-print("="*80)
-print("STANDARDIZING TEAM NAMES")
-print("="*80)
 
-# Load data
-df = pd.read_csv('data/merged/season_results.csv')
+def standardize(df: pd.DataFrame) -> pd.DataFrame:
+    """Map team name variations onto the standard names and report the new counts"""
+    print("="*80)
+    print("STANDARDIZING TEAM NAMES")
+    print("="*80)
+
+    print(f"\nOriginal dataset: {len(df)} records")
+    print(f"Original unique teams: {df['team_name'].nunique()}")
+
+    # Apply mappings
+    df = df.assign(team_name=df['team_name'].replace(team_name_mapping))
+
+    print(f"\nAfter standardization:")
+    print(f"Total records: {len(df)} (unchanged)")
+    print(f"Unique teams: {df['team_name'].nunique()}")
+
+    print(f"\n{len(team_name_mapping)} team name variations standardized:")
+    for old_name, new_name in sorted(team_name_mapping.items()):
+        print(f"  {old_name} → {new_name}")
 
-print(f"\nOriginal dataset: {len(df)} records")
-print(f"Original unique teams: {df['team_name'].nunique()}")
+    # Show updated team counts
+    print("\n" + "="*80)
+    print("UPDATED TEAM COUNTS")
+    print("="*80)
+    teams = df['team_name'].value_counts()
+    for team in sorted(teams.index):
+        count = teams[team]
+        print(f"{team:<50} {count:>5} records")
+    return df
 
-# Apply mappings
-df['team_name'] = df['team_name'].replace(team_name_mapping)
 
-print(f"\nAfter standardization:")
-print(f"Total records: {len(df)} (unchanged)")
-print(f"Unique teams: {df['team_name'].nunique()}")
+def main(df: pd.DataFrame | None = None) -> pd.DataFrame:
+    # Load data
+    df = standardize(pd.read_csv('data/merged/season_results.csv') if df is None else df)
 
-print(f"\n{len(team_name_mapping)} team name variations standardized:")
-for old_name, new_name in sorted(team_name_mapping.items()):
-    print(f"  {old_name} → {new_name}")
+    # Save updated dataset
+    dataset.write_results(df)
 
-# Show updated team counts
-print("\n" + "="*80)
-print("UPDATED TEAM COUNTS")
-print("="*80)
-teams = df['team_name'].value_counts()
-for team in sorted(teams.index):
-    count = teams[team]
-    print(f"{team:<50} {count:>5} records")
+    print("\n" + "="*80)
+    print("✅ COMPLETE - Updated file saved")
+    print("="*80)
+    print("\nFile: data/merged/season_results.csv")
+    return df
 
-# Save updated dataset
-df.to_csv('data/merged/season_results.csv', index=False)
 
-print("\n" + "="*80)
-print("✅ COMPLETE - Updated file saved")
-print("="*80)
-print("\nFile: data/merged/season_results.csv")
+if __name__ == "__main__":
+    main()
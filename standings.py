@@ -0,0 +1,67 @@
+"""
+Saint Sebastian standings
+Cumulative finish time per athlete over every meet of a season, ranked within
+each division and gender. Only athletes who ran every meet held so far count.
+"""
+import pandas as pd
+
+from add_distance_metrics import format_seconds_to_time
+
+SAINT_SEBASTIAN_REQUIRED_MEETS = 3
+
+
+def saint_sebastian_standings(df: pd.DataFrame, season: int):
+    """
+    Standings for one season
+    Returns (standings, categories, school_options, meets_completed)
+    """
+    saint_standings = pd.DataFrame()
+    saint_categories = []
+    school_options = ["All Teams"]
+    meets_completed = 0
+
+    season_scope_df = df[df['season_year'] == season]
+    if not season_scope_df.empty:
+        saint_base = season_scope_df.dropna(
+            subset=['finish_time_s', 'meet_number', 'athlete_full_name']
+        ).copy()
+
+        if not saint_base.empty:
+            saint_base['meet_number'] = saint_base['meet_number'].astype(int)
+            saint_base['division'] = saint_base['division'].fillna("Unknown")
+            saint_base['gender'] = saint_base['gender'].fillna("Unknown")
+            saint_base['team_name'] = saint_base['team_name'].fillna("Unknown")
+            saint_base['gender_label'] = saint_base['gender'].map({'M': 'Boys', 'F': 'Girls'}).fillna(saint_base['gender'])
+            saint_base['category'] = saint_base['gender_label'] + " " + saint_base['division']
+
+            completed_meets = sorted(saint_base['meet_number'].unique())
+            meets_completed = len(completed_meets)
+
+            if meets_completed > 0:
+                group_cols = ['division', 'gender', 'gender_label', 'category', 'athlete_full_name', 'team_name']
+                saint_standings = saint_base.groupby(group_cols).agg(
+                    cumulative_time=('finish_time_s', 'sum'),
+                    meets_run=('meet_number', 'nunique')
+                ).reset_index()
+
+                saint_standings = saint_standings[saint_standings['meets_run'] == meets_completed].copy()
+
+                if not saint_standings.empty:
+                    saint_standings = saint_standings.sort_values(['division', 'gender', 'cumulative_time'])
+                    saint_standings['rank'] = saint_standings.groupby(['division', 'gender']).cumcount() + 1
+                    leader_time = saint_standings.groupby(['division', 'gender'])['cumulative_time'].transform('min')
+                    saint_standings['time_back'] = saint_standings['cumulative_time'] - leader_time
+                    saint_standings['cumulative_time_str'] = saint_standings['cumulative_time'].apply(format_seconds_to_time)
+                    saint_standings['time_back_str'] = saint_standings['time_back'].apply(
+                        lambda x: "--" if pd.isna(x) or x <= 0 else format_seconds_to_time(x)
+                    )
+                    saint_categories = (
+                        saint_standings[['category', 'division', 'gender', 'gender_label']]
+                        .drop_duplicates()
+                        .sort_values(['division', 'gender'])
+                        .to_dict('records')
+                    )
+
+            school_options = ["All Teams"] + sorted(saint_base['team_name'].dropna().unique().tolist())
+
+    return saint_standings, saint_categories, school_options, meets_completed
@@ -0,0 +1,221 @@
+"""
+Indexed SQLite results store
+The merged results normalized into athletes, teams, races and results tables
+in one SQLite file next to the dataset (data/merged/derived/results.sqlite),
+so a script or dashboard view can fetch the rows for one athlete, team or
+race through an index instead of loading and scanning the whole CSV.
+
+Built by precompute.py ('store' stage). Query methods return DataFrames with
+the same columns as the dataset rows; execute() returns plain tuples and,
+like opening a store, does not import pandas.
+"""
+from __future__ import annotations
+
+import sqlite3
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import dataset
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+STORE_FILENAME = 'results.sqlite'
+RACE_KEYS = ['season_year', 'meet_number', 'division', 'gender']
+# Per-race attributes stored once on the race instead of on every result
+RACE_ATTRIBUTES = ['meet_series', 'meet_name', 'meet_order', 'distance_km', 'distance_mi']
+
+TEAM_COUNTS_SQL = (
+    'SELECT t.name AS team_name, COUNT(*) AS results FROM results r '
+    'JOIN teams t ON t.team_id = r.team_id GROUP BY t.team_id ORDER BY t.name'
+)
+
+INDEXES = [
+    'CREATE INDEX idx_results_athlete ON results (athlete_id)',
+    'CREATE INDEX idx_results_team_season ON results (team_id, season_year)',
+    'CREATE INDEX idx_results_race ON results (race_id)',
+    'CREATE UNIQUE INDEX idx_races_key ON races (season_year, meet_number, division, gender)',
+]
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _sql_type(dtype) -> str:
+    import pandas as pd
+
+    if pd.api.types.is_integer_dtype(dtype) or pd.api.types.is_bool_dtype(dtype):
+        return 'INTEGER'
+    if pd.api.types.is_float_dtype(dtype):
+        return 'REAL'
+    return 'TEXT'
+
+
+def _columns_ddl(frame: pd.DataFrame) -> str:
+    return ', '.join(f'{_quote(column)} {_sql_type(frame[column].dtype)}' for column in frame.columns)
+
+
+class ResultsStore:
+    """
+    Read access to a results database
+    One connection shared by all callers (dashboard sessions run on several
+    threads), with queries serialized by a lock.
+    """
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+        self._lock = threading.Lock()
+        self.columns = [row[0] for row in conn.execute('SELECT name FROM dataset_columns ORDER BY position')]
+        race_columns = {row[1] for row in conn.execute('PRAGMA table_info(races)')}
+        result_columns = {row[1] for row in conn.execute('PRAGMA table_info(results)')}
+        # Rebuilds the dataset rows; column names and order match the CSV
+        selects = []
+        for column in self.columns:
+            if column == 'athlete_full_name':
+                selects.append('a.name AS athlete_full_name')
+            elif column == 'team_name':
+                selects.append('t.name AS team_name')
+            elif column in race_columns:
+                selects.append(f'ra.{_quote(column)}')
+            elif column in result_columns:
+                selects.append(f'r.{_quote(column)}')
+        self._select = (
+            f"SELECT {', '.join(selects)} FROM results r "
+            "LEFT JOIN races ra ON ra.race_id = r.race_id "
+            "LEFT JOIN athletes a ON a.athlete_id = r.athlete_id "
+            "LEFT JOIN teams t ON t.team_id = r.team_id"
+        )
+
+    @classmethod
+    def build(cls, df: pd.DataFrame) -> 'ResultsStore':
+        """Normalize df into an in-memory database"""
+        import pandas as pd
+
+        conn = sqlite3.connect(':memory:', check_same_thread=False)
+        attributes = [column for column in RACE_ATTRIBUTES if column in df.columns]
+
+        athlete_codes, athletes = pd.factorize(df['athlete_full_name'], sort=True)
+        team_codes, teams = pd.factorize(df['team_name'], sort=True)
+        race_codes = df.groupby(RACE_KEYS, dropna=False, sort=True).ngroup().to_numpy()
+        races = df[RACE_KEYS + attributes].groupby(race_codes).first()
+        races.insert(0, 'race_id', races.index + 1)
+
+        # Missing athlete/team names (code -1) become NULL ids
+        results = df.drop(columns=['athlete_full_name', 'team_name'] + RACE_KEYS[1:] + attributes)
+        results.insert(0, 'result_id', range(1, len(df) + 1))
+        results.insert(1, 'race_id', race_codes + 1)
+        results.insert(2, 'athlete_id', pd.Series(athlete_codes + 1).where(athlete_codes >= 0).astype('Int64'))
+        results.insert(3, 'team_id', pd.Series(team_codes + 1).where(team_codes >= 0).astype('Int64'))
+
+        with conn:
+            conn.execute('CREATE TABLE athletes (athlete_id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE)')
+            conn.execute('CREATE TABLE teams (team_id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE)')
+            conn.execute(f'CREATE TABLE races (race_id INTEGER PRIMARY KEY, {_columns_ddl(races.drop(columns="race_id"))})')
+            conn.execute(
+                f'CREATE TABLE results (result_id INTEGER PRIMARY KEY, '
+                f'race_id INTEGER REFERENCES races, athlete_id INTEGER REFERENCES athletes, '
+                f'team_id INTEGER REFERENCES teams, {_columns_ddl(results.iloc[:, 4:])})'
+            )
+            conn.execute('CREATE TABLE dataset_columns (position INTEGER PRIMARY KEY, name TEXT NOT NULL)')
+            conn.executemany('INSERT INTO athletes VALUES (?, ?)', enumerate(athletes, start=1))
+            conn.executemany('INSERT INTO teams VALUES (?, ?)', enumerate(teams, start=1))
+            conn.executemany('INSERT INTO dataset_columns VALUES (?, ?)', enumerate(df.columns))
+            races.to_sql('races', conn, if_exists='append', index=False)
+            results.to_sql('results', conn, if_exists='append', index=False)
+            for statement in INDEXES:
+                conn.execute(statement)
+        return cls(conn)
+
+    def save(self, path):
+        dataset.atomic_write(path, lambda f: f.write(self.conn.serialize()), mode='wb')
+
+    @classmethod
+    def load(cls, path) -> 'ResultsStore':
+        """Open a saved store read-only; rows are read from disk per query"""
+        uri = Path(path).resolve().as_uri() + '?mode=ro'
+        return cls(sqlite3.connect(uri, uri=True, check_same_thread=False))
+
+    def query(self, sql: str, params=()) -> pd.DataFrame:
+        """Run any SELECT against the normalized tables"""
+        import pandas as pd
+
+        with self._lock:
+            return pd.read_sql_query(sql, self.conn, params=params)
+
+    def execute(self, sql: str, params=()) -> list[tuple]:
+        """query() without pandas: rows as tuples"""
+        with self._lock:
+            return self.conn.execute(sql, params).fetchall()
+
+    def _rows(self, where: str, params=()) -> pd.DataFrame:
+        return self.query(f'{self._select} WHERE {where} ORDER BY r.result_id', params)
+
+    def athlete_results(self, athlete: str) -> pd.DataFrame:
+        return self._rows('r.athlete_id = (SELECT athlete_id FROM athletes WHERE name = ?)', (athlete,))
+
+    def team_results(self, team: str, season=None) -> pd.DataFrame:
+        if season is None:
+            return self._rows('r.team_id = (SELECT team_id FROM teams WHERE name = ?)', (team,))
+        return self._rows('r.team_id = (SELECT team_id FROM teams WHERE name = ?) AND r.season_year = ?',
+                          (team, int(season)))
+
+    def race_results(self, season, meet, division: str, gender: str) -> pd.DataFrame:
+        return self._rows(
+            'r.race_id = (SELECT race_id FROM races WHERE season_year = ? AND meet_number = ? '
+            'AND division = ? AND gender = ?)',
+            (int(season), int(meet), division, gender)
+        )
+
+    def team_counts(self) -> pd.DataFrame:
+        """Results per team name (team_name, results), by name"""
+        return self.query(TEAM_COUNTS_SQL)
+
+
+def build_store(df: pd.DataFrame) -> ResultsStore:
+    return ResultsStore.build(df)
+
+
+def open_store(results_path=None) -> ResultsStore:
+    """
+    The store for the current dataset, for scripts: rebuilt through
+    precompute.py first if it is missing or older than the dataset
+    """
+    results_path = Path(results_path or dataset.RESULTS_PATH)
+    directory = dataset.derived_dir(results_path)
+    built_from = dataset.read_manifest(directory).get('store')
+    if built_from != dataset.dataset_version(results_path) or not (directory / STORE_FILENAME).exists():
+        import precompute
+
+        precompute.run(['store'], results_path)
+    return ResultsStore.load(directory / STORE_FILENAME)
+
+
+def main():
+    import time
+
+    start = time.perf_counter()
+    store = open_store()
+    open_ms = (time.perf_counter() - start) * 1000
+
+    print("=" * 80)
+    print("RESULTS STORE")
+    print("=" * 80)
+    counts = store.query(
+        'SELECT (SELECT COUNT(*) FROM athletes) AS athletes, (SELECT COUNT(*) FROM teams) AS teams, '
+        '(SELECT COUNT(*) FROM races) AS races, (SELECT COUNT(*) FROM results) AS results'
+    ).iloc[0]
+    print(f"\n{counts['results']:,} results, {counts['athletes']:,} athletes, {counts['teams']} teams, "
+          f"{counts['races']} races (opened in {open_ms:.0f} ms)")
+
+    team = store.team_counts().sort_values('results', ascending=False).iloc[0]['team_name']
+    season = int(store.query('SELECT MAX(season_year) AS season FROM races').iloc[0]['season'])
+    start = time.perf_counter()
+    rows = store.team_results(team, season)
+    query_ms = (time.perf_counter() - start) * 1000
+    print(f"{team}, {season}: {len(rows)} results in {query_ms:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""
+Cross country team scoring and what-if lineup simulation
+A team's score is the sum of its top 5 finishers' overall places (lowest wins);
+teams with fewer than 5 finishers are not scored.
+
+RaceSimulator holds one race as arrays sorted by finish order and scores a
+whole batch of hypothetical lineups (runners removed, added or swapped) in one
+vectorized pass, re-placing everyone behind each change.
+"""
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+RACE_KEYS = ['season_year', 'meet_number', 'division', 'gender']
+SCORING_RUNNERS = 5
+
+
+def team_scores(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Team scores for every race in df (one row per race and scored team)
+    Columns: Team, Meet, Division, Gender, Score, Runners, Avg Time (s), Season (if df has seasons)
+    """
+    race_keys = RACE_KEYS if 'season_year' in df.columns else RACE_KEYS[1:]
+    placed = df.dropna(subset=race_keys + ['team_name', 'place_overall'])
+    placed = placed.sort_values('place_overall', kind='stable')
+
+    # Each team's top 5 in each race
+    scorers = placed[placed.groupby(race_keys + ['team_name']).cumcount() < SCORING_RUNNERS]
+    scores = scorers.groupby(race_keys + ['team_name']).agg(
+        Score=('place_overall', 'sum'),
+        Runners=('place_overall', 'size'),
+        avg_time=('finish_time_s', 'mean'),
+    ).reset_index()
+    scores = scores[scores['Runners'] == SCORING_RUNNERS]
+
+    scored = pd.DataFrame({
+        'Team': scores['team_name'],
+        'Meet': scores['meet_number'].astype(int),
+        'Division': scores['division'],
+        'Gender': scores['gender'],
+        'Score': scores['Score'].astype(int),
+        'Runners': scores['Runners'],
+        'Avg Time (s)': scores['avg_time'].round(2),
+    })
+    if 'season_year' in df.columns:
+        scored['Season'] = scores['season_year'].astype(int)
+    return scored.reset_index(drop=True)
+
+
+@dataclass
+class Scenario:
+    """
+    A hypothetical lineup for one race
+    remove: athlete names taken out of the race
+    add: (athlete name, team, finish time in seconds) runners put into the race;
+         a swap is a remove plus an add
+    """
+    label: str
+    remove: list = field(default_factory=list)
+    add: list = field(default_factory=list)
+
+
+class RaceSimulator:
+    """
+    One race (season, meet, division, gender) held as arrays in finish order
+
+    Entries are the race's actual finishers plus every runner added by any
+    scenario in the batch. Because removing or adding a runner never changes
+    the relative order of everyone else, the finish order and each team's
+    block of entries are fixed; a scenario is just a row of an active-entry
+    mask, and new places are the original places shifted by the runners
+    added or removed ahead.
+    """
+
+    def __init__(self, race_df: pd.DataFrame):
+        field_df = race_df.dropna(subset=['place_overall', 'team_name']).sort_values('place_overall', kind='stable')
+        self.athletes = field_df['athlete_full_name'].to_numpy()
+        self.teams = field_df['team_name'].to_numpy()
+        self.places = field_df['place_overall'].to_numpy(dtype=float)
+        self.times = field_df['finish_time_s'].to_numpy(dtype=float)
+
+    def place_for_time(self, finish_time_s: float) -> float:
+        """
+        Place a runner added with this finish time takes on their own: that of
+        the first finisher who was slower (or just behind the last finisher)
+        """
+        slower = np.flatnonzero(self.times > finish_time_s)
+        return self.places[slower[0]] if len(slower) else (self.places.max() if len(self.places) else 0) + 1
+
+    def added_keys(self, finish_times) -> np.ndarray:
+        """
+        Sort keys for added runners, between the place before their gap and the
+        place they take. Runners added into the same gap get distinct keys in
+        finish-time order, so each one also moves back those behind it
+        """
+        finish_times = np.asarray(finish_times, dtype=float)
+        gaps = np.array([self.place_for_time(t) for t in finish_times], dtype=float)
+        order = np.lexsort((np.arange(len(gaps)), finish_times, gaps))
+        sorted_gaps = gaps[order]
+        gap_start = np.searchsorted(sorted_gaps, sorted_gaps, side='left')
+        gap_size = np.searchsorted(sorted_gaps, sorted_gaps, side='right') - gap_start
+        keys = np.empty(len(gaps))
+        keys[order] = sorted_gaps - 1 + (np.arange(len(gaps)) - gap_start + 1) / (gap_size + 1)
+        return keys
+
+    def simulate(self, scenarios: list) -> pd.DataFrame:
+        """
+        Score every scenario at once
+        Returns one row per scenario and scored team: Scenario, Team, Score,
+        Runners, Avg Time (s), Change (vs. the actual race) and Team Place.
+        The race as actually run is included as scenario 'Actual'.
+        """
+        n_field = len(self.places)
+        if n_field == 0:
+            return pd.DataFrame(columns=['Scenario', 'Team', 'Score', 'Runners', 'Avg Time (s)', 'Change', 'Team Place'])
+        additions = [runner for scenario in scenarios for runner in scenario.add]
+
+        # Entries: actual finishers, then every addition from every scenario
+        keys = np.concatenate([self.places, self.added_keys([t for _, _, t in additions])])
+        teams = np.concatenate([self.teams, np.array([team for _, team, _ in additions], dtype=object)])
+        times = np.concatenate([self.times, np.array([t for _, _, t in additions], dtype=float)])
+        is_added = np.arange(len(keys)) >= n_field
+
+        # active[s, i]: entry i runs in scenario s. Row 0 is the race as actually run.
+        active = np.zeros((len(scenarios) + 1, len(keys)), dtype=bool)
+        active[:, :n_field] = True
+        index_of = {name: i for i, name in enumerate(self.athletes)}
+        offset = n_field
+        for s, scenario in enumerate(scenarios, start=1):
+            active[s, [index_of[name] for name in scenario.remove if name in index_of]] = False
+            active[s, offset:offset + len(scenario.add)] = True
+            offset += len(scenario.add)
+        # +1 for a runner added, -1 for a runner removed
+        shift = np.where(is_added, active, ~active).astype(int) * np.where(is_added, 1, -1)
+
+        # Re-place the field: original place plus the net runners added/removed strictly ahead
+        order = np.argsort(keys, kind='stable')
+        sorted_keys = keys[order]
+        sorted_shift = shift[:, order]
+        ahead = np.cumsum(sorted_shift, axis=1) - sorted_shift
+        tie_start = np.searchsorted(sorted_keys, sorted_keys, side='left')
+        new_places = np.empty(active.shape)
+        new_places[:, order] = np.ceil(sorted_keys) + ahead[:, tie_start]
+
+        # Team-major layout: each team's entries are one contiguous block in finish order
+        team_codes, team_names = pd.factorize(teams, sort=True)
+        by_team = np.lexsort((keys, team_codes))
+        block_starts = np.flatnonzero(np.r_[True, np.diff(team_codes[by_team]) != 0])
+        block_sizes = np.diff(np.r_[block_starts, len(by_team)])
+
+        runs = active[:, by_team].astype(int)
+        team_rank = np.cumsum(runs, axis=1)
+        team_rank -= np.repeat(team_rank[:, block_starts] - runs[:, block_starts], block_sizes, axis=1)
+        scoring = (runs == 1) & (team_rank <= SCORING_RUNNERS)
+
+        score = np.add.reduceat(np.where(scoring, new_places[:, by_team], 0), block_starts, axis=1)
+        runners = np.add.reduceat(runs, block_starts, axis=1)
+        time_sum = np.add.reduceat(np.where(scoring, times[by_team], 0), block_starts, axis=1)
+        scored = runners >= SCORING_RUNNERS
+        change = np.where(scored & scored[0], score - score[0], np.nan)
+
+        block_teams = team_names[team_codes[by_team][block_starts]]
+        labels = ['Actual'] + [scenario.label for scenario in scenarios]
+        results = pd.DataFrame({
+            'Scenario': np.repeat(labels, len(block_teams)),
+            'Team': np.tile(block_teams, len(labels)),
+            'Score': score.ravel(),
+            'Runners': runners.ravel(),
+            'Avg Time (s)': (time_sum / SCORING_RUNNERS).ravel().round(2),
+            'Change': change.ravel(),
+        })
+        results = results[scored.ravel()].copy()
+        results['Score'] = results['Score'].astype(int)
+        results['Team Place'] = results.groupby('Scenario', sort=False)['Score'].rank(method='min').astype(int)
+        return results.reset_index(drop=True)
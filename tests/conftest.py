@@ -0,0 +1,29 @@
+import pandas as pd
+import pytest
+
+
+@pytest.fixture
+def season_results():
+    """Two teams of three over three meets of one season, the same finish order every meet"""
+    rows = []
+    for meet in (1, 2, 3):
+        for i, (name, team) in enumerate([('Ann', 'St Rita'), ('Bea', 'St Ann'), ('Cat', 'St Rita'),
+                                          ('Dee', 'St Ann'), ('Eve', 'St Rita'), ('Fay', 'St Ann')]):
+            rows.append({
+                'athlete_full_name': name, 'team_name': team, 'grade': 5,
+                'season_year': 2024, 'meet_number': meet, 'meet_name': f"Meet {meet}",
+                'division': 'JV', 'gender': 'Girls', 'place_overall': i + 1,
+                'finish_time_s': 600.0 + 10 * i - meet, 'pace_per_mi_min': (600.0 + 10 * i - meet) / 60 / 1.86,
+            })
+    return pd.DataFrame(rows)
+
+
+@pytest.fixture
+def edited_results(season_results):
+    """season_results edited in place: team renamed, a time corrected and two finishers swapped"""
+    df = season_results.copy()
+    df.loc[df['team_name'] == 'St Rita', 'team_name'] = 'Saint Rita'
+    df.loc[(df['meet_number'] == 1) & (df['athlete_full_name'] == 'Fay'), 'finish_time_s'] = 500.0
+    swap = df.index[(df['meet_number'] == 2) & df['athlete_full_name'].isin(['Ann', 'Bea'])]
+    df.loc[swap, 'place_overall'] = df.loc[swap[::-1], 'place_overall'].to_numpy()
+    return df
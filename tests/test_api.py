@@ -0,0 +1,90 @@
+import asyncio
+import json
+import shutil
+import urllib.error
+import urllib.request
+from collections import OrderedDict
+from pathlib import Path
+
+import pytest
+
+import api
+
+DATASET = Path(__file__).resolve().parent.parent / 'data' / 'merged' / 'season_results.csv'
+
+
+@pytest.fixture(scope='module')
+def results_api(tmp_path_factory):
+    # A copy, so nothing derived from it is written next to the real dataset
+    path = tmp_path_factory.mktemp('merged') / 'season_results.csv'
+    shutil.copy(DATASET, path)
+    return api.ResultsAPI(path)
+
+
+def get(port, path, etag=None):
+    request = urllib.request.Request(f"http://127.0.0.1:{port}{path}", headers={'If-None-Match': etag} if etag else {})
+    try:
+        with urllib.request.urlopen(request, timeout=60) as response:
+            return response.status, response.headers, response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers, e.read()
+
+
+def serve_and_get(results_api, requests):
+    """Start the server on a free port and make each (path, etag) request in turn"""
+    async def run():
+        server = await api.serve(results_api, port=0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            return [await asyncio.to_thread(get, port, path, etag) for path, etag in requests]
+    return asyncio.run(run())
+
+
+def test_every_endpoint_answers_and_revalidates(results_api):
+    paths = api._check_requests(results_api.store.snapshot()[1])
+    responses = serve_and_get(results_api, [(path, None) for path in paths])
+    found = {path: response for path, response in zip(paths, responses)}
+    assert found.pop('/athletes/No%20Such%20Athlete')[0] == 404
+    for path, (status, headers, body) in found.items():
+        assert status == 200, path
+        assert headers['Content-Type'].startswith('application/json')
+        json.loads(body)
+
+    revalidated = serve_and_get(results_api, [(path, headers['ETag']) for path, (_, headers, _) in found.items()])
+    assert [status for status, _, _ in revalidated] == [304] * len(found)
+
+
+def test_race_lookup(results_api):
+    df = results_api.store.snapshot()[1]
+    race = df.dropna(subset=['place_overall']).iloc[0]
+    path = f"/races/{int(race['season_year'])}/{int(race['meet_number'])}/{race['division']}/{race['gender']}"
+    [(status, _, body)] = serve_and_get(results_api, [(path.replace(' ', '%20'), None)])
+    payload = json.loads(body)
+    assert status == 200
+    assert payload['race']['meet_name'] == race['meet_name']
+    places = [row['place_overall'] for row in payload['results']]
+    assert places == sorted(places)
+
+
+@pytest.mark.parametrize('path', [
+    '/races/99999999999999999999/1/Frosh/M',
+    '/races/2025/-1/Frosh/Boys',
+    '/races/2025/one/Frosh/Boys',
+    '/standings/0',
+])
+def test_bad_numbers_are_rejected(results_api, path):
+    [(status, headers, body)] = serve_and_get(results_api, [(path, None)])
+    assert status == 400
+    assert 'error' in json.loads(body)
+
+
+def test_handler_error_answers_500_and_keeps_serving(results_api, monkeypatch):
+    def broken(*args):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(results_api, 'standings', broken)
+    monkeypatch.setattr(results_api, '_responses', OrderedDict())
+    (status, _, body), (after, _, _) = serve_and_get(results_api, [('/standings/2025', None), ('/', None)])
+    assert status == 500
+    assert json.loads(body) == {'error': "Internal server error"}
+    assert after == 200
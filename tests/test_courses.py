@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+
+import courses
+
+
+def league(seasons, improvement=0.02, meet_2_factor=1.1):
+    """Six runners in one division; meet 2 is a slow course and everyone improves steadily each meet"""
+    rows = []
+    for s, season in enumerate(seasons):
+        for meet in (1, 2, 3):
+            step = s * 3 + meet
+            for i, name in enumerate('ABCDEF'):
+                pace = (7.0 + 0.2 * i) * (1 - improvement) ** step * (meet_2_factor if meet == 2 else 1.0)
+                rows.append({'athlete_full_name': name, 'season_year': season, 'meet_number': meet,
+                             'division': 'JV', 'pace_per_mi_min': pace})
+    return pd.DataFrame(rows)
+
+
+def test_factors_leave_out_improvement_measured_across_seasons():
+    factors = courses.build_course_factors(league([2024, 2025]))
+
+    assert np.isclose(factors.attrs['improvement_per_meet'], -0.02, atol=0.002)
+    by_meet = factors.groupby('meet_number')['course_factor'].mean()
+    # Meets 1 and 3 are the same course; only meet 2 is slow
+    assert abs(by_meet[1] - by_meet[3]) < 0.01
+    assert by_meet[2] > by_meet[1] * 1.05
+
+
+def test_single_season_fits_no_trend():
+    factors = courses.build_course_factors(league([2024]))
+
+    assert factors.attrs['improvement_per_meet'] == 0.0
+    # With nothing to measure it against, the season's improvement stays in the factors
+    by_meet = factors.set_index('meet_number')['course_factor']
+    assert by_meet[1] > by_meet[3]
@@ -0,0 +1,109 @@
+import asyncio
+import http.server
+import shutil
+import threading
+from argparse import Namespace
+from pathlib import Path
+
+import pytest
+
+import fetch
+import parse_saved_pages
+import xc
+
+PAGES_DIR = Path(__file__).resolve().parent.parent / 'data' / 'pages'
+PAGE_NAMES = sorted(path.name for path in PAGES_DIR.glob('*2025.htm'))[:4]
+
+
+@pytest.fixture
+def pages(tmp_path):
+    directory = tmp_path / 'pages'
+    directory.mkdir()
+    for name in PAGE_NAMES:
+        shutil.copy(PAGES_DIR / name, directory / name)
+    return directory
+
+
+def start(server):
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_address[1]}/"
+
+
+@pytest.fixture
+def stand_in(pages):
+    server = fetch._stand_in_server(pages)
+    yield start(server)
+    server.shutdown()
+    server.server_close()
+
+
+def test_fetch_writes_same_csvs_as_parsing_then_revalidates(pages, stand_in, tmp_path):
+    output = tmp_path / 'raw'
+    sources = fetch.mirror_sources(stand_in, pages)
+    outcomes = fetch.run(sources, output)
+    assert [outcome['status'] for outcome in outcomes] == ['updated'] * len(PAGE_NAMES)
+    for outcome in outcomes:
+        with open(pages / outcome['name'], encoding='utf-8') as f:
+            _, expected = parse_saved_pages.parse_page(f.read(), outcome['name'])
+        assert (output / outcome['output']).read_text(encoding='utf-8') == expected.to_csv(index=False)
+
+    again = fetch.run(sources, output)
+    assert [outcome['status'] for outcome in again] == ['unchanged'] * len(PAGE_NAMES)
+
+
+def test_redirects_are_followed(pages, tmp_path):
+    class Redirecting(http.server.BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            self.send_response(301)
+            self.send_header('Location', target + self.path.lstrip('/'))
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+
+        def log_message(self, format, *args):
+            pass
+
+    pages_server = fetch._stand_in_server(pages)
+    redirect_server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Redirecting)
+    target = start(pages_server)
+    try:
+        outcomes = fetch.run(fetch.mirror_sources(start(redirect_server), pages), tmp_path / 'raw')
+    finally:
+        for server in (pages_server, redirect_server):
+            server.shutdown()
+            server.server_close()
+    assert [outcome['status'] for outcome in outcomes] == ['updated'] * len(PAGE_NAMES)
+
+
+def test_stalled_host_fails_instead_of_hanging(tmp_path, monkeypatch):
+    monkeypatch.setattr(fetch, 'TIMEOUT_S', 0.5)
+
+    async def run():
+        # Accepts connections and never answers
+        server = await asyncio.start_server(lambda reader, writer: None, '127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            return await fetch.fetch_pages([(f"http://127.0.0.1:{port}/{PAGE_NAMES[0]}", PAGE_NAMES[0])], tmp_path)
+
+    [outcome] = asyncio.run(asyncio.wait_for(run(), 10))
+    assert outcome['status'] == 'failed'
+
+
+def test_missing_sources_file(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    assert fetch.load_sources() == []
+    xc.cmd_fetch(None, Namespace(mirror=None))
+    assert capsys.readouterr().out.startswith("No pages to fetch")
+
+
+def test_stalled_connect_fails_instead_of_hanging(tmp_path, monkeypatch):
+    monkeypatch.setattr(fetch, 'TIMEOUT_S', 0.5)
+
+    async def never_connects(*args, **kwargs):
+        await asyncio.sleep(3600)
+
+    monkeypatch.setattr(asyncio, 'open_connection', never_connects)
+    outcomes = asyncio.run(asyncio.wait_for(
+        fetch.fetch_pages([("http://127.0.0.1:9/page.htm", PAGE_NAMES[0])], tmp_path), 10))
+    assert [outcome['status'] for outcome in outcomes] == ['failed']
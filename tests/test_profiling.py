@@ -0,0 +1,16 @@
+import profiling
+
+
+def test_nested_cache_sections_record_their_own_hits():
+    profiler = profiling.RenderProfiler(enabled=True)
+    with profiler.section("Outer", cache='outer'):
+        with profiler.section("Inner", cache='inner'):
+            profiling.note_cache_miss('inner')
+        with profiler.section("Inner again", cache='outer'):
+            pass
+
+    assert profiler.cache_events == [
+        {'cache': 'inner', 'hit': False},
+        {'cache': 'outer', 'hit': True},
+        {'cache': 'outer', 'hit': True},
+    ]
@@ -0,0 +1,39 @@
+import numpy as np
+
+import progression
+
+
+def test_series_matches_the_athletes_rows(season_results):
+    results = season_results.assign(
+        finish_time_str=[f"{int(t // 60):02d}:{t % 60:04.1f}" for t in season_results['finish_time_s']])
+    matrix = progression.build_progression(results.sample(frac=1, random_state=0))
+    series = matrix.series('Cat')
+
+    rows = results[results['athlete_full_name'] == 'Cat'].sort_values('meet_number')
+    assert series['meet_number'].tolist() == rows['meet_number'].tolist()
+    assert series['finish_time_s'].tolist() == rows['finish_time_s'].tolist()
+    assert series['place_overall'].tolist() == rows['place_overall'].tolist()
+    assert np.allclose(series['pace_per_mi_min'], rows['pace_per_mi_min'], rtol=1e-6)
+    assert series['finish_time_str'].tolist() == ['10:19.0', '10:18.0', '10:17.0']
+
+
+def test_series_keeps_races_with_a_place_but_no_time(season_results):
+    results = season_results.copy()
+    untimed = (results['athlete_full_name'] == 'Ann') & (results['meet_number'] == 2)
+    results.loc[untimed, ['finish_time_s', 'pace_per_mi_min']] = np.nan
+    matrix = progression.build_progression(results)
+    series = matrix.series('Ann')
+
+    assert series['meet_number'].tolist() == [1, 2, 3]
+    assert series['place_overall'].tolist() == [1.0, 1.0, 1.0]
+    assert series['pace_per_mi_min'].isna().tolist() == [False, True, False]
+    assert matrix.cohorts()['Ann'] == '2024 JV'
+
+
+def test_series_survives_a_save_and_load(season_results, tmp_path):
+    path = tmp_path / 'progression_matrix.npz'
+    progression.build_progression(season_results).save(path)
+    loaded = progression.ProgressionMatrix.load(path)
+
+    assert loaded.series('Ann').equals(progression.build_progression(season_results).series('Ann'))
+    assert list(loaded.series('Nobody').columns) == progression.SERIES_COLUMNS
@@ -0,0 +1,17 @@
+import ratings
+
+
+def test_update_replays_only_new_meet(season_results):
+    previous = ratings.build_ratings(season_results[season_results['meet_number'] < 3])
+    assert ratings.update_ratings(previous, season_results).equals(ratings.build_ratings(season_results))
+
+
+def test_update_picks_up_edits_to_earlier_meets(season_results, edited_results):
+    history = ratings.update_ratings(ratings.build_ratings(season_results), edited_results)
+    assert history.equals(ratings.build_ratings(edited_results))
+    assert set(history['team_name']) == {'Saint Rita', 'St Ann'}
+
+
+def test_update_of_current_history_returns_it(season_results):
+    history = ratings.build_ratings(season_results)
+    assert ratings.update_ratings(history, season_results) is history
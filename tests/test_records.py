@@ -0,0 +1,30 @@
+import pandas as pd
+
+import records
+
+
+def test_update_adds_new_meet(season_results):
+    previous = records.build_records(season_results[season_results['meet_number'] < 3])
+    assert records.update_records(previous, season_results).equals(records.build_records(season_results))
+
+
+def test_update_picks_up_edits_to_earlier_meets(season_results, edited_results):
+    table = records.update_records(records.build_records(season_results), edited_results)
+    assert table.equals(records.build_records(edited_results))
+    assert set(table['team_name']) == {'Saint Rita', 'St Ann'}
+    assert table['season_best_time_s'].min() == 500.0
+
+
+def test_update_of_current_table_returns_it(season_results):
+    table = records.build_records(season_results)
+    assert records.update_records(table, season_results) is table
+
+
+def test_update_with_a_new_season_keeps_earlier_prs(season_results):
+    next_season = season_results.assign(season_year=2025, finish_time_s=season_results['finish_time_s'] + 50)
+    full = pd.concat([season_results, next_season], ignore_index=True)
+    table = records.update_records(records.build_records(season_results), full)
+
+    assert table.equals(records.build_records(full))
+    ann = table[table['athlete_full_name'] == 'Ann'].set_index('season_year')
+    assert ann.loc[2025, 'pr_time_s'] == ann.loc[2024, 'season_best_time_s'] == 597.0
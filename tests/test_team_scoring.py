@@ -0,0 +1,58 @@
+import pandas as pd
+
+from team_scoring import RaceSimulator, Scenario, team_scores
+
+
+def race(teams, start=600, step=10):
+    """One race with runners finishing `step` seconds apart, in the order given"""
+    return pd.DataFrame({
+        'athlete_full_name': [f"Runner {i + 1}" for i in range(len(teams))],
+        'team_name': teams,
+        'place_overall': range(1, len(teams) + 1),
+        'finish_time_s': [start + step * i for i in range(len(teams))],
+        'season_year': 2025,
+        'meet_number': 1,
+        'division': 'Varsity',
+        'gender': 'Girls',
+    })
+
+
+def scores(results, scenario):
+    rows = results[results['Scenario'] == scenario]
+    return dict(zip(rows['Team'], rows['Score']))
+
+
+def test_actual_matches_team_scores():
+    df = race(['A'] * 5 + ['B'] * 5 + ['C'] * 2)
+    results = RaceSimulator(df).simulate([])
+    expected = team_scores(df)
+    assert scores(results, 'Actual') == dict(zip(expected['Team'], expected['Score']))
+
+
+def test_removed_runner_moves_field_up():
+    df = race(['A', 'B', 'A', 'B', 'A', 'B', 'A', 'B', 'A', 'B', 'A'])
+    results = RaceSimulator(df).simulate([Scenario('without', remove=['Runner 1'])])
+    # A keeps 5 runners: 2, 4, 6, 8, 10 after everyone moves up one place
+    assert scores(results, 'without') == {'A': 30, 'B': 1 + 3 + 5 + 7 + 9}
+
+
+def test_runners_added_into_one_gap_get_distinct_places():
+    df = race(['A'] * 5 + ['B'] * 5 + ['C'] * 2)
+    # All three fall between the 1st (600 s) and 2nd (610 s) finishers
+    added = Scenario('add', add=[('New 3', 'C', 603), ('New 1', 'C', 601), ('New 2', 'C', 602)])
+    results = RaceSimulator(df).simulate([added])
+    assert scores(results, 'add') == {
+        'A': 1 + 5 + 6 + 7 + 8,
+        'B': 9 + 10 + 11 + 12 + 13,
+        'C': 2 + 3 + 4 + 14 + 15,
+    }
+
+
+def test_scenarios_do_not_affect_each_other():
+    df = race(['A'] * 5 + ['B'] * 5 + ['C'] * 2)
+    first = Scenario('first', add=[('New 1', 'C', 601), ('New 2', 'C', 602), ('New 3', 'C', 603)])
+    second = Scenario('second', add=[('Late', 'C', 605)])
+    results = RaceSimulator(df).simulate([first, second])
+    # Only the one runner added in 'second' is ahead of A's 2nd to 5th
+    assert scores(results, 'second') == {'A': 1 + 3 + 4 + 5 + 6, 'B': 7 + 8 + 9 + 10 + 11}
+    assert scores(results, 'first')['C'] == 38
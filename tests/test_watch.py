@@ -0,0 +1,36 @@
+import shutil
+from pathlib import Path
+
+import dataset
+import watch
+
+DATA_DIR = Path(__file__).resolve().parent.parent / 'data'
+PAGE_NAME = sorted(path.name for path in (DATA_DIR / 'pages').glob('*Meet 2*2025.htm'))[0]
+
+
+def test_merge_keeps_other_races_byte_for_byte(tmp_path):
+    df = dataset.read_results(DATA_DIR / 'merged' / 'season_results.csv')
+    rows = watch.parse_pages([DATA_DIR / 'pages' / PAGE_NAME], tmp_path)
+    merged = watch.merge_races(df, rows)
+    assert (merged.dtypes[df.columns] == df.dtypes).all()
+
+    replaced = merged.set_index(watch.RACE_KEYS).index.isin(rows.set_index(watch.RACE_KEYS).index)
+    kept = df.set_index(watch.RACE_KEYS).index.isin(rows.set_index(watch.RACE_KEYS).index)
+    assert merged[~replaced].to_csv(index=False) == df[~kept].to_csv(index=False)
+
+
+def test_failed_ingest_does_not_stop_the_watcher(tmp_path, monkeypatch, capsys):
+    pages = tmp_path / 'pages'
+    pages.mkdir()
+    (tmp_path / 'raw').mkdir()
+    (tmp_path / 'raw' / watch.STATE_FILENAME).write_text('{}')
+    shutil.copy(DATA_DIR / 'pages' / PAGE_NAME, pages / PAGE_NAME)
+
+    def broken(*args):
+        raise ValueError("unreadable page")
+
+    monkeypatch.setattr(watch, 'ingest', broken)
+    watch.watch(pages, tmp_path / 'raw', results_path=tmp_path / 'season_results.csv', debounce_s=0, once=True)
+    assert "Could not ingest" in capsys.readouterr().out
+    # Not retried until the page is saved again
+    assert watch.PageWatcher(pages, tmp_path / 'raw' / watch.STATE_FILENAME, debounce_s=0).poll() == []
@@ -0,0 +1,111 @@
+"""
+Performance tiers (Elite / Competitive / Developmental)
+Clusters each athlete's season pace with a 1-D k-means run for every
+season x division x gender group at once: all groups share one array and
+every iteration is a handful of bincount/argmin calls, not a loop over groups
+"""
+import numpy as np
+import pandas as pd
+
+import dataset
+from add_distance_metrics import format_pace
+
+TIER_LABELS = ['Elite', 'Competitive', 'Developmental']
+GROUP_KEYS = ['season_year', 'division', 'gender']
+MAX_ITERATIONS = 50
+
+
+def _athlete_season_paces(df: pd.DataFrame) -> pd.DataFrame:
+    """Median pace per athlete within each season/division/gender group"""
+    valid = df.dropna(subset=GROUP_KEYS + ['athlete_full_name', 'pace_per_mi_min'])
+    valid = valid[valid['pace_per_mi_min'] > 0]
+    return valid.groupby(GROUP_KEYS + ['athlete_full_name'], sort=True)['pace_per_mi_min'].median().reset_index()
+
+
+def batched_kmeans(values: np.ndarray, groups: np.ndarray, n_groups: int, k: int = len(TIER_LABELS)):
+    """
+    1-D k-means inside every group simultaneously
+    Starts from each group's quantiles, so cluster 0 is always the lowest
+    values (fastest pace). Returns (labels, centroids of shape n_groups x k)
+    """
+    order = np.lexsort((values, groups))
+    sorted_groups = groups[order]
+    starts = np.searchsorted(sorted_groups, np.arange(n_groups), side='left')
+    sizes = np.bincount(groups, minlength=n_groups)
+
+    # Initial centroids at the (i + 0.5) / k quantiles of each group
+    fractions = (np.arange(k) + 0.5) / k
+    picks = starts[:, None] + np.floor(fractions[None, :] * np.maximum(sizes, 1)[:, None]).astype(int)
+    centroids = values[order][np.minimum(picks, len(values) - 1)]
+
+    labels = np.full(len(values), -1)
+    for _ in range(MAX_ITERATIONS):
+        new_labels = np.abs(values[:, None] - centroids[groups]).argmin(axis=1)
+        if np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+        cell = groups * k + labels
+        counts = np.bincount(cell, minlength=n_groups * k).reshape(n_groups, k)
+        sums = np.bincount(cell, values, minlength=n_groups * k).reshape(n_groups, k)
+        # An emptied cluster keeps its previous centroid
+        centroids = np.where(counts > 0, sums / np.maximum(counts, 1), centroids)
+
+    return labels, centroids
+
+
+def build_tiers(df: pd.DataFrame):
+    """
+    Tier per athlete-season group and the centroid table
+    Returns (assignments with GROUP_KEYS, athlete_full_name, performance_tier;
+    centroids with GROUP_KEYS, tier, centroid_pace, athletes)
+    """
+    paces = _athlete_season_paces(df)
+    group_codes, groups = pd.MultiIndex.from_frame(paces[GROUP_KEYS]).factorize()
+    labels, centroids = batched_kmeans(paces['pace_per_mi_min'].to_numpy(dtype=float), group_codes, len(groups))
+
+    assignments = paces[GROUP_KEYS + ['athlete_full_name']].copy()
+    assignments['performance_tier'] = np.array(TIER_LABELS)[labels]
+
+    k = len(TIER_LABELS)
+    counts = np.bincount(group_codes * k + labels, minlength=len(groups) * k)
+    centroid_table = groups.to_frame(index=False, name=GROUP_KEYS).loc[np.repeat(np.arange(len(groups)), k)]
+    centroid_table['tier'] = np.tile(TIER_LABELS, len(groups))
+    centroid_table['centroid_pace'] = centroids.ravel().round(4)
+    centroid_table['athletes'] = counts
+    return assignments, centroid_table.reset_index(drop=True)
+
+
+def add_tier_column(df: pd.DataFrame) -> pd.DataFrame:
+    """Label every result row with its athlete's tier for that season/division/gender"""
+    assignments, _ = build_tiers(df)
+    df = df.drop(columns=['performance_tier'], errors='ignore')
+    return df.merge(assignments, on=GROUP_KEYS + ['athlete_full_name'], how='left')
+
+
+def build_tier_centroids(df: pd.DataFrame) -> pd.DataFrame:
+    return build_tiers(df)[1]
+
+
+def main():
+    import time
+
+    df = dataset.read_results()
+    start = time.perf_counter()
+    assignments, centroids = build_tiers(df)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    print("=" * 80)
+    print("PERFORMANCE TIERS")
+    print("=" * 80)
+    print(f"\n{len(assignments):,} athlete-seasons in {centroids.groupby(GROUP_KEYS).ngroups} groups "
+          f"clustered in {elapsed_ms:.0f} ms")
+    print(f"Tiers: {assignments['performance_tier'].value_counts().to_dict()}")
+
+    latest = centroids[centroids['season_year'] == centroids['season_year'].max()].copy()
+    latest['centroid_pace'] = latest['centroid_pace'].apply(format_pace)
+    print(f"\nCentroid pace per mile, {int(latest['season_year'].iloc[0])}:")
+    print(latest.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
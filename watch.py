@@ -0,0 +1,225 @@
+"""
+Watch data/pages and ingest new result pages as they are saved
+On meet day pages arrive one division at a time. Instead of rerunning the
+parser and the whole cleanup chain, the watcher polls the folder, and once
+a new or changed page has settled (not modified for DEBOUNCE_S, so a page
+still being written is not read half-way) it:
+
+    1. parses just that page (also refreshing its CSV in data/raw)
+    2. replaces that race's rows in the dataset, after the same team-name,
+       distance and duplicate cleanup the chain applies
+    3. writes season_results.csv with the precompute column stages
+       recomputed, then runs the incremental stages and the results store
+
+Writing the dataset gives it a new version, so dashboard sessions and the
+API load the new results on their next check.
+
+Polling is used rather than inotify (not in the standard library); a scan
+of the folder is one stat per page, well under a millisecond here.
+
+Usage:
+    python watch.py          # until Ctrl-C
+    python watch.py --once   # ingest pages changed since the last run and exit
+"""
+import argparse
+import json
+import os
+import time
+import traceback
+from pathlib import Path
+
+import pandas as pd
+
+import add_distance_metrics
+import clean_duplicates
+import dataset
+import parse_saved_pages
+import precompute
+import standardize_team_names
+
+PAGES_DIR = Path("data/pages")
+RAW_DIR = Path("data/raw")
+STATE_FILENAME = 'watch_state.json'
+PAGE_SUFFIXES = ('.htm', '.html', '.mhtml')
+POLL_S = 1.0
+DEBOUNCE_S = 2.0
+RACE_KEYS = ['season_year', 'meet_number', 'division', 'gender']
+# Stages that update their artifact with the new meets instead of rebuilding, the
+# partitions (only the new meet's are written), the store the scripts and API
+# read and the Arrow copy the dashboard maps on start; the dashboard rebuilds any
+# other stale artifact itself
+INCREMENTAL_STAGES = [name for name, stage in precompute.ARTIFACT_STAGES.items() if stage.update is not None] + [
+    'partitions', 'store', 'dataset']
+
+
+class PageWatcher:
+    """
+    Tracks the (mtime, size) each page was last ingested at; poll() returns
+    pages that differ from it and were last modified at least debounce_s ago
+    """
+
+    def __init__(self, pages_dir=PAGES_DIR, state_path=RAW_DIR / STATE_FILENAME, debounce_s: float = DEBOUNCE_S):
+        self.pages_dir = Path(pages_dir)
+        self.state_path = Path(state_path)
+        self.debounce_s = debounce_s
+        self._polled = {}
+        try:
+            with open(self.state_path, encoding='utf-8') as f:
+                self.ingested = {name: tuple(signature) for name, signature in json.load(f).items()}
+        except FileNotFoundError:
+            # First run: the pages already there are assumed to be parsed and merged
+            self.ingested = self.scan()
+            self.save()
+
+    def scan(self) -> dict:
+        with os.scandir(self.pages_dir) as entries:
+            return {
+                entry.name: (entry.stat().st_mtime_ns, entry.stat().st_size)
+                for entry in entries if entry.is_file() and entry.name.endswith(PAGE_SUFFIXES)
+            }
+
+    def poll(self) -> list[Path]:
+        settled_before = time.time_ns() - int(self.debounce_s * 1e9)
+        self._polled = self.scan()
+        return [
+            self.pages_dir / name
+            for name, signature in sorted(self._polled.items())
+            if signature != self.ingested.get(name) and signature[0] <= settled_before
+        ]
+
+    def mark_ingested(self, paths: list[Path]):
+        # The signature read by poll(): a page rewritten since then is picked up again
+        for path in paths:
+            self.ingested[path.name] = self._polled[path.name]
+        self.save()
+
+    def save(self):
+        dataset.atomic_write(self.state_path, lambda f: json.dump(self.ingested, f, indent=2, sort_keys=True))
+
+
+def parse_pages(paths: list[Path], raw_dir=RAW_DIR) -> pd.DataFrame | None:
+    """Parse pages into one frame of new rows, refreshing their data/raw CSVs (None if none had results)"""
+    frames = []
+    for path in paths:
+        print(f"Processing: {path.name}")
+        with open(path, encoding='utf-8') as f:
+            file_info, df = parse_saved_pages.parse_page(f.read(), path.name)
+        if df is None:
+            print("  Skipping - no data found")
+            continue
+        raw_path = Path(raw_dir) / parse_saved_pages.raw_output_name(file_info)
+        dataset.atomic_write(raw_path, lambda f: df.to_csv(f, index=False))
+        # Read back as manual_merge does, so the rows get the same dtypes as a full merge
+        frames.append(pd.read_csv(raw_path))
+    return pd.concat(frames, ignore_index=True) if frames else None
+
+
+def _restore_dtypes(merged: pd.DataFrame, dtypes: pd.Series) -> pd.DataFrame:
+    """
+    Cast columns back to the dataset's dtypes where no value changes (e.g.
+    distance_km 3.0 -> 3), so the rows of unrelated races are written byte for
+    byte as before and snapshots only store the races that changed
+    """
+    for column, dtype in dtypes.items():
+        if column in merged.columns and merged[column].dtype != dtype:
+            try:
+                cast = merged[column].astype(dtype)
+            except (TypeError, ValueError):
+                # e.g. a new row is missing a value in an integer column
+                continue
+            if cast.astype(merged[column].dtype).equals(merged[column]):
+                merged[column] = cast
+    return merged
+
+
+def merge_races(df: pd.DataFrame, rows: pd.DataFrame) -> pd.DataFrame:
+    """
+    df with the races in `rows` replaced by them; rows go through the chain's
+    row-level steps (team names, distance metrics, duplicates). The precompute
+    column stages are left to precompute.run
+    """
+    rows = rows.assign(team_name=rows['team_name'].replace(standardize_team_names.team_name_mapping))
+    rows = add_distance_metrics.add_distance_columns(rows)
+
+    replaced = pd.MultiIndex.from_frame(df[RACE_KEYS]).isin(pd.MultiIndex.from_frame(rows[RACE_KEYS]))
+    merged = pd.concat([df[~replaced], rows], ignore_index=True)
+    merged = clean_duplicates.drop_duplicate_rows(merged).reset_index(drop=True)
+    return _restore_dtypes(merged, df.dtypes)
+
+
+def ingest(paths: list[Path], results_path=None, raw_dir=RAW_DIR) -> dict | None:
+    """Parse, merge and precompute for a batch of settled pages; returns timings and counts"""
+    results_path = Path(results_path or dataset.RESULTS_PATH)
+    start = time.perf_counter()
+    rows = parse_pages(paths, raw_dir)
+    if rows is None:
+        return None
+    parsed = time.perf_counter()
+
+    df = dataset.read_results(results_path)
+    merged = merge_races(df, rows)
+    merged_at = time.perf_counter()
+
+    # Writes the merged dataset with its column stages recomputed
+    precompute.run(INCREMENTAL_STAGES, results_path, df=merged)
+    finished = time.perf_counter()
+    return {
+        'races': rows[RACE_KEYS].drop_duplicates().shape[0],
+        'rows': len(rows),
+        'total_rows': len(merged),
+        'parse_s': parsed - start,
+        'merge_s': merged_at - parsed,
+        'precompute_s': finished - merged_at,
+        'elapsed_s': finished - start,
+        'version': dataset.dataset_version(results_path),
+    }
+
+
+def watch(pages_dir=PAGES_DIR, raw_dir=RAW_DIR, results_path=None, poll_s: float = POLL_S,
+          debounce_s: float = DEBOUNCE_S, once: bool = False):
+    watcher = PageWatcher(pages_dir, Path(raw_dir) / STATE_FILENAME, debounce_s)
+    print(f"Watching {pages_dir} (poll {poll_s:g} s, debounce {debounce_s:g} s) - Ctrl-C to stop\n")
+    while True:
+        paths = watcher.poll()
+        if paths:
+            try:
+                summary = ingest(paths, results_path, raw_dir)
+            except Exception:
+                # Keep watching; the pages are retried once they are saved again
+                traceback.print_exc()
+                print(f"\n❌ Could not ingest {', '.join(path.name for path in paths)} - "
+                      f"fix or re-save the page(s) to retry\n")
+                summary = None
+            watcher.mark_ingested(paths)
+            if summary:
+                print(f"\n✅ {summary['races']} race(s), {summary['rows']} rows merged "
+                      f"({summary['total_rows']:,} total) in {summary['elapsed_s']:.2f} s: "
+                      f"parse {summary['parse_s']:.2f} s, merge {summary['merge_s']:.2f} s, "
+                      f"precompute {summary['precompute_s']:.2f} s")
+                print(f"   dataset version {summary['version']}\n")
+        if once:
+            return
+        time.sleep(poll_s)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingest result pages saved into data/pages as they arrive")
+    parser.add_argument('--pages', default=str(PAGES_DIR))
+    parser.add_argument('--raw', default=str(RAW_DIR))
+    parser.add_argument('--poll', type=float, default=POLL_S, help="seconds between folder scans")
+    parser.add_argument('--debounce', type=float, default=DEBOUNCE_S,
+                        help="seconds a page must be unmodified before it is read")
+    parser.add_argument('--once', action='store_true', help="ingest pages changed since the last run and exit")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("WATCH MODE")
+    print("=" * 60)
+    try:
+        watch(Path(args.pages), Path(args.raw), poll_s=args.poll, debounce_s=args.debounce, once=args.once)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
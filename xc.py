@@ -0,0 +1,225 @@
+"""
+Single command line for the data pipeline and utilities
+
+    python xc.py fetch [--mirror URL]  fetch result pages listed in data/sources.csv into data/raw
+    python xc.py parse                 parse saved pages in data/pages into data/raw
+    python xc.py watch [--once]        ingest pages as they are saved into data/pages
+    python xc.py merge                 merge data/raw/*.csv into the season results
+    python xc.py clean                 drop duplicate rows
+    python xc.py correct [--teams]     curated athlete name corrections (--teams: standardize team names)
+    python xc.py metrics               add distance / pace / speed columns
+    python xc.py teams [--similar]     results per team (--similar: flag look-alike names)
+    python xc.py duplicates            look for athlete name variations within a team
+    python xc.py reports [--force]     static HTML reports per team and athlete (changed ones only)
+
+Steps can be chained with '+'; they share one dataset handle, so the file is
+read once and each step works on the previous step's output:
+
+    python xc.py clean + correct --teams + metrics
+
+Steps that rewrite the dataset first save a snapshot of it (see
+snapshots.py), so any step can be rolled back.
+
+Modules (and pandas) are imported only by the subcommand that needs them.
+Read-only commands answer from the indexed SQLite store (see store.py)
+without loading pandas at all; target: `xc.py --help` and `xc.py teams`
+start and finish in under COLD_START_TARGET_MS on a warm disk, once the store
+is built. --timing prints the in-process time and whether pandas was loaded.
+"""
+import argparse
+import sys
+import time
+
+START = time.perf_counter()
+COLD_START_TARGET_MS = 250
+
+
+class DatasetHandle:
+    """
+    The merged dataset, opened lazily and shared by every step of one run
+    frame() reads the CSV once; store() opens the indexed store, which stays
+    valid across runs until the dataset changes. A step that rewrites the
+    dataset hands its result back with replace().
+    """
+
+    def __init__(self, path=None):
+        import dataset
+
+        self.path = path or dataset.RESULTS_PATH
+        self._frame = None
+        self._store = None
+
+    def frame(self):
+        if self._frame is None:
+            import dataset
+
+            self._frame = dataset.read_results(self.path)
+        return self._frame
+
+    def store(self):
+        if self._store is None:
+            import store
+
+            self._store = store.open_store(self.path)
+        return self._store
+
+    def snapshot(self, message: str):
+        """Keep the dataset file about to be rewritten in the snapshot store (see snapshots.py)"""
+        import os
+        import snapshots
+
+        if os.path.exists(self.path):
+            entry = snapshots.SnapshotStore(snapshots.snapshots_dir(self.path)).save(self.path, message)
+            print(f"[xc] snapshot {entry['id']} saved ({message}); undo with: python snapshots.py restore {entry['id']}")
+
+    def replace(self, df):
+        self._frame = df
+        self._store = None
+
+    def invalidate(self):
+        self.replace(None)
+
+
+def cmd_fetch(handle, args):
+    import fetch
+
+    sources = fetch.mirror_sources(args.mirror) if args.mirror else fetch.load_sources()
+    if not sources:
+        print(fetch.nothing_to_fetch())
+        return
+    outcomes = fetch.run(sources)
+    print(f"{len(sources)} pages: {fetch.summary(outcomes)}")
+
+
+def cmd_parse(handle, args):
+    import parse_saved_pages
+
+    parse_saved_pages.main()
+
+
+def cmd_watch(handle, args):
+    import watch
+
+    try:
+        watch.watch(once=args.once)
+    except KeyboardInterrupt:
+        pass
+    handle.invalidate()
+
+
+def cmd_merge(handle, args):
+    import manual_merge
+
+    handle.snapshot("before merge")
+    manual_merge.main()
+    handle.invalidate()
+
+
+def cmd_clean(handle, args):
+    import clean_duplicates
+
+    handle.snapshot("before clean")
+    handle.replace(clean_duplicates.main(handle.frame()))
+
+
+def cmd_correct(handle, args):
+    if args.teams:
+        import standardize_team_names
+
+        handle.snapshot("before correct --teams")
+        handle.replace(standardize_team_names.main(handle.frame()))
+    else:
+        import apply_name_corrections
+
+        # Writes season_results_corrected.csv for review; the dataset itself is unchanged
+        apply_name_corrections.apply_corrections(handle.frame())
+
+
+def cmd_metrics(handle, args):
+    import add_distance_metrics
+
+    handle.snapshot("before metrics")
+    handle.replace(add_distance_metrics.main(handle.frame()))
+
+
+def cmd_teams(handle, args):
+    if args.similar:
+        import analyze_team_names
+
+        analyze_team_names.main(handle.store())
+    else:
+        import list_teams
+
+        list_teams.main(handle.store())
+
+
+def cmd_duplicates(handle, args):
+    import analyze_name_duplicates
+
+    analyze_name_duplicates.main(handle.frame())
+
+
+def cmd_reports(handle, args):
+    import reports
+
+    summary = reports.generate(results_path=handle.path, force=args.force)
+    print(f"{summary['rendered']} reports rendered, {summary['skipped']} unchanged")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='xc.py', description="Cross country data pipeline and utilities (chain steps with '+')"
+    )
+    parser.add_argument('--timing', action='store_true', help="print run time and whether pandas was imported")
+    commands = parser.add_subparsers(dest='command', required=True, metavar='command')
+
+    fetch = commands.add_parser('fetch', help="fetch result pages listed in data/sources.csv into data/raw")
+    fetch.add_argument('--mirror', help="fetch every page name in data/pages from this base URL instead")
+    fetch.set_defaults(run=cmd_fetch)
+    commands.add_parser('parse', help="parse saved pages in data/pages into data/raw").set_defaults(run=cmd_parse)
+    watch = commands.add_parser('watch', help="ingest pages as they are saved into data/pages")
+    watch.add_argument('--once', action='store_true', help="ingest pages changed since the last run and exit")
+    watch.set_defaults(run=cmd_watch)
+    commands.add_parser('merge', help="merge data/raw/*.csv into the season results").set_defaults(run=cmd_merge)
+    commands.add_parser('clean', help="drop duplicate rows").set_defaults(run=cmd_clean)
+    correct = commands.add_parser('correct', help="apply curated athlete name corrections")
+    correct.add_argument('--teams', action='store_true', help="standardize team names instead")
+    correct.set_defaults(run=cmd_correct)
+    commands.add_parser('metrics', help="add distance, pace and speed columns").set_defaults(run=cmd_metrics)
+    teams = commands.add_parser('teams', help="results per team")
+    teams.add_argument('--similar', action='store_true', help="also flag look-alike team names")
+    teams.set_defaults(run=cmd_teams)
+    commands.add_parser('duplicates', help="find athlete name variations within a team").set_defaults(run=cmd_duplicates)
+    reports = commands.add_parser('reports', help="write static HTML reports per team and athlete")
+    reports.add_argument('--force', action='store_true', help="render every report, changed or not")
+    reports.set_defaults(run=cmd_reports)
+    return parser
+
+
+def split_steps(argv: list[str]) -> list[list[str]]:
+    """['clean', '+', 'metrics'] -> [['clean'], ['metrics']]; global options stay with the first step"""
+    steps = [[]]
+    for arg in argv:
+        if arg == '+':
+            steps.append([])
+        else:
+            steps[-1].append(arg)
+    return [step for step in steps if step]
+
+
+def main(argv=None):
+    parser = build_parser()
+    steps = [parser.parse_args(step) for step in split_steps(sys.argv[1:] if argv is None else argv) or [[]]]
+
+    handle = DatasetHandle()
+    for args in steps:
+        args.run(handle, args)
+
+    if any(args.timing for args in steps):
+        elapsed_ms = (time.perf_counter() - START) * 1000
+        print(f"\n[xc] {elapsed_ms:.0f} ms in-process (target {COLD_START_TARGET_MS} ms for cheap commands), "
+              f"pandas imported: {'yes' if 'pandas' in sys.modules else 'no'}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()